@@ -462,12 +462,10 @@ def blob(
         outfh = open(outfile, 'wb')
         write = outfh.write
 
-    blob = oci_client.blob(
+    for chunk in oci_client.iter_blob(
         image_reference=image_reference,
         digest=digest,
-        stream=True,
-    )
-    for chunk in blob.iter_content(chunk_size=4096):
+    ):
         write(chunk)
 
     outfh.flush()
@@ -177,11 +177,12 @@ def _remove_resource(
             p = submanifest.platform
             yield f'{repository}:{base_tag}-{p.os}-{p.architecture}'
 
-    for ref in iter_platform_refs():
-        if not oci_client.head_manifest(
-            image_reference=ref,
-            absent_ok=True,
-        ):
+    platform_manifests = oci_client.head_manifests(
+        image_references=iter_platform_refs(),
+    )
+
+    for ref, manifest_blobref in platform_manifests.items():
+        if not manifest_blobref:
             logger.warning(f'did not find {ref=} - ignoring')
             continue
 
@@ -1,4 +1,5 @@
 import collections.abc
+import concurrent.futures
 import dataclasses
 import io
 import itertools
@@ -8,6 +9,7 @@ import os
 import shutil
 import tarfile
 import tempfile
+import threading
 
 import cachetools
 import dacite
@@ -119,9 +121,69 @@ class WriteBack:
         self.writeback(component_id, component_descriptor)
 
 
+class NegativeCache:
+    '''
+    Remembers (for `ttl` seconds) that component descriptors are absent from given OCM
+    repositories, keyed by component-id and OCM repository. Intended to be shared between lookups
+    (see `create_default_component_descriptor_lookup`), so that lookups which walk multiple OCM
+    repositories do not repeatedly probe repositories known not to contain the requested
+    component descriptor.
+
+    @param ttl:
+        time (in seconds) for which absence is remembered
+    @param maxsize:
+        maximum amount of remembered absent component descriptors
+    '''
+    def __init__(
+        self,
+        ttl: float=600,
+        maxsize: int=4096,
+    ):
+        self._cache = cachetools.TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        component_id: cnudie.util.ComponentId,
+        ocm_repo: ocm.OcmRepository | str,
+    ) -> tuple[ocm.ComponentIdentity, ocm.OcmRepository]:
+        if isinstance(ocm_repo, str):
+            ocm_repo = ocm.OciOcmRepository(baseUrl=ocm_repo)
+
+        return cnudie.util.to_component_id(component_id), ocm_repo
+
+    def is_absent(
+        self,
+        component_id: cnudie.util.ComponentId,
+        ocm_repo: ocm.OcmRepository | str,
+    ) -> bool:
+        key = self._key(component_id, ocm_repo)
+        with self._lock:
+            return key in self._cache
+
+    def add(
+        self,
+        component_id: cnudie.util.ComponentId,
+        ocm_repo: ocm.OcmRepository | str,
+    ):
+        key = self._key(component_id, ocm_repo)
+        with self._lock:
+            self._cache[key] = True
+
+    def discard(
+        self,
+        component_id: cnudie.util.ComponentId,
+        ocm_repo: ocm.OcmRepository | str,
+    ):
+        key = self._key(component_id, ocm_repo)
+        with self._lock:
+            self._cache.pop(key, None)
+
+
 def in_memory_cache_component_descriptor_lookup(
     cache_ctor: cachetools.Cache=cachetools.LRUCache,
     ocm_repository_lookup: OcmRepositoryLookup=None,
+    negative_cache: NegativeCache | None=None,
     **cache_kwargs,
 ) -> ComponentDescriptorLookupById:
     '''
@@ -133,6 +195,9 @@ def in_memory_cache_component_descriptor_lookup(
         specification of the cache implementation
     @param ocm_repository_lookup:
         lookup for OCM repositories
+    @param negative_cache:
+        if passed, OCM repositories known not to contain the requested component descriptor are
+        skipped; written-back component descriptors are removed from it
     @param cache_kwargs:
         further args used for cache initialization, maxsize is defaulted to 2048
     '''
@@ -145,6 +210,8 @@ def in_memory_cache_component_descriptor_lookup(
     ):
         if (ocm_repo := component_descriptor.component.current_ocm_repo):
             cache.__setitem__((component_id, ocm_repo), component_descriptor)
+            if negative_cache:
+                negative_cache.discard(component_id, ocm_repo)
         else:
             raise ValueError(ocm_repo)
 
@@ -165,6 +232,8 @@ def in_memory_cache_component_descriptor_lookup(
                     type=ocm.AccessType.OCI_REGISTRY,
                     baseUrl=ocm_repo,
                 )
+            if negative_cache and negative_cache.is_absent(component_id, ocm_repo):
+                continue
             try:
                 if (component_descriptor := cache.get((component_id, ocm_repo))):
                     return component_descriptor
@@ -180,6 +249,7 @@ def in_memory_cache_component_descriptor_lookup(
 def file_system_cache_component_descriptor_lookup(
     ocm_repository_lookup: OcmRepositoryLookup=None,
     cache_dir: str=None,
+    negative_cache: NegativeCache | None=None,
 ) -> ComponentDescriptorLookupById:
     '''
     Used to lookup referenced component descriptors in the file-system cache.
@@ -191,6 +261,9 @@ def file_system_cache_component_descriptor_lookup(
         lookup for OCM repositories
     @param cache_dir:
         directory used for caching. Must exist, otherwise a ValueError is raised
+    @param negative_cache:
+        if passed, OCM repositories known not to contain the requested component descriptor are
+        skipped; written-back component descriptors are removed from it
     '''
     if not cache_dir:
         raise ValueError(cache_dir)
@@ -226,6 +299,9 @@ def file_system_cache_component_descriptor_lookup(
             os.unlink(f.name)
             raise
 
+        if negative_cache:
+            negative_cache.discard(component_id, ocm_repo)
+
     _writeback = WriteBack(writeback)
 
     def lookup(
@@ -252,6 +328,9 @@ def file_system_cache_component_descriptor_lookup(
 
             component_id = cnudie.util.to_component_id(component_id)
 
+            if negative_cache and negative_cache.is_absent(component_id, ocm_repo):
+                continue
+
             descriptor_path = os.path.join(
                 cache_dir,
                 ocm_repo.oci_ref.replace('/', '-'),
@@ -435,6 +514,7 @@ def oci_component_descriptor_lookup(
     ocm_repository_lookup: OcmRepositoryLookup,
     oci_client: oc.Client | collections.abc.Callable[[], oc.Client],
     default_absent_ok=True,
+    negative_cache: NegativeCache | None=None,
 ) -> ComponentDescriptorLookupById:
     '''
     Used to lookup referenced component descriptors in the oci-registry.
@@ -447,6 +527,9 @@ def oci_component_descriptor_lookup(
     @param default_absent_ok:
         sets the default behaviour in case of absent component descriptors for the returned lookup
         function
+    @param negative_cache:
+        if passed, OCM repositories not containing the requested component descriptor are
+        remembered in it, and not queried again (until the respective entries expire)
     '''
     if not oci_client:
         raise ValueError(oci_client)
@@ -477,6 +560,9 @@ def oci_component_descriptor_lookup(
                     baseUrl=ocm_repo,
                 )
 
+            if negative_cache and negative_cache.is_absent(component_id, ocm_repo):
+                continue
+
             if raw := _raw_component_descriptor_from_oci(
                 component_id=component_id,
                 ocm_repos=(ocm_repo,),
@@ -484,6 +570,9 @@ def oci_component_descriptor_lookup(
                 absent_ok=True,
             ):
                 break
+
+            if negative_cache:
+                negative_cache.add(component_id, ocm_repo)
         else:
             raw = None
 
@@ -582,6 +671,45 @@ def version_lookup(
     return lookup
 
 
+class _SingleFlight:
+    '''
+    deduplicates concurrent calls: while a call for a given key is in flight, further callers for
+    the same key wait for (and share) its result (or exception), rather than issuing the call again.
+    Results are not retained once the call has completed.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[collections.abc.Hashable, concurrent.futures.Future] = {}
+
+    def __call__(
+        self,
+        key: collections.abc.Hashable,
+        function: collections.abc.Callable,
+        /,
+        *args,
+        **kwargs,
+    ):
+        with self._lock:
+            if (future := self._in_flight.get(key)):
+                leader = False
+            else:
+                future = self._in_flight[key] = concurrent.futures.Future()
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+        return future.result()
+
+
 def composite_component_descriptor_lookup(
     lookups: tuple[ComponentDescriptorLookupById, ...],
     ocm_repository_lookup: OcmRepositoryLookup | None=None,
@@ -600,13 +728,12 @@ def composite_component_descriptor_lookup(
         sets the default behaviour in case of absent component descriptors for the returned lookup
         function
     '''
-    def lookup(
+    single_flight = _SingleFlight()
+
+    def _lookup(
         component_id: ocm.ComponentIdentity,
-        /,
-        ocm_repository_lookup=ocm_repository_lookup,
-        absent_ok=default_absent_ok,
-    ):
-        component_id = cnudie.util.to_component_id(component_id)
+        ocm_repository_lookup,
+    ) -> ocm.ComponentDescriptor | None:
         writebacks = []
         for lookup in lookups:
             res = None
@@ -631,6 +758,28 @@ def composite_component_descriptor_lookup(
             elif res is None: continue
             elif isinstance(res, WriteBack): writebacks.append(res)
 
+    def lookup(
+        component_id: ocm.ComponentIdentity,
+        /,
+        ocm_repository_lookup=ocm_repository_lookup,
+        absent_ok=default_absent_ok,
+    ):
+        component_id = cnudie.util.to_component_id(component_id)
+
+        if isinstance(ocm_repository_lookup, collections.abc.Hashable):
+            # concurrent lookups for the same component-version share one retrieval
+            component_descriptor = single_flight(
+                (component_id, ocm_repository_lookup),
+                _lookup,
+                component_id,
+                ocm_repository_lookup,
+            )
+        else:
+            component_descriptor = _lookup(component_id, ocm_repository_lookup)
+
+        if component_descriptor:
+            return component_descriptor
+
         # component descriptor not found in lookup
         if absent_ok:
             return
@@ -665,6 +814,7 @@ def create_default_component_descriptor_lookup(
     delivery_client=None,
     default_absent_ok: bool=False,
     fallback_to_service_mapping: bool=True,
+    negative_cache: NegativeCache | None=None,
 ) -> ComponentDescriptorLookupById:
     '''
     This is a convenience function combining commonly used/recommended lookups, using global
@@ -689,6 +839,11 @@ def create_default_component_descriptor_lookup(
         if set, it is tried to retrieve the requested component descriptor using the OCM repository
         mapping of the delivery-service, in case it could not be retrieved using
         `ocm_repository_lookup`
+    @param negative_cache:
+        if passed, absence of component descriptors in OCM repositories is remembered (shared
+        between in-memory, file-system and oci-registry based lookups). Not enabled by default,
+        as component descriptors uploaded after an unsuccessful lookup would not be found until
+        the respective entries expire
     '''
     if not ocm_repository_lookup:
         import ctx
@@ -697,6 +852,7 @@ def create_default_component_descriptor_lookup(
     lookups = [
         in_memory_cache_component_descriptor_lookup(
             ocm_repository_lookup=ocm_repository_lookup,
+            negative_cache=negative_cache,
         )
     ]
     if not cache_dir:
@@ -713,6 +869,7 @@ def create_default_component_descriptor_lookup(
             file_system_cache_component_descriptor_lookup(
                 cache_dir=cache_dir,
                 ocm_repository_lookup=ocm_repository_lookup,
+                negative_cache=negative_cache,
             )
         )
 
@@ -727,6 +884,7 @@ def create_default_component_descriptor_lookup(
         oci_component_descriptor_lookup(
             ocm_repository_lookup=ocm_repository_lookup,
             oci_client=oci_client,
+            negative_cache=negative_cache,
         ),
     )
 
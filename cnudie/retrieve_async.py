@@ -1,3 +1,4 @@
+import asyncio
 import collections.abc
 import dataclasses
 import io
@@ -507,6 +508,30 @@ def version_lookup(
     return lookup
 
 
+class _SingleFlight:
+    '''
+    async counterpart of `cnudie.retrieve._SingleFlight`: while a coroutine for a given key is
+    pending, further callers for the same key await the same task. Cancelling one of the callers
+    does not cancel the shared task.
+    '''
+    def __init__(self):
+        self._in_flight: dict[collections.abc.Hashable, asyncio.Task] = {}
+
+    async def __call__(
+        self,
+        key: collections.abc.Hashable,
+        function: collections.abc.Callable[..., collections.abc.Awaitable],
+        /,
+        *args,
+        **kwargs,
+    ):
+        if not (task := self._in_flight.get(key)):
+            task = self._in_flight[key] = asyncio.ensure_future(function(*args, **kwargs))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+
 def composite_component_descriptor_lookup(
     lookups: tuple[ComponentDescriptorLookupById, ...],
     ocm_repository_lookup: cnudie.retrieve.OcmRepositoryLookup | None=None,
@@ -525,14 +550,12 @@ def composite_component_descriptor_lookup(
         sets the default behaviour in case of absent component descriptors for the returned lookup
         function
     '''
-    async def lookup(
-        component_id: cnudie.util.ComponentId,
-        /,
-        ocm_repository_lookup=ocm_repository_lookup,
-        absent_ok=default_absent_ok,
-    ):
-        component_id = cnudie.util.to_component_id(component_id)
+    single_flight = _SingleFlight()
 
+    async def _lookup(
+        component_id: cnudie.util.ComponentId,
+        ocm_repository_lookup,
+    ) -> ocm.ComponentDescriptor | None:
         writebacks = []
         for lookup in lookups:
             res = None
@@ -557,6 +580,28 @@ def composite_component_descriptor_lookup(
             elif res is None: continue
             elif isinstance(res, WriteBack): writebacks.append(res)
 
+    async def lookup(
+        component_id: cnudie.util.ComponentId,
+        /,
+        ocm_repository_lookup=ocm_repository_lookup,
+        absent_ok=default_absent_ok,
+    ):
+        component_id = cnudie.util.to_component_id(component_id)
+
+        if isinstance(ocm_repository_lookup, collections.abc.Hashable):
+            # concurrent lookups for the same component-version share one retrieval
+            component_descriptor = await single_flight(
+                (component_id, ocm_repository_lookup),
+                _lookup,
+                component_id,
+                ocm_repository_lookup,
+            )
+        else:
+            component_descriptor = await _lookup(component_id, ocm_repository_lookup)
+
+        if component_descriptor:
+            return component_descriptor
+
         # component descriptor not found in lookup
         if absent_ok:
             return
@@ -4,7 +4,9 @@ import logging
 import cnudie.retrieve
 import ctt.process_dependencies
 import oci.auth
+import oci.cache
 import oci.client
+import oci.metrics
 
 '''
 exposes a CLI for "CTT" (fka: CNUDIE Transport Tool)
@@ -50,6 +52,48 @@ def configure_parser(parser):
         default=8,
         help='how many replication-tasks should be run in parallel.',
     )
+    parser.add_argument(
+        '--max-parallel-manifests',
+        type=int,
+        default=1,
+        help='how many sub-manifests of a multi-arch image should be replicated in parallel.',
+    )
+    parser.add_argument(
+        '--max-parallel-layers',
+        type=int,
+        default=1,
+        help='how many layers of an image should be copied in parallel.',
+    )
+    parser.add_argument(
+        '--capabilities-cache',
+        default=None,
+        help=(
+            'path to a file used to persist discovered OCI-registry-capabilities across runs '
+            '(will be created if absent)'
+        ),
+    )
+    parser.add_argument(
+        '--blob-cache-dir',
+        default=None,
+        help=(
+            'directory to store retrieved blobs in, and serve them from (may be shared by '
+            'concurrent runs on the same host)'
+        ),
+    )
+    parser.add_argument(
+        '--blob-cache-max-gib',
+        type=int,
+        default=64,
+        help='size-limit for --blob-cache-dir (least recently used blobs are evicted)',
+    )
+    parser.add_argument(
+        '--metrics-file',
+        default=argparse.SUPPRESS,
+        help=(
+            'if passed, OCI-request-metrics are written to the given file after replication '
+            '(as JSON if filename ends with .json, in OpenMetrics text-format otherwise)'
+        ),
+    )
     parser.add_argument(
         '--retries',
         type=int,
@@ -78,20 +122,56 @@ def configure_parser(parser):
             'OCI artefacts are still skipped when already present.'
         ),
     )
+    parser.add_argument(
+        '--replication-engine',
+        type=ctt.process_dependencies.ReplicationEngine,
+        choices=ctt.process_dependencies.ReplicationEngine,
+        default=ctt.process_dependencies.ReplicationEngine.THREADED,
+        help=(
+            f'"{ctt.process_dependencies.ReplicationEngine.THREADED.value}" (default) replicates '
+            'OCI artefacts using one thread per artefact (see --jobs). '
+            f'"{ctt.process_dependencies.ReplicationEngine.ASYNC.value}" replicates OCI artefacts '
+            'concurrently using asyncio, streaming blobs from source into target'
+        ),
+    )
+    parser.add_argument(
+        '--max-concurrent-transfers',
+        type=int,
+        default=16,
+        help='max. concurrent blob-transfers per registry (only for async replication-engine)',
+    )
 
 
-def replicate(parsed):
+def replicate(
+    parsed,
+    metrics: oci.metrics.Metrics=None,
+):
     _init_logging()
     if not ':' in parsed.ocm_component:
         print(f'{parsed.ocm_component=} does not match expected format (<name>:<version>)')
         exit(1)
 
+    capabilities_cache = oci.client.RegistryCapabilitiesCache(
+        path=parsed.capabilities_cache,
+    )
+
+    if parsed.blob_cache_dir:
+        blob_store = oci.cache.FileSystemCache(
+            root_dir=parsed.blob_cache_dir,
+            max_octets=parsed.blob_cache_max_gib * 1024 ** 3,
+        )
+    else:
+        blob_store = None
+
     oci_client = oci.client.Client(
         credentials_lookup=oci.auth.docker_credentials_lookup(
             docker_cfg=parsed.docker_config,
         ),
         max_retries=parsed.retries,
         default_backoff_base_seconds=parsed.retry_backoff_seconds,
+        capabilities_cache=capabilities_cache,
+        blob_store=blob_store,
+        metrics=metrics,
     )
 
     component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
@@ -125,9 +205,21 @@ def replicate(parsed):
         processing_mode=processing_mode,
         max_workers=max_workers,
         pruning_mode=parsed.pruning_mode,
+        max_parallel_manifests=parsed.max_parallel_manifests,
+        max_parallel_layers=parsed.max_parallel_layers,
+        replication_engine=parsed.replication_engine,
+        max_concurrent_transfers=parsed.max_concurrent_transfers,
     ):
         pass
 
+    if parsed.capabilities_cache:
+        capabilities_cache.persist()
+
+    # if metrics were passed, caller is responsible for dumping them (they might also contain
+    # metrics from requests sent by other clients)
+    if metrics is None and (metrics_file := getattr(parsed, 'metrics_file', None)):
+        oci_client.metrics.dump(path=metrics_file)
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import concurrent.futures
 import dataclasses
 import hashlib
 import json
@@ -33,6 +34,8 @@ def filter_image(
     mode: oci.ReplicationMode=oci.ReplicationMode.REGISTRY_DEFAULTS,
     platform_filter: typing.Callable[[om.OciPlatform], bool]=None,
     oci_manifest_annotations: dict[str, str]=None,
+    max_parallel_layers: int=1,
+    max_parallel_manifests: int=1,
 ) -> typing.Tuple[requests.Response, str, bytes]: # response, tgt-ref, manifest_bytes
     source_ref = om.OciImageReference.to_image_ref(source_ref)
     target_ref = om.OciImageReference.to_image_ref(target_ref)
@@ -46,6 +49,8 @@ def filter_image(
             mode=mode,
             platform_filter=platform_filter,
             annotations=oci_manifest_annotations,
+            max_parallel_layers=max_parallel_layers,
+            max_parallel_manifests=max_parallel_manifests,
         )
 
     if mode is oci.ReplicationMode.REGISTRY_DEFAULTS:
@@ -68,8 +73,9 @@ def filter_image(
         src_name = source_ref.ref_without_tag
         tgt_name = target_ref.ref_without_tag
 
-        patched_manifests = []
-        for sub_manifest in tuple(manifest.manifests):
+        def filter_sub_manifest(
+            sub_manifest: om.OciImageManifestListEntry,
+        ) -> om.OciImageManifestListEntry | None:
             source_ref = f'{src_name}@{sub_manifest.digest}'
 
             if platform_filter:
@@ -80,8 +86,7 @@ def filter_image(
                 )
                 if not platform_filter(platform):
                     logger.info(f'skipping {platform=} for {source_ref=}')
-                    manifest.manifests.remove(sub_manifest)
-                    continue
+                    return None
 
             logger.info(f'filtering to {tgt_name=}')
 
@@ -91,29 +96,52 @@ def filter_image(
                 remove_files=remove_files,
                 oci_client=oci_client,
                 oci_manifest_annotations=oci_manifest_annotations,
+                max_parallel_layers=max_parallel_layers,
+                max_parallel_manifests=max_parallel_manifests,
             )
 
             # patch (potentially) modified manifest-digest
-            patched_manifest = dataclasses.replace(
+            if (digest := f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}') \
+                == sub_manifest.digest:
+                return sub_manifest
+
+            return dataclasses.replace(
                 sub_manifest,
-                digest=f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}',
+                digest=digest,
                 size=len(manifest_bytes),
             )
-            patched_manifests.append(patched_manifest)
-
-        manifest.manifests = patched_manifests
-        manifest_dict = manifest.as_dict()
-        manifest_raw = json.dumps(manifest_dict).encode('utf-8')
 
-        manifest_digest = hashlib.sha256(manifest_raw).hexdigest()
-        target_ref = target_ref.with_new_digest(digest=manifest_digest)
+        if max_parallel_manifests > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_parallel_manifests,
+            ) as executor:
+                # executor.map preserves order of sub-manifests
+                patched_manifests = tuple(executor.map(filter_sub_manifest, manifest.manifests))
+        else:
+            patched_manifests = tuple(map(filter_sub_manifest, manifest.manifests))
+
+        tracked_manifest = om.TrackedManifest(manifest=manifest)
+
+        # avoid re-serialisation (which might alter digest) unless sub-manifests changed
+        if any(
+            patched_manifest is not sub_manifest
+            for patched_manifest, sub_manifest
+            in zip(patched_manifests, manifest.manifests)
+        ):
+            manifest.manifests = [
+                patched_manifest for patched_manifest in patched_manifests
+                if patched_manifest
+            ]
+            tracked_manifest.mark_patched()
+
+        target_ref = target_ref.with_new_digest(digest=tracked_manifest.hexdigest)
 
         res = oci_client.put_manifest(
             image_reference=target_ref,
-            manifest=manifest_raw,
+            manifest=tracked_manifest.raw_manifest,
         )
 
-        return res, str(target_ref), manifest_raw
+        return res, str(target_ref), tracked_manifest.raw_manifest
 
     # normalise single-image to multi-arch (w/ one entry)
     if mode is oci.ReplicationMode.NORMALISE_TO_MULTIARCH:
@@ -137,30 +165,26 @@ def filter_image(
             oci_manifest_annotations=oci_manifest_annotations,
         )
 
-        manifest_list = om.OciImageManifestList(
-            manifests=[
-                om.OciImageManifestListEntry(
-                    digest=f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}',
-                    mediaType=manifest.mediaType,
-                    size=len(manifest_bytes),
-                    platform=platform,
-                )
-            ],
+        manifest_list = om.TrackedManifest(
+            manifest=om.OciImageManifestList(
+                manifests=[
+                    om.OciImageManifestListEntry(
+                        digest=f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}',
+                        mediaType=manifest.mediaType,
+                        size=len(manifest_bytes),
+                        platform=platform,
+                    )
+                ],
+            ),
         )
-
-        manifest_list_bytes = json.dumps(
-            manifest_list.as_dict(),
-        ).encode('utf-8')
-
-        manifest_list_digest = hashlib.sha256(manifest_list_bytes).hexdigest()
-        target_ref = target_ref.with_new_digest(digest=manifest_list_digest)
+        target_ref = target_ref.with_new_digest(digest=manifest_list.hexdigest)
 
         res = oci_client.put_manifest(
             image_reference=target_ref,
-            manifest=manifest_list_bytes,
+            manifest=manifest_list.raw_manifest,
         )
 
-        return res, target_ref, manifest_list_bytes
+        return res, target_ref, manifest_list.raw_manifest
 
     cp_cfg_blob = True
     if isinstance(manifest, om.OciImageManifestV1):
@@ -212,16 +236,21 @@ def filter_image(
             ):
                 continue # skip blob replication if already present in tgt
 
-            blob = oci_client.blob(
-                image_reference=str(source_ref),
+            if oci_client.mount_blob(
+                image_reference=target_ref,
                 digest=layer.digest,
-                stream=True,
-            )
+                source_image_reference=source_ref,
+            ):
+                continue # skip blob download if registry allows cross-repository mount
+
             oci_client.put_blob(
                 image_reference=target_ref,
                 digest=layer.digest,
                 octets_count=layer.size,
-                data=blob,
+                data=oci_client.iter_blob(
+                    image_reference=source_ref,
+                    digest=layer.digest,
+                ),
             )
             continue
 
@@ -235,11 +264,11 @@ def filter_image(
         # to calculate digest-hash prior to upload to tgt; XXX: we might use streaming
         # when interacting w/ oci-registries that support chunked-uploads
         with tempfile.TemporaryFile() as f:
-            src_tar_stream = oci_client.blob(
-                image_reference=str(source_ref),
+            src_tar_stream = oci_client.iter_blob(
+                image_reference=source_ref,
                 digest=layer.digest,
-                stream=True,
-            ).iter_content(chunk_size=tarfile.BLOCKSIZE * 64)
+                chunk_size=tarfile.BLOCKSIZE * 64,
+            )
             src_tar_fobj = tarutil.FilelikeProxy(generator=src_tar_stream)
             filtered_stream = tarutil.filtered_tarfile_generator(
                 src_tf=tarfile.open(fileobj=src_tar_fobj, mode='r|*'),
@@ -290,8 +319,12 @@ def filter_image(
             new_layer = dataclasses.replace(layer, digest=layer_digest, size=leng)
             layers_copy[layers_copy.index(layer)] = new_layer
 
+    tracked_manifest = om.TrackedManifest(manifest=manifest)
+
     # switch layers in manifest to announce changes w/ manifest-upload
-    manifest.layers = layers_copy
+    if layers_copy != manifest.layers:
+        manifest.layers = layers_copy
+        tracked_manifest.mark_patched()
 
     # need to patch cfg-object, in case layer-digests changed
     if cp_cfg_blob:
@@ -328,26 +361,18 @@ def filter_image(
         data=cfg_blob,
     )
 
-    manifest.config = dataclasses.replace(manifest.config, digest=cfg_digest, size=cfg_leng)
-
-    manifest_raw = json.dumps(manifest.as_dict()).encode('utf-8')
-
-    if oci_manifest_annotations:
-        manifest_dict = json.loads(manifest_raw)
-        if not 'annotations' in manifest_dict:
-            manifest_dict['annotations'] = {}
-
-        manifest_dict['annotations'] |= oci_manifest_annotations
+    if cfg_digest != manifest.config.digest:
+        manifest.config = dataclasses.replace(manifest.config, digest=cfg_digest, size=cfg_leng)
+        tracked_manifest.mark_patched()
 
-        manifest_raw = json.dumps(manifest_dict).encode('utf-8')
+    tracked_manifest.patch_annotations(oci_manifest_annotations)
 
-    manifest_digest = hashlib.sha256(manifest_raw).hexdigest()
-    target_ref = target_ref.with_new_digest(digest=manifest_digest)
+    target_ref = target_ref.with_new_digest(digest=tracked_manifest.hexdigest)
 
     res = oci_client.put_manifest(
         image_reference=target_ref,
-        manifest=manifest_raw
+        manifest=tracked_manifest.raw_manifest,
     )
     res.raise_for_status()
 
-    return res, target_ref, manifest_raw
+    return res, target_ref, tracked_manifest.raw_manifest
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import collections
 import collections.abc
 import concurrent.futures
@@ -18,6 +19,7 @@ import os
 import threading
 import typing
 
+import aiohttp
 import dacite
 import yaml
 
@@ -26,7 +28,9 @@ import ctt.oci_util
 import ctt.replicate
 import oci
 import oci.client
+import oci.client_async
 import oci.model as om
+import oci.replicate_async
 import ocm
 import ocm.gardener
 import ocm.iter
@@ -71,6 +75,23 @@ class PruningMode(enum.StrEnum):
     FORCE_OVERWRITE_DESCRIPTORS = 'force-overwrite-descriptors'  # overwrite descriptors, skip images
 
 
+class ReplicationEngine(enum.StrEnum):
+    '''
+    Controls how OCI artefacts are replicated.
+
+    THREADED replicates artefacts using the (blocking) `oci.client.Client`, using one thread per
+    concurrently replicated artefact (see `max_workers`).
+
+    ASYNC replicates artefacts using asyncio and `oci.client_async.Client` from within a single
+    thread (see `oci.replicate_async`), streaming blobs from source into target. Concurrent
+    blob-transfers are limited per registry (see `max_concurrent_transfers`). Artefacts which
+    need to be filtered (`remove_files`) are still processed by the threaded engine, as are
+    artefacts which could not be replicated by the async engine.
+    '''
+    THREADED = 'threaded'
+    ASYNC = 'async'
+
+
 @functools.cache
 def create_component_descriptor_lookup_for_ocm_repo(
     ocm_repo_url: str,
@@ -393,6 +414,165 @@ uploaded_image_refs_to_ready_events = {}  # <ref>:<event> (set if digest is avai
 upload_image_lock = threading.Lock()
 
 
+def _oci_manifest_annotations(
+    replication_resource_element: ctt.model.ReplicationResourceElement,
+    inject_ocm_coordinates_into_oci_manifests: bool,
+) -> dict[str, str] | None:
+    if not inject_ocm_coordinates_into_oci_manifests:
+        return None
+
+    component = replication_resource_element.component_id
+    resource = replication_resource_element.target
+
+    return {
+        'cloud.gardener/ocm-component': f'{component.name}:{component.version}',
+        'cloud.gardener/ocm-resource': f'{resource.name}:{resource.version}',
+    }
+
+
+async def _replicate_async(
+    replication_resource_elements: collections.abc.Iterable[ctt.model.ReplicationResourceElement],
+    oci_client: oci.client.Client,
+    replication_mode: oci.ReplicationMode,
+    platform_filter: collections.abc.Callable[[om.OciPlatform], bool] | None,
+    inject_ocm_coordinates_into_oci_manifests: bool,
+    max_concurrent_transfers: int,
+) -> list[str | BaseException]:
+    '''
+    replicates the given elements' OCI artefacts concurrently, using an async client configured
+    like the given (blocking) client. Returns a list of digests of the uploaded manifests (or the
+    respective exception, if replication failed), in order of passed elements.
+    '''
+    semaphores = oci.replicate_async.RegistrySemaphores(limit=max_concurrent_transfers)
+
+    # concurrency is limited by semaphores (per registry) rather than by connection-pool
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        async_client = oci.client_async.Client(
+            credentials_lookup=oci_client.credentials_lookup,
+            routes=oci_client.routes,
+            disable_tls_validation=oci_client.disable_tls_validation,
+            timeout_seconds=oci_client.timeout_seconds,
+            session=session,
+            tag_preprocessing_callback=oci_client.tag_preprocessing_callback,
+            tag_postprocessing_callback=oci_client.tag_postprocessing_callback,
+            metrics=oci_client.metrics,
+        )
+
+        async def replicate(
+            replication_resource_element: ctt.model.ReplicationResourceElement,
+        ) -> str:
+            src_ref = replication_resource_element.src_ref
+            tgt_ref = replication_resource_element.tgt_ref
+            logger.info(f'processing (async) {src_ref=} -> {tgt_ref=}')
+
+            _, _, raw_manifest = await oci.replicate_async.replicate_artifact(
+                src_image_reference=src_ref,
+                tgt_image_reference=tgt_ref,
+                oci_client=async_client,
+                mode=replication_mode,
+                platform_filter=platform_filter,
+                annotations=_oci_manifest_annotations(
+                    replication_resource_element=replication_resource_element,
+                    inject_ocm_coordinates_into_oci_manifests=(
+                        inject_ocm_coordinates_into_oci_manifests
+                    ),
+                ),
+                semaphores=semaphores,
+            )
+            logger.info(f'finished processing (async) {src_ref=} -> {tgt_ref=}')
+
+            return f'sha256:{hashlib.sha256(raw_manifest).hexdigest()}'
+
+        return await asyncio.gather(
+            *(
+                replicate(replication_resource_element)
+                for replication_resource_element in replication_resource_elements
+            ),
+            return_exceptions=True,
+        )
+
+
+def replicate_async(
+    replication_resource_elements: collections.abc.Iterable[ctt.model.ReplicationResourceElement],
+    oci_client: oci.client.Client,
+    replication_mode: oci.ReplicationMode=oci.ReplicationMode.PREFER_MULTIARCH,
+    platform_filter: collections.abc.Callable[[om.OciPlatform], bool]=None,
+    inject_ocm_coordinates_into_oci_manifests: bool=False,
+    max_concurrent_transfers: int=16,
+):
+    '''
+    replicates OCI artefacts of given elements using `oci.replicate_async` (see
+    `ReplicationEngine.ASYNC`). Results are registered the same way as done by
+    `process_upload_request` (which will thus not replicate those artefacts again). Elements which
+    need to be filtered, or which are already present in target are skipped. Elements which could
+    not be replicated are left to be processed by `process_upload_request`.
+    '''
+    to_replicate = {} # {tgt_ref: (replication_resource_element, event)}
+
+    with upload_image_lock:
+        for replication_resource_element in replication_resource_elements:
+            tgt_ref = replication_resource_element.tgt_ref
+
+            if (
+                replication_resource_element.digest
+                or replication_resource_element.remove_files
+                or tgt_ref in uploaded_image_refs_to_ready_events
+                or tgt_ref in to_replicate
+            ):
+                continue
+
+            upload_done_event = threading.Event()
+            uploaded_image_refs_to_ready_events[tgt_ref] = upload_done_event
+            to_replicate[tgt_ref] = (replication_resource_element, upload_done_event)
+
+    if not to_replicate:
+        return
+
+    try:
+        results = asyncio.run(_replicate_async(
+            replication_resource_elements=[element for element, _ in to_replicate.values()],
+            oci_client=oci_client,
+            replication_mode=replication_mode,
+            platform_filter=platform_filter,
+            inject_ocm_coordinates_into_oci_manifests=inject_ocm_coordinates_into_oci_manifests,
+            max_concurrent_transfers=max_concurrent_transfers,
+        ))
+    except Exception:
+        results = [None] * len(to_replicate)
+        logger.exception('async replication failed - falling back to threaded replication')
+
+    for (tgt_ref, (_, upload_done_event)), result in zip(to_replicate.items(), results):
+        if isinstance(result, str):
+            uploaded_image_refs_to_digests[tgt_ref] = result
+            upload_done_event.set()
+            continue
+
+        if result:
+            logger.warning(
+                f'async replication to {tgt_ref=} failed - will retry: {result!r}'
+            )
+        # exactly one of the waiting threads will (re-)try to replicate
+        _release_upload(
+            tgt_ref=tgt_ref,
+            upload_done_event=upload_done_event,
+        )
+
+
+def _release_upload(
+    tgt_ref: str,
+    upload_done_event: threading.Event,
+):
+    '''
+    to be called if upload to `tgt_ref` failed (i.e. no digest was registered). Wakes up threads
+    waiting for given event, after removing it, so that exactly one of them will register a new
+    event and (re-)try replication, while the other ones will wait for it.
+    '''
+    with upload_image_lock:
+        if uploaded_image_refs_to_ready_events.get(tgt_ref) is upload_done_event:
+            del uploaded_image_refs_to_ready_events[tgt_ref]
+    upload_done_event.set()
+
+
 # uploads a single OCI artifact and returns the content digest
 def process_upload_request(
     replication_resource_element: ctt.model.ReplicationResourceElement,
@@ -401,6 +581,8 @@ def process_upload_request(
     platform_filter: collections.abc.Callable[[om.OciPlatform], bool]=None,
     inject_ocm_coordinates_into_oci_manifests: bool=False,
     processing_mode: ProcessingMode=ProcessingMode.REGULAR,
+    max_parallel_manifests: int=1,
+    max_parallel_layers: int=1,
 ) -> str:
     src_ref = replication_resource_element.src_ref
     tgt_ref = replication_resource_element.tgt_ref
@@ -409,42 +591,35 @@ def process_upload_request(
         logger.debug(f'{tgt_ref=} exists - skipping upload')
         return replication_resource_element.digest
 
-    # if event is present, upload might still be in progress (done if event is "set")
-    with upload_image_lock:
-        if tgt_ref in uploaded_image_refs_to_ready_events:
-            upload_done_event = uploaded_image_refs_to_ready_events[tgt_ref]
-            wait_for_upload = True
-        else:
-            upload_done_event = threading.Event()
-            uploaded_image_refs_to_ready_events[tgt_ref] = upload_done_event
-            wait_for_upload = False
+    # if event is present, upload might still be in progress (done if event is "set"). if upload
+    # failed, event is removed before being set, so re-check after waiting (exactly one of the
+    # waiting threads will then register a new event and retry)
+    while True:
+        with upload_image_lock:
+            if tgt_ref in uploaded_image_refs_to_digests:  # digest already present
+                logger.info(f'{tgt_ref=} - was already uploaded by another rule - skipping')
+                return uploaded_image_refs_to_digests[tgt_ref]
 
-    if wait_for_upload:
-        upload_done_event.wait()
+            if (upload_done_event := uploaded_image_refs_to_ready_events.get(tgt_ref)) is None:
+                upload_done_event = threading.Event()
+                uploaded_image_refs_to_ready_events[tgt_ref] = upload_done_event
+                break
 
-    if tgt_ref in uploaded_image_refs_to_digests:  # digest already present
-        logger.info(f'{tgt_ref=} - was already uploaded by another rule - skipping')
-        return uploaded_image_refs_to_digests[tgt_ref]
+        upload_done_event.wait()
 
     # most common case: tgt has not yet been processed - process and afterwards signal
     # other threads waiting for upload result that result is ready by setting the event
 
     remove_files = replication_resource_element.remove_files
-    component = replication_resource_element.component_id
-    resource = replication_resource_element.target
 
     logger.info(
         f'processing {src_ref=} -> {tgt_ref=} {remove_files=} {replication_mode=} {platform_filter=}'
     )
 
-    if inject_ocm_coordinates_into_oci_manifests:
-        oci_manifest_annotations = {
-            'cloud.gardener/ocm-component': f'{component.name}:{component.version}',
-            'cloud.gardener/ocm-resource': f'{resource.name}:{resource.version}',
-        }
-    else:
-        oci_manifest_annotations = None
-
+    oci_manifest_annotations = _oci_manifest_annotations(
+        replication_resource_element=replication_resource_element,
+        inject_ocm_coordinates_into_oci_manifests=inject_ocm_coordinates_into_oci_manifests,
+    )
     logger.debug(f'{oci_manifest_annotations=}')
 
     if processing_mode is ProcessingMode.DRY_RUN:
@@ -462,11 +637,17 @@ def process_upload_request(
             platform_filter=platform_filter,
             oci_client=oci_client,
             oci_manifest_annotations=oci_manifest_annotations,
+            max_parallel_manifests=max_parallel_manifests,
+            max_parallel_layers=max_parallel_layers,
         )
     except Exception as e:
         logger.error(
             f'error trying to replicate {src_ref=} -> {tgt_ref=}'
         )
+        _release_upload(
+            tgt_ref=tgt_ref,
+            upload_done_event=upload_done_event,
+        )
         e.add_note(f'filter_image: {src_ref=} -> {tgt_ref=}')
         raise e
 
@@ -637,8 +818,21 @@ def process_images(
     max_workers: int=16,
     tgt_ocm_repo_path: str | None=None, # deprecated -> specify `ocm_repository` in tgt-cfg instead
     pruning_mode: PruningMode=PruningMode.PRUNE_SUBTREES,
+    max_parallel_manifests: int=1,
+    max_parallel_layers: int=1,
+    replication_engine: ReplicationEngine=ReplicationEngine.THREADED,
+    max_concurrent_transfers: int=16,
 ) -> collections.abc.Generator[ocm.iter.Node, None, None]:
     '''
+    `max_parallel_manifests` controls how many sub-manifests of each multi-arch image are
+    replicated concurrently (in addition to the `max_workers` images processed concurrently).
+    Likewise, `max_parallel_layers` controls how many layers of each image are copied
+    concurrently.
+
+    `replication_engine` selects how OCI artefacts are replicated (see `ReplicationEngine`);
+    for `ReplicationEngine.ASYNC`, `max_concurrent_transfers` limits concurrent blob-transfers
+    per registry.
+
     note: Passing a filter to prevent component descriptors from being replicated using the
     `skip_component_upload` parameter will still replicate all its resources (i.e. oci images)
     as well as referenced components. In contrast to that, passing a filter using the
@@ -735,6 +929,10 @@ def process_images(
             skip_component_upload=skip_component_upload,
             overwrite_descriptors=pruning_mode is PruningMode.FORCE_OVERWRITE_DESCRIPTORS,
             max_workers=max_workers,
+            max_parallel_manifests=max_parallel_manifests,
+            max_parallel_layers=max_parallel_layers,
+            replication_engine=replication_engine,
+            max_concurrent_transfers=max_concurrent_transfers,
         )
 
 
@@ -753,7 +951,24 @@ def process_replication_plan_step(
     skip_component_upload: collections.abc.Callable[[ocm.Component], bool] | None=None,
     overwrite_descriptors: bool=False,
     max_workers: int=16,
+    max_parallel_manifests: int=1,
+    max_parallel_layers: int=1,
+    replication_engine: ReplicationEngine=ReplicationEngine.THREADED,
+    max_concurrent_transfers: int=16,
 ) -> collections.abc.Generator[ocm.iter.Node, None, None]:
+    if (
+        replication_engine is ReplicationEngine.ASYNC
+        and processing_mode is ProcessingMode.REGULAR
+    ):
+        replicate_async(
+            replication_resource_elements=replication_plan_step.resources,
+            oci_client=oci_client,
+            replication_mode=replication_mode,
+            platform_filter=platform_filter,
+            inject_ocm_coordinates_into_oci_manifests=inject_ocm_coordinates_into_oci_manifests,
+            max_concurrent_transfers=max_concurrent_transfers,
+        )
+
     def process_replication_resource_element(
         replication_resource_element: ctt.model.ReplicationResourceElement,
     ) -> ctt.model.ReplicationResourceElement:
@@ -764,6 +979,8 @@ def process_replication_plan_step(
             platform_filter=platform_filter,
             inject_ocm_coordinates_into_oci_manifests=inject_ocm_coordinates_into_oci_manifests,
             processing_mode=processing_mode,
+            max_parallel_manifests=max_parallel_manifests,
+            max_parallel_layers=max_parallel_layers,
         )
 
         if not oci_manifest_digest:
@@ -779,14 +996,12 @@ def process_replication_plan_step(
                 accept=replication_mode.accept_header(),
             ).content
 
-            for extra_tag in extra_tags:
-                push_target = f'{target_repo}:{extra_tag}'
+            extra_tag_manifests = oci_client.head_manifests(
+                image_references=(f'{target_repo}:{extra_tag}' for extra_tag in extra_tags),
+                accept=replication_mode.accept_header(),
+            )
 
-                manifest_blobref = oci_client.head_manifest(
-                    image_reference=push_target,
-                    absent_ok=True,
-                    accept=replication_mode.accept_header(),
-                )
+            for push_target, manifest_blobref in extra_tag_manifests.items():
                 if manifest_blobref and manifest_blobref.digest == oci_manifest_digest:
                     logger.info(
                       f'skipping {push_target=}: already present {oci_manifest_digest=}'
@@ -76,21 +76,20 @@ def replicate_oci_artifact_with_patched_component_descriptor(
     cfg_raw = json.dumps(dataclasses.asdict(cfg)).encode('utf-8')
 
     # replicate all blobs except overwrites
-    target_manifest = oci.replicate_blobs(
-        src_ref=src_ref,
-        src_oci_manifest=src_manifest,
-        tgt_ref=target_ref,
-        oci_client=oci_client,
-        blob_overwrites={
-            src_component_descriptor_oci_blob_ref: raw_fobj,
-            src_manifest.config: cfg_raw,
-        },
+    target_manifest = om.TrackedManifest(
+        manifest=oci.replicate_blobs(
+            src_ref=src_ref,
+            src_oci_manifest=src_manifest,
+            tgt_ref=target_ref,
+            oci_client=oci_client,
+            blob_overwrites={
+                src_component_descriptor_oci_blob_ref: raw_fobj,
+                src_manifest.config: cfg_raw,
+            },
+        ),
     )
 
-    target_manifest_dict = target_manifest.as_dict()
-    target_manifest_bytes = json.dumps(target_manifest_dict).encode('utf-8')
-
     oci_client.put_manifest(
         image_reference=target_ref,
-        manifest=target_manifest_bytes,
+        manifest=target_manifest.raw_manifest,
     )
@@ -1,4 +1,5 @@
 import collections.abc
+import concurrent.futures
 import dataclasses
 import enum
 import hashlib
@@ -7,7 +8,6 @@ import json
 import logging
 import zlib
 
-import dacite
 import requests
 
 import oci.auth as oa
@@ -70,6 +70,8 @@ def replicate_artifact(
     mode: ReplicationMode=ReplicationMode.REGISTRY_DEFAULTS,
     platform_filter: collections.abc.Callable[[om.OciPlatform], bool]=None,
     annotations: dict[str, str]=None,
+    max_parallel_layers: int=1,
+    max_parallel_manifests: int=1,
 ) -> tuple[requests.Response, str, bytes]:
     '''
     replicate the given OCI Artifact from src_image_reference to tgt_image_reference.
@@ -101,6 +103,14 @@ def replicate_artifact(
     overwritten. If existing values are identical, it is tried to avoid to create a "pseudo-diff"
     (i.e. in case the existing values are equal, the manifest will be left untouched).
 
+    If `max_parallel_layers` is greater than one, blobs are copied concurrently using a pool of
+    (at most) the given amount of threads. The manifest is uploaded after all blobs were
+    replicated. Note that for "legacy / v1" source artifacts, blobs are always copied sequentially.
+
+    Likewise, if `max_parallel_manifests` is greater than one, the sub-manifests of multi-arch
+    artifacts are replicated concurrently. The resulting manifest-list retains the order of the
+    source's manifest-list, and is uploaded after all sub-manifests were replicated.
+
     pass either `credentials_lookup`, `routes`, OR `oci_client`
     '''
     if not (bool(credentials_lookup) ^ bool(oci_client)):
@@ -124,7 +134,7 @@ def replicate_artifact(
         image_reference=src_image_reference,
         accept=accept,
     )
-    raw_manifest = resp.text
+    raw_manifest = resp.content
     manifest = json.loads(raw_manifest)
 
     # workaround: some manifests do not contain `mediaType`
@@ -166,86 +176,98 @@ def replicate_artifact(
             om.OCI_IMAGE_INDEX_MIME,
         ):
             # multi-arch
-            manifest = dacite.from_dict(
-                data_class=om.OciImageManifestList,
-                data=manifest,
+            manifest = om.TrackedManifest(
+                manifest=om.OciImageManifestList.from_dict(manifest, raw_manifest=raw_manifest),
             )
-            manifest: om.OciImageManifestList
+            manifest_list: om.OciImageManifestList = manifest.manifest
 
             src_ref = om.OciImageReference(image_reference=src_image_reference)
             src_name = src_ref.ref_without_tag
             tgt_ref = om.OciImageReference(image_reference=tgt_image_reference)
             tgt_name = tgt_ref.ref_without_tag
 
-            # try to avoid modifications (from x-serialisation) - unless we have to
-            manifest_dirty = False
-
-            # cp manifests to tuple, because we _might_ modify if there is a platform_filter
-            for idx, sub_manifest in enumerate(tuple(manifest.manifests)):
+            # only propagate PREFER_MULTIARCH (preserves nested indices); never pass
+            # NORMALISE_TO_MULTIARCH as it would wrap sub-manifests in spurious index layers
+            recursive_mode = ReplicationMode.REGISTRY_DEFAULTS
+            if mode is ReplicationMode.PREFER_MULTIARCH:
+                recursive_mode = ReplicationMode.PREFER_MULTIARCH
+
+            def replicate_sub_manifest(
+                sub_manifest: om.OciImageManifestListEntry,
+            ) -> om.OciImageManifestListEntry | None:
+                '''
+                replicates the given sub-manifest, and returns the (potentially patched) entry
+                for the target manifest-list, or `None` if it is to be omitted (platform_filter)
+                '''
                 src_reference = f'{src_name}@{sub_manifest.digest}'
                 tgt_reference = f'{tgt_name}'
 
                 if platform_filter:
                     platform = op.from_single_image(
                         image_reference=src_reference,
-                        oci_client=oci_client,
+                        oci_client=client,
                         base_platform=sub_manifest.platform,
                     )
                     if not platform_filter(platform):
                         logger.info(f'skipping {platform=} for {src_image_reference=}')
-                        manifest_dirty = True
-                        manifest.manifests.remove(sub_manifest)
-                        continue
+                        return None
 
                 logger.info(f'replicating to {tgt_reference=}')
 
-                # only propagate PREFER_MULTIARCH (preserves nested indices); never pass
-                # NORMALISE_TO_MULTIARCH as it would wrap sub-manifests in spurious index layers
-                recursive_mode = ReplicationMode.REGISTRY_DEFAULTS
-                if mode is ReplicationMode.PREFER_MULTIARCH:
-                    recursive_mode = ReplicationMode.PREFER_MULTIARCH
-
                 res, ref, submanifest_bytes = replicate_artifact(
                     src_image_reference=src_reference,
                     tgt_image_reference=tgt_reference,
                     oci_client=client,
                     mode=recursive_mode,
                     annotations=annotations,
+                    max_parallel_layers=max_parallel_layers,
+                    max_parallel_manifests=max_parallel_manifests,
                 )
 
                 submanifest_digest = f'sha256:{hashlib.sha256(submanifest_bytes).hexdigest()}'
-                if submanifest_digest != sub_manifest.digest:
-                    patched_sub_manifest = dataclasses.replace(
-                        sub_manifest,
-                        digest=submanifest_digest,
-                        size=len(submanifest_bytes),
-                    )
-                    manifest.manifests.remove(sub_manifest)
-                    manifest.manifests.insert(idx, patched_sub_manifest)
-                    manifest_dirty = True
-
-            if annotations:
-                # try to avoid unnecessary changes by x-serialisation - only add values if
-                # they are either new or different
-                for k, v in annotations.items():
-                    if manifest.annotations.get(k) == v:
-                        continue
-                    else:
-                        manifest.annotations[k] = v
-                        manifest_dirty = True
-
-            if manifest_dirty:
-                raw_manifest = json.dumps(manifest.as_dict())
-
-            manifest_digest = hashlib.sha256(raw_manifest.encode('utf-8')).hexdigest()
-            tgt_image_reference = tgt_image_reference.with_new_digest(digest=manifest_digest)
+                if submanifest_digest == sub_manifest.digest:
+                    return sub_manifest
+
+                return dataclasses.replace(
+                    sub_manifest,
+                    digest=submanifest_digest,
+                    size=len(submanifest_bytes),
+                )
+
+            if max_parallel_manifests > 1:
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_parallel_manifests,
+                ) as executor:
+                    # executor.map preserves order of sub-manifests
+                    replicated_manifests = tuple(executor.map(
+                        replicate_sub_manifest,
+                        manifest_list.manifests,
+                    ))
+            else:
+                replicated_manifests = tuple(map(replicate_sub_manifest, manifest_list.manifests))
+
+            # try to avoid modifications (from x-serialisation) - unless we have to
+            if any(
+                replicated_manifest is not sub_manifest
+                for replicated_manifest, sub_manifest
+                in zip(replicated_manifests, manifest_list.manifests)
+            ):
+                manifest_list.manifests = [
+                    replicated_manifest for replicated_manifest in replicated_manifests
+                    if replicated_manifest
+                ]
+                manifest.mark_patched()
+
+            manifest.patch_annotations(annotations)
+
+            tgt_image_reference = tgt_image_reference.with_new_digest(digest=manifest.hexdigest)
 
             res = client.put_manifest(
                 image_reference=tgt_image_reference,
-                manifest=raw_manifest,
+                manifest=manifest.raw_manifest,
             )
 
-            return res, tgt_image_reference, raw_manifest.encode('utf-8')
+            return res, tgt_image_reference, manifest.raw_manifest
 
         elif media_type in (
             om.OCI_MANIFEST_SCHEMA_V2_MIME,
@@ -271,38 +293,35 @@ def replicate_artifact(
                     tgt_image_reference=tgt_image_ref,
                     oci_client=oci_client,
                     annotations=annotations,
+                    max_parallel_layers=max_parallel_layers,
+                    max_parallel_manifests=max_parallel_manifests,
                 )
 
-                manifest_list = om.OciImageManifestList(
-                    manifests=[
-                        om.OciImageManifestListEntry(
-                            digest=f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}',
-                            mediaType=media_type,
-                            size=len(manifest_bytes),
-                            platform=platform,
-                        ),
-                    ],
-                    mediaType=om.DOCKER_MANIFEST_LIST_MIME,
+                manifest_list = om.TrackedManifest(
+                    manifest=om.OciImageManifestList(
+                        manifests=[
+                            om.OciImageManifestListEntry(
+                                digest=f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}',
+                                mediaType=media_type,
+                                size=len(manifest_bytes),
+                                platform=platform,
+                            ),
+                        ],
+                        mediaType=om.DOCKER_MANIFEST_LIST_MIME,
+                    ),
+                )
+                tgt_image_reference = tgt_image_reference.with_new_digest(
+                    digest=manifest_list.hexdigest,
                 )
-
-                manifest_list_bytes = json.dumps(
-                    manifest_list.as_dict(),
-                ).encode('utf-8')
-
-                manifest_digest = hashlib.sha256(manifest_list_bytes).hexdigest()
-                tgt_image_reference = tgt_image_reference.with_new_digest(digest=manifest_digest)
 
                 res = oci_client.put_manifest(
                     image_reference=tgt_image_reference,
-                    manifest=manifest_list_bytes,
+                    manifest=manifest_list.raw_manifest,
                 )
 
-                return res, tgt_image_reference, manifest_list_bytes
+                return res, tgt_image_reference, manifest_list.raw_manifest
 
-            manifest = dacite.from_dict(
-                data_class=om.OciImageManifest,
-                data=json.loads(raw_manifest)
-            )
+            manifest = om.OciImageManifest.from_dict(manifest, raw_manifest=raw_manifest)
             need_uncompressed_layer_digests = False
             uncompressed_layer_digests = None
         else:
@@ -310,7 +329,14 @@ def replicate_artifact(
     else:
       raise NotImplementedError(schema_version)
 
-    for idx, layer in enumerate(manifest.blobs()):
+    # retains original manifest-octets (for verbatim replication), unless patched
+    tracked_manifest = om.TrackedManifest(manifest=manifest)
+
+    def replicate_blob(idx: int, layer: om.OciBlobRef) -> bool:
+        '''
+        replicates the given blob from src to tgt. Returns `True` if the blob is the cfg-blob
+        and is absent in src (in which case a cfg-blob needs to be synthesised).
+        '''
         # need to specially handle cfg-blob (may be absent for v2 / legacy images)
 
         is_cfg_blob = idx == 0
@@ -319,7 +345,7 @@ def replicate_artifact(
             # then there will never be a cfg-blob in src.
             # -> silently skip to avoid emitting a confusing, but unhelpful warning
             logger.debug(f'{src_image_reference=} - synthesised cfg-blob - skipping replication')
-            continue
+            return False
 
         head_res = client.head_blob(
             image_reference=tgt_image_reference,
@@ -328,7 +354,7 @@ def replicate_artifact(
         if head_res.ok:
             if not need_uncompressed_layer_digests:
                 logger.info(f'skipping blob download {layer.digest=} - already exists in tgt')
-                continue # no need to download if blob already exists in tgt
+                return False # no need to download if blob already exists in tgt
             elif not is_cfg_blob:
                 # we will not need to re-upload, however we do need the uncompressed digest
                 blob_res = client.blob(
@@ -344,7 +370,27 @@ def replicate_artifact(
                     layer_hash.update(decompressor.decompress(chunk))
 
                 uncompressed_layer_digests.append(f'sha256:{layer_hash.hexdigest()}')
-                continue # we may still skip the upload, of course
+                return False # we may still skip the upload, of course
+
+        if not need_uncompressed_layer_digests and client.mount_blob(
+            image_reference=tgt_image_reference,
+            digest=layer.digest,
+            source_image_reference=src_image_reference,
+        ):
+            return False # no need to download if blob could be mounted from src-repository
+
+        if not is_cfg_blob and not need_uncompressed_layer_digests:
+            # resumes download if connection drops (which is likely for large layers)
+            client.put_blob(
+                image_reference=tgt_image_reference,
+                digest=layer.digest,
+                octets_count=layer.size,
+                data=client.iter_blob(
+                    image_reference=src_image_reference,
+                    digest=layer.digest,
+                ),
+            )
+            return False
 
         # todo: consider silencing warning if we do v1->v2-conversion (cfg-blob will never exist
         #       in this case
@@ -359,8 +405,7 @@ def replicate_artifact(
                 'falling back to non-verbatim replication '
                 f'{src_image_reference=} {tgt_image_reference=}'
             )
-            need_to_synthesise_cfg_blob = True
-            continue
+            return True
 
         if need_uncompressed_layer_digests:
             uncompressed_layer_hash = hashlib.sha256()
@@ -382,6 +427,21 @@ def replicate_artifact(
             data=blob_res,
         )
 
+        return False
+
+    blobs = tuple(manifest.blobs())
+
+    # uncompressed layer-digests must be collected in order of layers -> only copy blobs
+    # concurrently if those are not required
+    if max_parallel_layers > 1 and not need_uncompressed_layer_digests:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel_layers) as executor:
+            cfg_blob_absent = tuple(executor.map(replicate_blob, range(len(blobs)), blobs))
+    else:
+        cfg_blob_absent = tuple(map(replicate_blob, range(len(blobs)), blobs))
+
+    if any(cfg_blob_absent):
+        need_to_synthesise_cfg_blob = True
+
     if need_to_synthesise_cfg_blob:
         fake_cfg_dict = json.loads(json.loads(raw_manifest)['history'][0]['v1Compatibility'])
 
@@ -400,34 +460,24 @@ def replicate_artifact(
             data=fake_cfg_raw,
         )
 
-        manifest_dict = manifest.as_dict()
         # patch-on altered cfg-digest
-        manifest_dict['config']['digest'] = cfg_digest
-        manifest_dict['config']['size'] = len(fake_cfg_raw)
-        raw_manifest = json.dumps(manifest_dict)
-
-    if annotations:
-        manifest_dirty = False
-
-        for k, v in annotations.items():
-            if manifest.annotations.get(k) == v:
-                continue
-            else:
-                manifest.annotations[k] = v
-                manifest_dirty = True
+        manifest.config = dataclasses.replace(
+            manifest.config,
+            digest=cfg_digest,
+            size=len(fake_cfg_raw),
+        )
+        tracked_manifest.mark_patched()
 
-        if manifest_dirty:
-            raw_manifest = json.dumps(manifest.as_dict())
+    tracked_manifest.patch_annotations(annotations)
 
-    manifest_digest = hashlib.sha256(raw_manifest.encode('utf-8')).hexdigest()
-    tgt_image_reference = tgt_image_reference.with_new_digest(digest=manifest_digest)
+    tgt_image_reference = tgt_image_reference.with_new_digest(digest=tracked_manifest.hexdigest)
 
     res = client.put_manifest(
         image_reference=tgt_image_reference,
-        manifest=raw_manifest,
+        manifest=tracked_manifest.raw_manifest,
     )
 
-    return res, tgt_image_reference, raw_manifest.encode('utf-8')
+    return res, tgt_image_reference, tracked_manifest.raw_manifest
 
 
 def replicate_blobs(
@@ -476,6 +526,17 @@ def replicate_blobs(
         else:
             digest = blob.digest
 
+            if oci_client.mount_blob(
+                image_reference=tgt_ref,
+                digest=digest,
+                source_image_reference=src_ref,
+            ):
+                return om.OciBlobRef(
+                    digest=digest,
+                    mediaType=blob.mediaType,
+                    size=blob.size,
+                )
+
             src_blob: requests.models.Response = oci_client.blob(
                 image_reference=src_ref,
                 digest=digest,
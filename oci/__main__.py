@@ -156,22 +156,25 @@ def blob(parsed, oci_client: oci.client.Client):
             print(f'Error: no layer with {index=}')
             exit(1)
 
-    if parsed.outfile == '-':
-        if sys.stdout.isatty():
-            print('refusing to write to interactive terminal (redirect stdout, or pass --outfile)')
-            exit(1)
+    if parsed.outfile != '-':
+        oci_client.download_blob(
+            image_reference=image_reference,
+            digest=digest,
+            path=parsed.outfile,
+            max_parallel_ranges=parsed.parallel_ranges,
+        )
+        return
 
-        outfh = sys.stdout.buffer
-    else:
-        outfh = open(parsed.outfile, 'wb')
+    if sys.stdout.isatty():
+        print('refusing to write to interactive terminal (redirect stdout, or pass --outfile)')
+        exit(1)
+
+    outfh = sys.stdout.buffer
 
-    blob = oci_client.blob(
+    for chunk in oci_client.iter_blob(
         image_reference=image_reference,
         digest=digest,
-        stream=True,
-    )
-
-    for chunk in blob.iter_content(chunk_size=4096):
+    ):
         outfh.write(chunk)
     outfh.flush()
 
@@ -254,6 +257,13 @@ def main():
         default='-',
         help='where to write blob to (defaults to writing to stdout)',
     )
+    blob_parser.add_argument(
+        '--parallel-ranges',
+        type=int,
+        required=False,
+        default=1,
+        help='retrieve large blobs as multiple byte-ranges concurrently (requires --outfile)',
+    )
 
     parsed = parser.parse_args()
 
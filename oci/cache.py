@@ -0,0 +1,498 @@
+'''
+caches for OCI content, intended to be used w/ `oci.client.Client`.
+
+As digest-addressed content (manifests and blobs) is immutable, it may be cached indefinitely
+(limited only by cache-size). Caches implement `Cache`, and may be stacked using `LayeredCache`
+(e.g. to combine a (fast) in-memory cache w/ a (persistent) file-system cache).
+'''
+import abc
+import collections
+import collections.abc
+import contextlib
+import dataclasses
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None # not available on windows
+
+import oci.model as om
+
+logger = logging.getLogger(__name__)
+
+
+class Cache(abc.ABC):
+    '''
+    interface for caches of (immutable) octets, addressed by digest (`<algorithm>:<hexdigest>`)
+    '''
+    @abc.abstractmethod
+    def get(self, digest: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def put(self, digest: str, octets: bytes):
+        raise NotImplementedError
+
+
+class InMemoryCache(Cache):
+    '''
+    in-memory cache evicting least-recently-used entries, once `max_octets` is exceeded
+    '''
+    def __init__(self, max_octets: int=1024 * 1024 * 64): # 64 MiB
+        self.max_octets = max_octets
+        self._entries = collections.OrderedDict() # {digest: octets}
+        self._octets = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> bytes | None:
+        with self._lock:
+            if (octets := self._entries.get(digest)) is None:
+                return None
+
+            self._entries.move_to_end(digest)
+            return octets
+
+    def put(self, digest: str, octets: bytes):
+        if len(octets) > self.max_octets:
+            return
+
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return
+
+            self._entries[digest] = octets
+            self._octets += len(octets)
+
+            while self._octets > self.max_octets:
+                _, evicted = self._entries.popitem(last=False)
+                self._octets -= len(evicted)
+
+
+class FileSystemCache(Cache):
+    '''
+    content-addressed store on the file-system. Entries are stored as `<root>/<algorithm>/<hex>`.
+    Once `max_octets` is exceeded, least-recently-used entries (by modification time, which is
+    updated upon each read) are evicted.
+
+    entries are written atomically (written to a temporary file, which is then renamed), and
+    (for sha256-digests) verified prior to being inserted, so readers will never see partial or
+    corrupt entries. Eviction is serialised using a lock-file, so a store may be shared by
+    multiple processes (note that each process tracks the store's size based on its own writes,
+    so the size-limit may temporarily be exceeded by concurrent writers).
+    '''
+    def __init__(
+        self,
+        root_dir: str,
+        max_octets: int=1024 * 1024 * 1024, # 1 GiB
+    ):
+        self.root_dir = root_dir
+        self.max_octets = max_octets
+        self._lock = threading.Lock()
+
+        os.makedirs(root_dir, exist_ok=True)
+        self._octets = sum(size for _, size, _ in self._entries())
+
+    def path(self, digest: str) -> str:
+        algorithm, hexdigest = digest.split(':', 1)
+        if not (algorithm.isalnum() and hexdigest.isalnum()):
+            raise ValueError(f'not a valid digest: {digest=}')
+
+        return os.path.join(self.root_dir, algorithm, hexdigest)
+
+    def _entries(self):
+        '''
+        yields (path, size, mtime) for all entries
+        '''
+        for algorithm in os.listdir(self.root_dir):
+            if not os.path.isdir(algorithm_dir := os.path.join(self.root_dir, algorithm)):
+                continue
+
+            for entry in os.scandir(algorithm_dir):
+                if entry.name.startswith('.tmp-'):
+                    continue # not (yet) inserted
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue # concurrently evicted
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def open(self, digest: str) -> io.BufferedReader | None:
+        '''
+        returns opened file-object for specified entry (caller is responsible for closing it), or
+        `None` if entry is absent. Entries remain readable if evicted while being read.
+        '''
+        path = self.path(digest)
+
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path) # mark as recently used
+        except FileNotFoundError:
+            pass # concurrently evicted
+
+        return f
+
+    def get(self, digest: str) -> bytes | None:
+        if not (f := self.open(digest)):
+            return None
+
+        with f:
+            return f.read()
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def put(self, digest: str, octets: bytes):
+        for _ in self.tee(digest=digest, chunks=(octets,)):
+            pass
+
+    def tee(
+        self,
+        digest: str,
+        chunks: collections.abc.Iterable[bytes],
+    ) -> collections.abc.Generator[bytes, None, None]:
+        '''
+        yields passed chunks, while writing them into the store. The entry is only inserted if
+        all chunks were consumed, content matches `digest`, and does not exceed `max_octets`. For
+        digest-mismatches, `ValueError` is raised after the last chunk was yielded.
+        '''
+        path = self.path(digest)
+        if os.path.exists(path):
+            yield from chunks
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        algorithm, hexdigest = digest.split(':', 1)
+        if algorithm == 'sha256':
+            hash = hashlib.sha256()
+        else:
+            hash = None
+
+        octets_count = 0
+        f = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path),
+            prefix='.tmp-',
+            delete=False,
+        )
+
+        try:
+            with f:
+                for chunk in chunks:
+                    octets_count += len(chunk)
+                    if octets_count <= self.max_octets:
+                        f.write(chunk)
+                        if hash:
+                            hash.update(chunk)
+                    yield chunk
+
+            if octets_count > self.max_octets:
+                return
+
+            if hash and hash.hexdigest() != hexdigest:
+                raise ValueError(f'content does not match {digest=}: sha256:{hash.hexdigest()}')
+
+            os.replace(f.name, path)
+        finally:
+            if os.path.exists(f.name):
+                os.unlink(f.name)
+
+        with self._lock:
+            self._octets += octets_count
+
+            if self._octets > self.max_octets:
+                self._evict()
+
+    def _evict(self):
+        with self._lock_file():
+            entries = sorted(self._entries(), key=lambda entry: entry[2]) # oldest first
+            self._octets = sum(size for _, size, _ in entries)
+
+            for path, size, _ in entries:
+                if self._octets <= self.max_octets:
+                    break
+
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass # concurrently evicted
+                self._octets -= size
+
+    @contextlib.contextmanager
+    def _lock_file(self):
+        if not fcntl:
+            yield
+            return
+
+        with open(os.path.join(self.root_dir, '.lock'), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class LayeredCache(Cache):
+    '''
+    combines multiple caches (e.g. in-memory + file-system). Lookups are done in passed order;
+    upon a hit, the entry is also stored in all preceding caches. Entries are stored in all caches.
+    '''
+    def __init__(self, *caches: Cache):
+        self.caches = caches
+
+    def get(self, digest: str) -> bytes | None:
+        for idx, cache in enumerate(self.caches):
+            if (octets := cache.get(digest)) is None:
+                continue
+
+            for preceding_cache in self.caches[:idx]:
+                preceding_cache.put(digest, octets)
+
+            return octets
+
+        return None
+
+    def put(self, digest: str, octets: bytes):
+        for cache in self.caches:
+            cache.put(digest, octets)
+
+
+@dataclasses.dataclass
+class CacheStats:
+    manifest_hits: int = 0
+    manifest_misses: int = 0
+    blob_hits: int = 0
+    blob_misses: int = 0
+    tag_hits: int = 0
+    tag_misses: int = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class _TagEntry:
+    digest: str
+    expires_at: float
+
+
+class ClientCache:
+    '''
+    cache-layer for `oci.client.Client`, serving digest-addressed manifests and (small) blobs
+    from `cache`, and caching resolutions of (symbolic) tags to manifest-digests for
+    `tag_ttl_seconds`. Blobs larger than `max_blob_octets` are not cached.
+
+    note that cached content is served regardless of the repository it was retrieved from (which
+    is safe, as content is addressed by digest). To not affect checks for existence of
+    digest-addressed content, the client will not serve such content from cache if called w/
+    `absent_ok` set.
+    '''
+    def __init__(
+        self,
+        cache: Cache=None,
+        tag_ttl_seconds: float=60,
+        max_blob_octets: int=1024 * 1024, # 1 MiB
+    ):
+        if cache is None:
+            cache = InMemoryCache()
+
+        self.cache = cache
+        self.tag_ttl_seconds = tag_ttl_seconds
+        self.max_blob_octets = max_blob_octets
+        self.stats = CacheStats()
+        self._tags = {} # {(image-reference, accept): _TagEntry}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def manifest(
+        self,
+        image_reference: om.OciImageReference,
+        accept: str,
+    ) -> bytes | None:
+        if image_reference.has_digest_tag:
+            digest = image_reference.tag
+        else:
+            tag_key = (str(image_reference), accept)
+            with self._lock:
+                tag_entry = self._tags.get(tag_key)
+
+            if not tag_entry or tag_entry.expires_at < time.monotonic():
+                self._count('tag_misses')
+                return None
+
+            self._count('tag_hits')
+            digest = tag_entry.digest
+
+        if (octets := self.cache.get(digest)) is None:
+            self._count('manifest_misses')
+            return None
+
+        if not image_reference.has_digest_tag or media_type(octets) in accept:
+            self._count('manifest_hits')
+            return octets
+
+        # manifest's mediaType was not requested (e.g. manifest-list instead of single
+        # image-manifest) -> let registry decide
+        self._count('manifest_misses')
+        return None
+
+    def put_manifest(
+        self,
+        image_reference: om.OciImageReference,
+        accept: str,
+        digest: str,
+        octets: bytes,
+    ):
+        self.cache.put(digest, octets)
+
+        if image_reference.has_digest_tag:
+            return
+
+        with self._lock:
+            self._tags[(str(image_reference), accept)] = _TagEntry(
+                digest=digest,
+                expires_at=time.monotonic() + self.tag_ttl_seconds,
+            )
+
+    def invalidate_tag(self, image_reference: str | om.OciImageReference):
+        '''
+        drops cached resolutions of the given (symbolic) tag (for all accepted media-types), e.g.
+        after the tag was pushed to, or deleted
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        if image_reference.has_digest_tag:
+            return
+
+        with self._lock:
+            for tag_key in [
+                tag_key for tag_key in self._tags
+                if om.OciImageReference(tag_key[0]) == image_reference
+            ]:
+                del self._tags[tag_key]
+
+    def blob(self, digest: str) -> bytes | None:
+        if (octets := self.cache.get(digest)) is None:
+            self._count('blob_misses')
+            return None
+
+        self._count('blob_hits')
+        return octets
+
+    def put_blob(self, digest: str, octets: bytes):
+        if len(octets) > self.max_blob_octets:
+            return
+
+        self.cache.put(digest, octets)
+
+
+@dataclasses.dataclass(frozen=True)
+class TagList:
+    tags: tuple[str, ...]
+    refreshed_at: float # as per time.monotonic
+    listed_at: float # time of last complete listing, as per time.monotonic
+
+    @property
+    def last(self) -> str | None:
+        '''
+        lexically greatest tag (OCI-distribution-spec defines tags to be listed in lexical order)
+        '''
+        return max(self.tags, default=None)
+
+
+class TagListCache:
+    '''
+    cache for tag-listings of repositories, intended to be used w/ `oci.client.Client`.
+
+    listings are served from cache for `ttl_seconds`. Afterwards, they are refreshed
+    incrementally (only tags lexically following the greatest known tag are listed, using the
+    `last` query parameter defined by OCI-distribution-spec) until they are older than
+    `full_refresh_seconds`, after which tags are listed completely again.
+
+    note that incremental refreshes will neither detect removed tags, nor added tags that are
+    lexically less than the greatest known tag. Tag-listings of repositories which are pushed
+    to (or deleted from) using the client the cache is used by are dropped.
+    '''
+    def __init__(
+        self,
+        ttl_seconds: float=60,
+        full_refresh_seconds: float=60 * 60,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self._tag_lists = {} # {repository: TagList}
+        self._lock = threading.Lock()
+
+    def get(self, repository: str) -> TagList | None:
+        '''
+        returns cached tag-list (which may be stale), or `None` if there is no tag-list eligible
+        for incremental refresh
+        '''
+        with self._lock:
+            tag_list = self._tag_lists.get(repository)
+
+        if not tag_list or self.needs_full_refresh(tag_list):
+            return None
+
+        return tag_list
+
+    def is_fresh(self, tag_list: TagList) -> bool:
+        return time.monotonic() - tag_list.refreshed_at <= self.ttl_seconds
+
+    def needs_full_refresh(self, tag_list: TagList) -> bool:
+        return time.monotonic() - tag_list.listed_at > self.full_refresh_seconds
+
+    def put(
+        self,
+        repository: str,
+        tags: collections.abc.Iterable[str],
+        listed_at: float=None,
+    ) -> TagList:
+        '''
+        stores tag-list for given repository. `listed_at` should be passed for incremental
+        refreshes (as time of previous complete listing); it defaults to now.
+        '''
+        now = time.monotonic()
+        if listed_at is None:
+            listed_at = now
+
+        tag_list = TagList(
+            tags=tuple(tags),
+            refreshed_at=now,
+            listed_at=listed_at,
+        )
+
+        with self._lock:
+            self._tag_lists[repository] = tag_list
+
+        return tag_list
+
+    def invalidate(self, repository: str):
+        with self._lock:
+            self._tag_lists.pop(repository, None)
+
+
+def media_type(manifest_octets: bytes) -> str:
+    '''
+    returns mediaType of given manifest. If absent (which is permitted for OCI-manifests), it is
+    derived from the manifest's structure.
+    '''
+    manifest_dict = json.loads(manifest_octets)
+
+    if (media_type := manifest_dict.get('mediaType')):
+        return media_type
+
+    if 'manifests' in manifest_dict:
+        return om.OCI_IMAGE_INDEX_MIME
+    return om.OCI_MANIFEST_SCHEMA_V2_MIME
@@ -1,6 +1,8 @@
 import base64
 import collections
 import collections.abc
+import concurrent.futures
+import contextlib
 import dataclasses
 import datetime
 import enum
@@ -8,6 +10,7 @@ import hashlib
 import io
 import json
 import logging
+import os
 import tempfile
 import threading
 import time
@@ -18,10 +21,13 @@ import dateutil.parser
 import requests
 import requests.adapters
 import requests.auth
+import urllib3.exceptions
 import www_authenticate
 
 import oci.auth as oa
 import oci.aws
+import oci.cache
+import oci.metrics
 import oci.model as om
 import oci.util
 
@@ -53,6 +59,24 @@ class AuthMethod(enum.Enum):
     BASIC = 'basic'
 
 
+class BlobUploadMode(enum.Enum):
+    '''
+    controls how (larger) blobs passed as generator or streamed requests-response are uploaded
+
+    STREAMING: stream data as body of a single PUT-request (w/ known content-length), i.e. w/o
+               buffering. Unless registry is known to accept streamed uploads, this is probed
+               using a tiny blob first. If registry does not accept streamed uploads, CHUNKED,
+               or (if chunked uploads are not supported, either) SPOOLED mode is used instead.
+               As streamed bodies cannot be re-sent, failed uploads are not retried
+    CHUNKED:   use chunked-upload (PATCH-request per chunk); not supported by all registries
+               (e.g. GCR)
+    SPOOLED:   buffer data in a spooled temporary file prior to uploading it as single PUT-request
+    '''
+    STREAMING = 'streaming'
+    CHUNKED = 'chunked'
+    SPOOLED = 'spooled'
+
+
 @dataclasses.dataclass
 class OauthToken:
     token: str
@@ -135,6 +159,117 @@ class OauthTokenCache:
         return self.auth_methods.get(netloc)
 
 
+@dataclasses.dataclass
+class RegistryCapabilities:
+    '''
+    capabilities of an OCI registry, either discovered through probing (see
+    `Client.probe_capabilities`), or learnt from previous requests. `None` signals the respective
+    capability is (yet) unknown.
+
+    :param single_post_upload: registry accepts monolithic uploads using a single POST-request
+    :param chunked_upload: registry accepts chunked uploads (PATCH-requests)
+    :param streaming_upload: registry accepts streamed (length-known) single PUT-requests
+    :param blob_mount: registry supports cross-repository blob mounts
+    :param referrers_api: registry implements referrers-API (OCI 1.1)
+    :param max_chunk_size: maximum size (in octets) accepted per PATCH-request
+    :param range_requests: registry honours range-requests for blob-downloads
+    :param auth_method: auth-method (as also tracked by `OauthTokenCache`)
+    '''
+    single_post_upload: bool | None = None
+    chunked_upload: bool | None = None
+    streaming_upload: bool | None = None
+    blob_mount: bool | None = None
+    referrers_api: bool | None = None
+    max_chunk_size: int | None = None
+    range_requests: bool | None = None
+    auth_method: AuthMethod | None = None
+    probed_at: str | None = None
+
+
+class RegistryCapabilitiesCache:
+    '''
+    caches `RegistryCapabilities` per registry (netloc). If `path` is passed, the cache is
+    initialised from the given file (if it exists), and may be written back using `persist`, which
+    allows later runs to skip probing or trial-and-error requests.
+    '''
+    def __init__(self, path: str=None):
+        self.path = path
+        self._capabilities = {} # {netloc: RegistryCapabilities}
+        self._lock = threading.Lock()
+
+        if path and os.path.isfile(path):
+            self._load(path=path)
+
+    def _load(self, path: str):
+        try:
+            with open(path) as f:
+                raw = json.load(f)
+
+            self._capabilities = {
+                netloc: dacite.from_dict(
+                    data=capabilities,
+                    data_class=RegistryCapabilities,
+                    config=dacite.Config(cast=[AuthMethod]),
+                ) for netloc, capabilities in raw.items()
+            }
+        except (OSError, ValueError, dacite.DaciteError) as e:
+            # cache is a mere optimisation - start from scratch if it cannot be read
+            logger.warning(f'failed to read registry-capabilities from {path=}: {e}')
+
+    def capabilities(self, image_reference: str | om.OciImageReference) -> RegistryCapabilities:
+        netloc = om.OciImageReference.to_image_ref(image_reference).netloc
+
+        with self._lock:
+            if not (capabilities := self._capabilities.get(netloc)):
+                capabilities = self._capabilities[netloc] = RegistryCapabilities()
+
+            return capabilities
+
+    def update(self, image_reference: str | om.OciImageReference, **capabilities):
+        netloc = om.OciImageReference.to_image_ref(image_reference).netloc
+
+        with self._lock:
+            self._capabilities[netloc] = dataclasses.replace(
+                self._capabilities.get(netloc) or RegistryCapabilities(),
+                **capabilities,
+            )
+
+    def auth_methods(self) -> dict[str, AuthMethod]:
+        with self._lock:
+            return {
+                netloc: capabilities.auth_method
+                for netloc, capabilities in self._capabilities.items()
+                if capabilities.auth_method
+            }
+
+    def persist(self, path: str=None):
+        if not (path := path or self.path):
+            raise ValueError('path must be passed if cache was not created with a path')
+
+        with self._lock:
+            raw = {
+                netloc: dataclasses.asdict(capabilities)
+                for netloc, capabilities in self._capabilities.items()
+            }
+
+        for capabilities in raw.values():
+            if (auth_method := capabilities['auth_method']):
+                capabilities['auth_method'] = auth_method.value
+
+        if (dirname := os.path.dirname(os.path.abspath(path))):
+            os.makedirs(dirname, exist_ok=True)
+
+        # write to temporary file first, so concurrent readers never see partial contents
+        with tempfile.NamedTemporaryFile(
+            mode='w',
+            dir=dirname,
+            delete=False,
+        ) as f:
+            json.dump(raw, f, indent=2)
+
+        os.replace(f.name, path)
+
+
 def base_api_url(
     image_reference: str | om.OciImageReference,
 ) -> str:
@@ -169,13 +304,29 @@ class OciRoutes:
             'blobs',
         )
 
-    def ls_tags_url(self, image_reference: str) -> str:
-        return urljoin(
+    def ls_tags_url(
+        self,
+        image_reference: str,
+        n: int=None,
+        last: str=None,
+    ) -> str:
+        url = urljoin(
             self.artifact_base_url(image_reference),
             'tags',
             'list',
         )
 
+        query = {}
+        if n:
+            query['n'] = n
+        if last:
+            query['last'] = last
+
+        if query:
+            return _with_query(url, **query)
+
+        return url
+
     def uploads_url(self, image_reference: str) -> str:
         return urljoin(
             self._blobs_url(image_reference),
@@ -191,6 +342,31 @@ class OciRoutes:
         })
         return self.uploads_url(image_reference=image_reference) + '?' + query
 
+    def mount_blob_url(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        source_image_reference: str | om.OciImageReference,
+    ) -> str:
+        '''
+        used for cross-repository blob mounts (source and target repository must be hosted
+        by the same registry)
+        '''
+        source_image_reference = om.OciImageReference.to_image_ref(source_image_reference)
+
+        query = urllib.parse.urlencode({
+            'mount': digest,
+            'from': source_image_reference.name,
+        })
+        return self.uploads_url(image_reference=str(image_reference)) + '?' + query
+
+    def referrers_url(self, image_reference: str | om.OciImageReference, digest: str) -> str:
+        return urljoin(
+            self.artifact_base_url(image_reference=image_reference),
+            'referrers',
+            digest,
+        )
+
     def blob_url(self, image_reference: str | om.OciImageReference, digest: str):
         if isinstance(image_reference, om.OciImageReference):
             image_reference = str(image_reference)
@@ -259,6 +435,252 @@ def _next_paginated_url(
     return url
 
 
+@dataclasses.dataclass
+class _RegistryConcurrency:
+    limit: float
+    in_flight: int = 0
+    paused_until: float = 0
+    last_decrease: float = 0
+    condition: threading.Condition = dataclasses.field(default_factory=threading.Condition)
+
+
+@dataclasses.dataclass(frozen=True)
+class ConcurrencySlot:
+    netloc: str
+    started_at: float
+
+
+class ConcurrencyLimiter:
+    '''
+    limits count of concurrent requests per registry (netloc). The limit is adapted using AIMD
+    (additive-increase / multiplicative-decrease): each successful request increases the limit by
+    `1 / limit` (i.e. by roughly one per "round" of requests), whereas throttling responses (429,
+    503) reduce it by `decrease_factor`. Throttling responses for requests which were started
+    prior to the last decrease are ignored, so a burst of throttled requests reduces the limit
+    only once.
+
+    if throttled, no further requests are started against the respective registry (from any
+    thread) for the duration stated by the registry (Retry-After), or a fallback duration.
+    '''
+    def __init__(
+        self,
+        initial_limit: int=16,
+        min_limit: int=1,
+        max_limit: int=64,
+        decrease_factor: float=0.5,
+    ):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self._registries = {} # {netloc: _RegistryConcurrency}
+        self._lock = threading.Lock()
+
+    def _registry(self, netloc: str) -> _RegistryConcurrency:
+        with self._lock:
+            if not (registry := self._registries.get(netloc)):
+                registry = self._registries[netloc] = _RegistryConcurrency(
+                    limit=self.initial_limit,
+                )
+            return registry
+
+    def limit(self, netloc: str) -> int:
+        return int(self._registry(netloc).limit)
+
+    @contextlib.contextmanager
+    def slot(self, netloc: str) -> collections.abc.Generator[ConcurrencySlot, None, None]:
+        '''
+        blocks until a request may be sent to the given registry (held until exiting the ctx)
+        '''
+        registry = self._registry(netloc)
+
+        with registry.condition:
+            while True:
+                if (pause_seconds := registry.paused_until - time.monotonic()) > 0:
+                    registry.condition.wait(timeout=pause_seconds)
+                elif registry.in_flight >= int(registry.limit):
+                    registry.condition.wait()
+                else:
+                    break
+
+            registry.in_flight += 1
+
+        try:
+            yield ConcurrencySlot(
+                netloc=netloc,
+                started_at=time.monotonic(),
+            )
+        finally:
+            with registry.condition:
+                registry.in_flight -= 1
+                registry.condition.notify_all()
+
+    def succeeded(self, slot: ConcurrencySlot):
+        registry = self._registry(slot.netloc)
+
+        with registry.condition:
+            registry.limit = min(self.max_limit, registry.limit + 1 / registry.limit)
+            registry.condition.notify_all()
+
+    def throttled(self, slot: ConcurrencySlot, retry_after_seconds: float):
+        registry = self._registry(slot.netloc)
+
+        with registry.condition:
+            now = time.monotonic()
+            registry.paused_until = max(registry.paused_until, now + retry_after_seconds)
+
+            if slot.started_at < registry.last_decrease:
+                return # request was sent before last decrease took effect
+
+            registry.limit = max(self.min_limit, registry.limit * self.decrease_factor)
+            registry.last_decrease = now
+
+            logger.info(
+                f'{slot.netloc} throttled requests - reduced concurrency to {int(registry.limit)}'
+            )
+
+
+# empty JSON-object (as commonly used as config-blob for non-image artefacts); used for probing
+_EMPTY_JSON_BLOB = b'{}'
+_EMPTY_JSON_BLOB_DIGEST = f'sha256:{hashlib.sha256(_EMPTY_JSON_BLOB).hexdigest()}'
+
+
+def _upload_location(res: requests.models.Response) -> str:
+    upload_url = res.headers['Location']
+
+    # returned url _may_ be relative
+    if upload_url.startswith('/'):
+        parsed_url = urllib.parse.urlparse(res.url)
+        upload_url = f'{parsed_url.scheme}://{parsed_url.netloc}{upload_url}'
+
+    return upload_url
+
+
+def _with_query(url: str, **query) -> str:
+    if '?' in url:
+        prefix = '&'
+    else:
+        prefix = '?'
+
+    return url + prefix + urllib.parse.urlencode(query)
+
+
+class _LengthKnownIterable:
+    '''
+    wraps an iterable of bytes of known total length. requests will stream such objects as
+    request-body, setting content-length (rather than using transfer-encoding: chunked, which
+    is not supported by all registries)
+    '''
+    def __init__(
+        self,
+        iterable: collections.abc.Iterable[bytes],
+        length: int,
+    ):
+        self.iterable = iterable
+        self.length = length
+
+    def __iter__(self):
+        yield from self.iterable
+
+    def __len__(self):
+        return self.length
+
+
+def _iter_raw_content(
+    res: requests.models.Response,
+    chunk_size: int=1024 * 1024, # 1 MiB
+) -> collections.abc.Generator[bytes, None, None]:
+    # read raw (i.e. non-decoded) content, as digest refers to octets as stored in registry.
+    # `raw` is bound eagerly (and closed instead of `res`), as callers might replace `res.raw`
+    # (e.g. w/ a reader wrapping the returned generator)
+    raw = res.raw
+
+    def iter_chunks():
+        try:
+            while (chunk := raw.read(chunk_size)):
+                yield chunk
+        finally:
+            raw.close()
+            if (release_conn := getattr(raw, 'release_conn', None)):
+                release_conn()
+
+    return iter_chunks()
+
+
+def _iter_fixed_size_chunks(
+    chunks: collections.abc.Iterable[bytes],
+    chunk_size: int,
+) -> collections.abc.Generator[bytes, None, None]:
+    '''
+    re-chunks passed chunks (of arbitrary sizes) into chunks of exactly `chunk_size` octets (except
+    for the last one)
+    '''
+    buf = bytearray()
+
+    for chunk in chunks:
+        buf += chunk
+        while len(buf) >= chunk_size:
+            yield bytes(buf[:chunk_size])
+            del buf[:chunk_size]
+
+    if buf:
+        yield bytes(buf)
+
+
+def _cached_response(
+    octets: bytes,
+    content_type: str='application/octet-stream',
+) -> requests.models.Response:
+    '''
+    wraps cached content into a response-object, so it can be used interchangeably w/ responses
+    returned from registries
+    '''
+    res = requests.models.Response()
+    res.status_code = 200
+    res.headers['Content-Type'] = content_type
+    res.headers['Content-Length'] = str(len(octets))
+    res._content = octets
+    res._content_consumed = True
+    res.raw = io.BytesIO(octets)
+
+    return res
+
+
+def _stored_blob_response(f: io.BufferedReader) -> requests.models.Response:
+    res = requests.models.Response()
+    res.status_code = 200
+    res.headers['Content-Type'] = 'application/octet-stream'
+    res.headers['Content-Length'] = str(os.fstat(f.fileno()).st_size)
+    res.raw = f
+
+    return res
+
+
+class _IterableReader(io.RawIOBase):
+    '''
+    read-only file-like object reading from an iterable of bytes
+    '''
+    def __init__(self, iterable: collections.abc.Iterable[bytes]):
+        self._iterator = iter(iterable)
+        self._buf = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buf:
+            try:
+                self._buf = next(self._iterator)
+            except StopIteration:
+                return 0
+
+        octets_count = min(len(b), len(self._buf))
+        b[:octets_count] = self._buf[:octets_count]
+        self._buf = self._buf[octets_count:]
+
+        return octets_count
+
+
 def initialise_repository_if_required(func):
     '''
     Some OCI registries require separate repositories for each OCI artefact (e.g. AWS ECR), which
@@ -345,6 +767,15 @@ class Client:
         tag_postprocessing_callback: collections.abc.Callable[[str], str]=None,
         max_retries: int=5,
         default_backoff_base_seconds: float=1.0,
+        blob_upload_mode: BlobUploadMode=BlobUploadMode.STREAMING,
+        blob_upload_chunk_size: int=1024 * 1024 * 16, # 16 MiB
+        capabilities_cache: RegistryCapabilitiesCache=None,
+        cache: oci.cache.ClientCache=None,
+        blob_store: oci.cache.FileSystemCache=None,
+        concurrency_limiter: ConcurrencyLimiter=None,
+        metrics: oci.metrics.Metrics=None,
+        tag_list_cache: oci.cache.TagListCache=None,
+        tags_page_size: int=None,
     ):
         '''
         :param Callable credentials_lookup:
@@ -363,6 +794,31 @@ class Client:
             how many times to retry a failed request (connection errors, 429, 5xx)
         :param float default_backoff_base_seconds:
             initial sleep before first retry; doubles on each subsequent attempt
+        :param BlobUploadMode blob_upload_mode:
+            default mode for uploading large streamed blobs (see `put_blob`)
+        :param int blob_upload_chunk_size:
+            chunk-size for chunked uploads; also used as in-memory limit for spooled uploads
+        :param RegistryCapabilitiesCache capabilities_cache:
+            used to track discovered registry-capabilities; pass a cache created w/ a path to
+            re-use capabilities discovered in previous runs
+        :param ClientCache cache:
+            if passed, digest-addressed manifests and (small) blobs, as well as tag-resolutions
+            are served from the given cache (see `oci.cache`)
+        :param FileSystemCache blob_store:
+            if passed, retrieved blobs (of any size) are stored in, and served from the given
+            content-addressed store (which may be shared by multiple processes)
+        :param ConcurrencyLimiter concurrency_limiter:
+            limits (and adapts) count of concurrent requests per registry; may be shared by
+            multiple clients. A limiter w/ default settings is created if not passed
+        :param Metrics metrics:
+            used to record request-level metrics (see `oci.metrics`); may be shared by multiple
+            clients. Created if not passed
+        :param TagListCache tag_list_cache:
+            if passed, tag-listings are served from, and refreshed incrementally using the given
+            cache (see `oci.cache.TagListCache`)
+        :param int tags_page_size:
+            if passed, tags are listed in pages of the given size (`n` query parameter), which
+            registries might however not honour
         '''
         self.credentials_lookup = credentials_lookup
         self.token_cache = OauthTokenCache()
@@ -376,11 +832,44 @@ class Client:
         self.tag_postprocessing_callback = tag_postprocessing_callback
         self.max_retries = max_retries
         self.default_backoff_base_seconds = default_backoff_base_seconds
+        self.blob_upload_mode = blob_upload_mode
+        self.blob_upload_chunk_size = blob_upload_chunk_size
+
+        if capabilities_cache is None:
+            capabilities_cache = RegistryCapabilitiesCache()
+        self.capabilities_cache = capabilities_cache
+        self.cache = cache
+        self.blob_store = blob_store
+
+        if concurrency_limiter is None:
+            concurrency_limiter = ConcurrencyLimiter()
+        self.concurrency_limiter = concurrency_limiter
+
+        if metrics is None:
+            metrics = oci.metrics.Metrics()
+        self.metrics = metrics
+        self.tag_list_cache = tag_list_cache
+        self.tags_page_size = tags_page_size
+        self.token_cache.auth_methods.update(capabilities_cache.auth_methods())
 
         if timeout_seconds:
             timeout_seconds = int(timeout_seconds)
         self.timeout_seconds = timeout_seconds
 
+    def _set_auth_method(
+        self,
+        image_reference: str | om.OciImageReference,
+        auth_method: AuthMethod,
+    ):
+        self.token_cache.set_auth_method(
+            image_reference=image_reference,
+            auth_method=auth_method,
+        )
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            auth_method=auth_method,
+        )
+
     def _authenticate(
         self,
         image_reference: str | om.OciImageReference,
@@ -448,7 +937,7 @@ class Client:
                     image_reference=image_reference,
                     token=token,
                 )
-                self.token_cache.set_auth_method(
+                self._set_auth_method(
                     image_reference=image_reference,
                     auth_method=AuthMethod.AWS_BASIC,
                 )
@@ -471,7 +960,7 @@ class Client:
 
         # XXX HACK HACK: fallback to basic-auth if endpoints does not state what it wants
         if 'basic' in auth_challenge or not auth_challenge:
-            self.token_cache.set_auth_method(
+            self._set_auth_method(
                 image_reference=image_reference,
                 auth_method=AuthMethod.BASIC,
             )
@@ -479,18 +968,20 @@ class Client:
         elif 'bearer' in auth_challenge:
             bearer = auth_challenge['bearer']
             service = bearer.get('service')
-            self.token_cache.set_auth_method(
+            self._set_auth_method(
                 image_reference=image_reference,
                 auth_method=AuthMethod.BEARER,
             )
         else:
             logger.warning(f'did not understand {auth_challenge=} - pbly a bug')
 
-        bearer_dict = {'scope': scope}
+        # scope may contain multiple (space-separated) scopes (e.g. for cross-repository mounts),
+        # which must be passed as separate query-parameters
+        bearer_dict = {'scope': scope.split(' ')}
         if service:
             bearer_dict['service'] = service
 
-        realm = bearer['realm'] + '?' + urllib.parse.urlencode(bearer_dict)
+        realm = bearer['realm'] + '?' + urllib.parse.urlencode(bearer_dict, doseq=True)
 
         if oci_creds:
             auth = requests.auth.HTTPBasicAuth(
@@ -500,12 +991,20 @@ class Client:
         else:
             auth = None
 
+        started_at = time.monotonic()
         res = self.session.get(
             url=realm,
             verify=not self.disable_tls_validation,
             auth=auth,
             timeout=(31, 121),
         )
+        registry = om.OciImageReference.to_image_ref(image_reference).netloc
+        self.metrics.inc('oci_token_fetches', registry=registry, status=res.status_code)
+        self.metrics.observe(
+            'oci_token_fetch_duration_seconds',
+            time.monotonic() - started_at,
+            registry=registry,
+        )
 
         if not res.ok:
             logger.warning(
@@ -603,7 +1102,8 @@ class Client:
         auth = None
 
         if auth_method is AuthMethod.BASIC:
-            actions = scope.split(':')[-1]
+            # if multiple scopes are passed, the first one refers to `image_reference`
+            actions = scope.split(' ')[0].split(':')[-1]
             if 'push' in actions:
                 privileges = oa.Privileges.READWRITE
             else:
@@ -652,19 +1152,38 @@ class Client:
         except KeyError:
             timeout = (31, 121)
 
+        registry = image_reference.netloc
+        operation = oci.metrics.operation(url=url)
+
         try:
-            res = self.session.request(
+            waiting_since = time.monotonic()
+            with self.concurrency_limiter.slot(netloc=registry) as slot:
+                self.metrics.observe(
+                    'oci_concurrency_wait_seconds',
+                    (started_at := time.monotonic()) - waiting_since,
+                    registry=registry,
+                )
+                res = self.session.request(
+                    method=method,
+                    url=url,
+                    auth=auth,
+                    headers=headers,
+                    timeout=timeout,
+                    **kwargs,
+                )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.metrics.inc(
+                'oci_requests',
+                registry=registry,
+                operation=operation,
                 method=method,
-                url=url,
-                auth=auth,
-                headers=headers,
-                timeout=timeout,
-                **kwargs,
+                status=type(e).__name__,
             )
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
             if remaining_retries == 0:
                 raise
 
+            self.metrics.inc('oci_retries', registry=registry, reason='connection-error')
+
             logger.warning(f'caught ConnectionError, going to retry... ({remaining_retries=}); {e}')
             if sleep_before_retry_seconds > 0:
                 time.sleep(sleep_before_retry_seconds)
@@ -687,15 +1206,36 @@ class Client:
                 f'rq against {url=} failed {res.status_code=} {res.reason=} {method=} {res.content}'
             )
 
+        self._record_request_metrics(
+            res=res,
+            registry=registry,
+            operation=operation,
+            method=method,
+            duration_seconds=time.monotonic() - started_at,
+            headers=headers,
+            data=kwargs.get('data'),
+        )
+
+        if (throttled := res.status_code in (429, 503)):
+            # concurrency-limiter will pause all requests against registry for given duration
+            self.concurrency_limiter.throttled(
+                slot=slot,
+                retry_after_seconds=_retry_after_seconds(
+                    res=res,
+                    fallback=sleep_before_retry_seconds,
+                ),
+            )
+        elif res.status_code < 500:
+            self.concurrency_limiter.succeeded(slot=slot)
+
         if res.status_code == 429 and remaining_retries > 0:
+            self.metrics.inc('oci_retries', registry=registry, reason=res.status_code)
             retry_after_seconds = _retry_after_seconds(res=res, fallback=sleep_before_retry_seconds)
 
             logger.warning(
                 f'quota was exceeded, will {retry_after_seconds=} ({remaining_retries=})'
             )
 
-            time.sleep(retry_after_seconds)
-
             return self._request(
                 url=url,
                 image_reference=image_reference,
@@ -709,6 +1249,7 @@ class Client:
             )
 
         if res.status_code >= 500 and remaining_retries > 0:
+            self.metrics.inc('oci_retries', registry=registry, reason=res.status_code)
             retry_after_seconds = _retry_after_seconds(res=res, fallback=sleep_before_retry_seconds)
 
             logger.warning(
@@ -716,7 +1257,8 @@ class Client:
                 f'({remaining_retries=})'
             )
 
-            time.sleep(retry_after_seconds)
+            if not throttled:
+                time.sleep(retry_after_seconds)
 
             return self._request(
                 url=url,
@@ -738,6 +1280,50 @@ class Client:
 
         return res
 
+    def _record_request_metrics(
+        self,
+        res: requests.models.Response,
+        registry: str,
+        operation: str,
+        method: str,
+        duration_seconds: float,
+        headers: dict,
+        data,
+    ):
+        self.metrics.inc(
+            'oci_requests',
+            registry=registry,
+            operation=operation,
+            method=method,
+            status=res.status_code,
+        )
+        self.metrics.observe(
+            'oci_request_duration_seconds',
+            duration_seconds,
+            registry=registry,
+            operation=operation,
+        )
+
+        if res.status_code in (429, 503):
+            self.metrics.inc('oci_throttled', registry=registry, status=res.status_code)
+
+        if (octets_sent := oci.metrics.request_octets(headers=headers, data=data)):
+            self.metrics.inc('oci_bytes_sent', octets_sent, registry=registry, operation=operation)
+
+        if method != 'HEAD' and (octets_received := res.headers.get('Content-Length')):
+            self.metrics.inc(
+                'oci_bytes_received',
+                int(octets_received),
+                registry=registry,
+                operation=operation,
+            )
+
+    def _record_cache_lookup(self, cache: str, hit: bool):
+        if hit:
+            self.metrics.inc('oci_cache_hits', cache=cache)
+        else:
+            self.metrics.inc('oci_cache_misses', cache=cache)
+
     def manifest_raw(
         self,
         image_reference: str | om.OciImageReference,
@@ -752,6 +1338,21 @@ class Client:
         if not accept:
             accept = f'{om.OCI_MANIFEST_SCHEMA_V2_MIME}, {om.DOCKER_MANIFEST_SCHEMA_V2_MIME}'
 
+        use_cache = self.cache and not (absent_ok and image_reference.has_digest_tag)
+
+        if use_cache:
+            octets = self.cache.manifest(
+                image_reference=image_reference,
+                accept=accept,
+            )
+            self._record_cache_lookup(cache='manifest', hit=bool(octets))
+
+        if use_cache and octets:
+            return _cached_response(
+                octets=octets,
+                content_type=oci.cache.media_type(octets),
+            )
+
         try:
             res = self._request(
                 url=self.routes.manifest_url(
@@ -772,6 +1373,14 @@ class Client:
                 raise om.OciImageNotFoundException(he) from he
             raise he
 
+        if self.cache:
+            self.cache.put_manifest(
+                image_reference=image_reference,
+                accept=accept,
+                digest=f'sha256:{hashlib.sha256(res.content).hexdigest()}',
+                octets=res.content,
+            )
+
         return res
 
     def manifest(
@@ -815,7 +1424,7 @@ class Client:
         if not res and absent_ok:
             return None
 
-        manifest_dict = res.json()
+        manifest_dict = json.loads(res.content)
 
         # workaround: not all manifests contain `mediaType`
         # -> fallback to content-type header
@@ -827,11 +1436,7 @@ class Client:
             om.DOCKER_MANIFEST_LIST_MIME,
             om.OCI_IMAGE_INDEX_MIME,
         ):
-            manifest = dacite.from_dict(
-                data_class=om.OciImageManifestList,
-                data=manifest_dict,
-            )
-            return manifest
+            return om.OciImageManifestList.from_dict(manifest_dict, raw_manifest=res.content)
 
         if (schema_version := int(manifest_dict['schemaVersion'])) == 1:
             manifest = dacite.from_dict(
@@ -869,10 +1474,7 @@ class Client:
 
             return manifest
         elif schema_version == 2:
-            return dacite.from_dict(
-                data_class=om.OciImageManifest,
-                data=manifest_dict,
-            )
+            return om.OciImageManifest.from_dict(manifest_dict, raw_manifest=res.content)
         else:
             raise NotImplementedError(schema_version)
 
@@ -931,6 +1533,35 @@ class Client:
             size=size,
         )
 
+    def head_manifests(
+        self,
+        image_references: collections.abc.Iterable[str | om.OciImageReference],
+        accept: str=None,
+        max_workers: int=8,
+    ) -> dict[str | om.OciImageReference, om.OciBlobRef | None]:
+        '''
+        bulk-variant of `head_manifest`: issues HTTP-HEAD requests for all given image-references
+        concurrently (using up to `max_workers` threads) and returns a mapping of passed
+        image-references to the retrieved metadata, or `None` for absent manifests.
+
+        requests are sent through this client's session, so connections are re-used. Hence,
+        `max_workers` should not exceed the session's connection-pool-size (default: 10).
+        '''
+        image_references = tuple(dict.fromkeys(image_references)) # rm duplicates, retain order
+
+        def head_manifest(image_reference):
+            return self.head_manifest(
+                image_reference=image_reference,
+                absent_ok=True,
+                accept=accept,
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(
+                image_references,
+                executor.map(head_manifest, image_references),
+            ))
+
     def to_digest_hash(
         self,
         image_reference: str | om.OciImageReference,
@@ -985,10 +1616,22 @@ class Client:
 
         return tags, next_url
 
-    def iter_tags(self, image_reference: str) -> collections.abc.Iterable[str]:
+    def _list_tags(
+        self,
+        image_reference: str,
+        last: str=None,
+    ) -> collections.abc.Generator[str, None, None]:
+        '''
+        yields tags (as returned by registry), following pagination. If `last` is passed, only
+        tags following the given one are requested (which registries might not honour).
+        '''
         scope = _scope(image_reference=image_reference, action='pull')
 
-        url = self.routes.ls_tags_url(image_reference=image_reference)
+        url = self.routes.ls_tags_url(
+            image_reference=image_reference,
+            n=self.tags_page_size,
+            last=last,
+        )
 
         while url:
             tags, url = self._tags_single_request(
@@ -997,11 +1640,58 @@ class Client:
                 scope=scope,
             )
 
-            for tag in tags:
-                if self.tag_postprocessing_callback:
-                    tag = self.tag_postprocessing_callback(tag)
+            yield from tags
+
+    def _cached_tags(self, image_reference: str) -> tuple[str, ...]:
+        repository = om.OciImageReference.to_image_ref(image_reference).ref_without_tag
+        tag_list = self.tag_list_cache.get(repository=repository)
+
+        if tag_list and self.tag_list_cache.is_fresh(tag_list):
+            self._record_cache_lookup(cache='tag-list', hit=True)
+            return tag_list.tags
+
+        self._record_cache_lookup(cache='tag-list', hit=False)
+
+        if not tag_list or not (last := tag_list.last):
+            return self.tag_list_cache.put(
+                repository=repository,
+                tags=self._list_tags(image_reference=image_reference),
+            ).tags
+
+        tags = list(self._list_tags(
+            image_reference=image_reference,
+            last=last,
+        ))
+
+        if not all(tag > last for tag in tags):
+            # registry did not honour `last` -> we received complete listing
+            logger.debug(f'{repository=} does not honour last-parameter; listed all tags')
+            return self.tag_list_cache.put(
+                repository=repository,
+                tags=dict.fromkeys(tags), # rm duplicates, retain order
+            ).tags
+
+        return self.tag_list_cache.put(
+            repository=repository,
+            tags=(*tag_list.tags, *tags),
+            listed_at=tag_list.listed_at,
+        ).tags
+
+    def iter_tags(self, image_reference: str) -> collections.abc.Iterable[str]:
+        '''
+        yields all tags of the repository referenced by `image_reference`. If this client was
+        created w/ a `tag_list_cache`, tags are served from (and refreshed using) it.
+        '''
+        if self.tag_list_cache:
+            tags = self._cached_tags(image_reference=image_reference)
+        else:
+            tags = self._list_tags(image_reference=image_reference)
 
-                yield tag
+        for tag in tags:
+            if self.tag_postprocessing_callback:
+                tag = self.tag_postprocessing_callback(tag)
+
+            yield tag
 
     def tags(self, image_reference: str) -> list[str]:
         return list(self.iter_tags(image_reference=image_reference))
@@ -1023,6 +1713,19 @@ class Client:
         )
         return False
 
+    def _invalidate_cached_tags(
+        self,
+        image_reference: om.OciImageReference,
+    ):
+        '''
+        invalidates cached tag-listings and tag-resolutions affected by (re-)tagging or deleting
+        given image-reference
+        '''
+        if self.tag_list_cache:
+            self.tag_list_cache.invalidate(repository=image_reference.ref_without_tag)
+        if self.cache:
+            self.cache.invalidate_tag(image_reference=image_reference)
+
     @initialise_repository_if_required
     def put_manifest(
         self,
@@ -1032,6 +1735,8 @@ class Client:
         image_reference = om.OciImageReference.to_image_ref(image_reference)
         scope = _scope(image_reference=image_reference, action='push,pull')
 
+        self._invalidate_cached_tags(image_reference=image_reference)
+
         parsed = json.loads(manifest)
         content_type = parsed.get('mediaType', om.OCI_MANIFEST_SCHEMA_V2_MIME)
 
@@ -1051,6 +1756,8 @@ class Client:
             },
             data=manifest,
         )
+        # invalidate again, as concurrent lookups might have re-cached outdated entries meanwhile
+        self._invalidate_cached_tags(image_reference=image_reference)
 
         if not res.ok:
             logger.warning(f'our manifest was rejected (see below for more details): {manifest=}')
@@ -1084,6 +1791,8 @@ class Client:
         image_reference = om.OciImageReference(image_reference)
         scope = _scope(image_reference=image_reference, action='push,pull')
 
+        self._invalidate_cached_tags(image_reference=image_reference)
+
         if not purge or image_reference.has_digest_tag:
             if accept:
                 headers = {'Accept': accept}
@@ -1101,6 +1810,8 @@ class Client:
                 method='DELETE',
                 raise_for_status=False,
             )
+            # invalidate again, as concurrent lookups might have re-cached outdated entries
+            self._invalidate_cached_tags(image_reference=image_reference)
 
             if absent_ok and res.status_code == 404:
                 return res
@@ -1156,6 +1867,18 @@ class Client:
     ) -> requests.models.Response:
         image_reference = om.OciImageReference(image_reference)
 
+        if self.cache and not absent_ok:
+            octets = self.cache.blob(digest=digest)
+            self._record_cache_lookup(cache='blob', hit=bool(octets))
+            if octets:
+                return _cached_response(octets=octets)
+
+        if self.blob_store and not absent_ok:
+            f = self.blob_store.open(digest=digest)
+            self._record_cache_lookup(cache='blob-store', hit=bool(f))
+            if f:
+                return _stored_blob_response(f=f)
+
         scope = _scope(image_reference=image_reference, action='pull')
 
         res = self._request(
@@ -1172,49 +1895,590 @@ class Client:
             return None
         res.raise_for_status()
 
+        if self.blob_store and not stream:
+            self.blob_store.put(digest=digest, octets=res.content)
+        elif self.blob_store:
+            # store blob while it is read by caller (only if completely read)
+            res.raw = io.BufferedReader(_IterableReader(self.blob_store.tee(
+                digest=digest,
+                chunks=_iter_raw_content(res=res),
+            )))
+
+        if (
+            self.cache
+            and (octets_count := res.headers.get('Content-Length'))
+            and int(octets_count) <= self.cache.max_blob_octets
+        ):
+            self.cache.put_blob(digest=digest, octets=res.content)
+            # allow callers to still read raw content
+            res.raw = io.BytesIO(res.content)
+
         return res
 
-    def head_blob(
+    def iter_blob(
         self,
         image_reference: str | om.OciImageReference,
         digest: str,
-        absent_ok=True,
-    ):
-        image_reference = om.OciImageReference(image_reference)
-        scope = _scope(image_reference=image_reference, action='pull')
+        chunk_size: int=1024 * 1024, # 1 MiB
+        start: int=0,
+        end: int=None,
+        remaining_resumes: int=None,
+    ) -> collections.abc.Generator[bytes, None, None]:
+        '''
+        yields (raw) content of specified blob in chunks of up to `chunk_size` octets. If `start`
+        or `end` are passed, only the given (inclusive) range of octets is retrieved (which requires
+        registry to honour range-requests; otherwise, a `ValueError` is raised).
 
-        res = self._request(
-            url=self.routes.blob_url(
+        if the connection drops while receiving the blob, retrieval is resumed from the last
+        received octet using a range-request (up to `remaining_resumes` times; defaults to
+        `max_retries`), rather than starting over. In case registry does not honour range-requests,
+        octets which were already received are skipped.
+
+        if client has a `blob_store`, blobs are served from (and stored into) it.
+        '''
+        if not self.blob_store:
+            yield from self._iter_registry_blob(
                 image_reference=image_reference,
                 digest=digest,
-            ),
-            method='HEAD',
-            scope=scope,
+                chunk_size=chunk_size,
+                start=start,
+                end=end,
+                remaining_resumes=remaining_resumes,
+            )
+            return
+
+        f = self.blob_store.open(digest=digest)
+        self._record_cache_lookup(cache='blob-store', hit=bool(f))
+
+        if f:
+            with f:
+                f.seek(start)
+                octets_left = None if end is None else end - start + 1
+
+                while octets_left is None or octets_left > 0:
+                    if octets_left is None:
+                        chunk = f.read(chunk_size)
+                    else:
+                        chunk = f.read(min(chunk_size, octets_left))
+                        octets_left -= len(chunk)
+                    if not chunk:
+                        break
+                    yield chunk
+            return
+
+        chunks = self._iter_registry_blob(
             image_reference=image_reference,
-            raise_for_status=False,
-            warn_if_not_ok=not absent_ok,
+            digest=digest,
+            chunk_size=chunk_size,
+            start=start,
+            end=end,
+            remaining_resumes=remaining_resumes,
         )
 
-        if absent_ok and res.status_code == 404:
-            return res
-
-        res.raise_for_status()
+        if start == 0 and end is None:
+            chunks = self.blob_store.tee(digest=digest, chunks=chunks)
 
-        return res
+        yield from chunks
 
-    def put_blob(
+    def _iter_registry_blob(
         self,
         image_reference: str | om.OciImageReference,
         digest: str,
-        octets_count: int,
-        data: requests.models.Response | collections.abc.Generator | bytes | io.IOBase,
+        chunk_size: int,
+        start: int,
+        end: int | None,
+        remaining_resumes: int | None,
+    ) -> collections.abc.Generator[bytes, None, None]:
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        scope = _scope(image_reference=image_reference, action='pull')
+
+        if remaining_resumes is None:
+            remaining_resumes = self.max_retries
+
+        offset = start
+
+        while True:
+            if offset > 0 or end is not None:
+                headers = {'Range': f'bytes={offset}-{"" if end is None else end}'}
+            else:
+                headers = None
+
+            res = self._request(
+                url=self.routes.blob_url(image_reference=image_reference, digest=digest),
+                image_reference=image_reference,
+                scope=scope,
+                method='GET',
+                headers=headers,
+                stream=True,
+                timeout=None,
+            )
+
+            if headers and res.status_code != 206:
+                if start > 0 or end is not None:
+                    res.close()
+                    raise ValueError(
+                        f'registry ignored range-request for {digest=} ({headers=}) '
+                        f'{res.status_code=}'
+                    )
+                octets_to_skip = offset # registry ignored range-request, and sent full blob
+            else:
+                octets_to_skip = 0
+
+            if (
+                headers
+                and (content_range := res.headers.get('Content-Range'))
+                and not content_range.startswith(f'bytes {offset}-')
+            ):
+                res.close()
+                raise ValueError(f'unexpected {content_range=} for {digest=} ({headers=})')
+
+            try:
+                with res:
+                    for chunk in res.raw.stream(chunk_size, decode_content=False):
+                        if octets_to_skip:
+                            if len(chunk) <= octets_to_skip:
+                                octets_to_skip -= len(chunk)
+                                continue
+                            chunk = chunk[octets_to_skip:]
+                            octets_to_skip = 0
+
+                        if end is not None:
+                            chunk = chunk[:end - offset + 1]
+
+                        offset += len(chunk)
+                        yield chunk
+
+                        if end is not None and offset > end:
+                            return
+                return
+            except (
+                requests.exceptions.ConnectionError,
+                urllib3.exceptions.ProtocolError,
+                urllib3.exceptions.ReadTimeoutError,
+            ) as e:
+                if remaining_resumes == 0:
+                    raise
+                remaining_resumes -= 1
+
+                logger.warning(
+                    f'connection dropped while retrieving {digest=} from {image_reference=} - '
+                    f'resuming at {offset=} ({remaining_resumes=}); {e}'
+                )
+
+    def _supports_range_requests(
+        self,
+        image_reference: om.OciImageReference,
+        digest: str,
+    ) -> bool:
+        capabilities = self.capabilities_cache.capabilities(image_reference=image_reference)
+        if capabilities.range_requests is not None:
+            return capabilities.range_requests
+
+        res = self._request(
+            url=self.routes.blob_url(image_reference=image_reference, digest=digest),
+            image_reference=image_reference,
+            scope=_scope(image_reference=image_reference, action='pull'),
+            method='GET',
+            headers={'Range': 'bytes=0-0'},
+            stream=True,
+        )
+        res.close()
+
+        range_requests = res.status_code == 206
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            range_requests=range_requests,
+        )
+
+        return range_requests
+
+    def download_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        path: str,
+        octets_count: int=None,
+        max_parallel_ranges: int=1,
+        range_size: int=1024 * 1024 * 64, # 64 MiB
+    ):
+        '''
+        downloads specified blob to `path`. Interrupted transfers are resumed (see `iter_blob`).
+
+        if `max_parallel_ranges` is greater than one, blobs larger than `range_size` are retrieved
+        as multiple byte-ranges concurrently, which are written into a preallocated file (if
+        registry honours range-requests; otherwise, the blob is retrieved sequentially). The
+        assembled blob is verified against `digest`. `octets_count` is determined using a
+        HEAD-request, if not passed.
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+
+        if max_parallel_ranges > 1 and octets_count is None:
+            res = self.head_blob(
+                image_reference=image_reference,
+                digest=digest,
+                absent_ok=False,
+            )
+            octets_count = int(res.headers['Content-Length'])
+
+        parallel = (
+            max_parallel_ranges > 1
+            and octets_count > range_size
+            and self._supports_range_requests(
+                image_reference=image_reference,
+                digest=digest,
+            )
+        )
+
+        with open(path, 'wb') as f:
+            if not parallel:
+                for chunk in self.iter_blob(
+                    image_reference=image_reference,
+                    digest=digest,
+                ):
+                    f.write(chunk)
+                return
+
+            f.truncate(octets_count)
+
+        def download_range(start: int):
+            with open(path, 'r+b') as f:
+                f.seek(start)
+                for chunk in self.iter_blob(
+                    image_reference=image_reference,
+                    digest=digest,
+                    start=start,
+                    end=min(start + range_size, octets_count) - 1,
+                ):
+                    f.write(chunk)
+
+        logger.debug(f'retrieving {digest=} using {max_parallel_ranges=} {octets_count=}')
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel_ranges) as executor:
+            for _ in executor.map(download_range, range(0, octets_count, range_size)):
+                pass # consume results to propagate exceptions
+
+        # ranges were retrieved independently - ensure they were assembled to expected blob
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                sha256.update(chunk)
+
+        if (sha256_digest := f'sha256:{sha256.hexdigest()}') != digest:
+            raise ValueError(f'downloaded data does not match {digest=}: {sha256_digest=}')
+
+    def head_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        absent_ok=True,
+    ):
+        image_reference = om.OciImageReference(image_reference)
+        scope = _scope(image_reference=image_reference, action='pull')
+
+        res = self._request(
+            url=self.routes.blob_url(
+                image_reference=image_reference,
+                digest=digest,
+            ),
+            method='HEAD',
+            scope=scope,
+            image_reference=image_reference,
+            raise_for_status=False,
+            warn_if_not_ok=not absent_ok,
+        )
+
+        if absent_ok and res.status_code == 404:
+            return res
+
+        res.raise_for_status()
+
+        return res
+
+    def head_blobs(
+        self,
+        image_reference: str | om.OciImageReference,
+        digests: collections.abc.Iterable[str],
+        max_workers: int=8,
+    ) -> dict[str, bool]:
+        '''
+        bulk-variant of `head_blob`: checks for existence of all given blobs in the repository
+        referenced by `image_reference` concurrently (using up to `max_workers` threads), and
+        returns a mapping of digests to whether the respective blob exists.
+
+        requests are sent through this client's session, so connections are re-used. Hence,
+        `max_workers` should not exceed the session's connection-pool-size (default: 10).
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        digests = tuple(dict.fromkeys(digests)) # rm duplicates, retain order
+
+        def head_blob(digest: str) -> bool:
+            return self.head_blob(
+                image_reference=image_reference,
+                digest=digest,
+                absent_ok=True,
+            ).ok
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(
+                digests,
+                executor.map(head_blob, digests),
+            ))
+
+    def mount_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        source_image_reference: str | om.OciImageReference,
+    ) -> bool:
+        '''
+        tries to mount the specified blob from `source_image_reference`'s repository into
+        `image_reference`'s repository (cross-repository blob mount) as specified in
+        oci-distribution-spec:
+        https://github.com/opencontainers/distribution-spec/blob/main/spec.md#mounting-a-blob-from-another-repository
+
+        mounting is only attempted if both image-references share the same registry (netloc).
+        returns `True` if the blob was mounted, or `False` if mounting was not attempted or was
+        refused by the registry (e.g. because it does not support mounting, or because of missing
+        privileges for source repository). In the latter case, callers should fall back to
+        copying the blob (see `put_blob`).
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        source_image_reference = om.OciImageReference.to_image_ref(source_image_reference)
+
+        if image_reference.netloc != source_image_reference.netloc:
+            return False
+        if image_reference.name == source_image_reference.name:
+            return False
+
+        capabilities = self.capabilities_cache.capabilities(image_reference=image_reference)
+        if capabilities.blob_mount is False:
+            return False
+
+        # a single refusal does not imply registry does not support mounting at all (blob might
+        # be absent from source repository, or pull-privileges might be missing); hence only
+        # `probe_capabilities` records lack of support
+        return self._mount_blob(
+            image_reference=image_reference,
+            digest=digest,
+            source_image_reference=source_image_reference,
+        ) == 201
+
+    def _mount_blob(
+        self,
+        image_reference: om.OciImageReference,
+        digest: str,
+        source_image_reference: om.OciImageReference,
+    ) -> int | None:
+        '''
+        requests a cross-repository blob mount (see `mount_blob`); returns the response's
+        status-code, or `None` if the request could not be sent
+        '''
+        scope = ' '.join((
+            _scope(image_reference=image_reference, action='push,pull'),
+            _scope(image_reference=source_image_reference, action='pull'),
+        ))
+
+        try:
+            res = self._request(
+                url=self.routes.mount_blob_url(
+                    image_reference=image_reference,
+                    digest=digest,
+                    source_image_reference=source_image_reference,
+                ),
+                image_reference=image_reference,
+                scope=scope,
+                method='POST',
+                headers={
+                    'content-length': '0',
+                },
+                raise_for_status=False,
+                warn_if_not_ok=False,
+            )
+        except requests.exceptions.HTTPError as he:
+            # e.g. raised from authentication if token-server refuses requested scopes
+            logger.debug(f'failed to mount {digest=} from {source_image_reference=}: {he}')
+            return None
+
+        # spec: registry MUST return 201 if blob was mounted. 202 signals mounting was refused
+        # (registry starts a regular upload-session instead, which is cancelled)
+        if res.status_code == 201:
+            logger.info(f'mounted {digest=} from {source_image_reference=} to {image_reference=}')
+            self.capabilities_cache.update(
+                image_reference=image_reference,
+                blob_mount=True,
+            )
+            return res.status_code
+
+        logger.debug(
+            f'registry refused to mount {digest=} from {source_image_reference=}: '
+            f'{res.status_code=}'
+        )
+        if res.status_code == 202:
+            self._cancel_upload(
+                image_reference=image_reference,
+                scope=_scope(image_reference=image_reference, action='push,pull'),
+                res=res,
+            )
+
+        return res.status_code
+
+    def _cancel_upload(
+        self,
+        image_reference: om.OciImageReference,
+        scope: str,
+        res: requests.models.Response,
+    ):
+        '''
+        cancels the upload-session started by the given (202) response, as specified in
+        oci-distribution-spec (DELETE-request against upload-location); failures are only logged,
+        as registries will eventually expire stale upload-sessions
+        '''
+        try:
+            self._request(
+                url=_upload_location(res=res),
+                image_reference=image_reference,
+                scope=scope,
+                method='DELETE',
+                raise_for_status=False,
+                warn_if_not_ok=False,
+                remaining_retries=0,
+            )
+        except (KeyError, requests.exceptions.RequestException) as e:
+            logger.debug(f'failed to cancel upload-session for {image_reference=}: {e}')
+
+    def probe_capabilities(
+        self,
+        image_reference: str | om.OciImageReference,
+        probe_uploads: bool=False,
+    ) -> RegistryCapabilities:
+        '''
+        probes capabilities of the registry hosting `image_reference`, and records them in
+        `capabilities_cache` (capabilities already known are not probed again).
+
+        upload-capabilities (single-POST, chunked and streamed uploads, cross-repository blob
+        mounts) are only probed if `probe_uploads` is set, as this requires write-privileges for
+        `image_reference`'s repository, to which a (tiny) blob containing an empty JSON-object will
+        be uploaded. For probing blob mounts, this blob is mounted into a sibling repository
+        (`<repository>/blob-mount-probe`).
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        capabilities = self.capabilities_cache.capabilities(image_reference=image_reference)
+        probed = {}
+
+        if capabilities.referrers_api is None:
+            res = self._request(
+                url=self.routes.referrers_url(
+                    image_reference=image_reference,
+                    digest=_EMPTY_JSON_BLOB_DIGEST,
+                ),
+                image_reference=image_reference,
+                scope=_scope(image_reference=image_reference, action='pull'),
+                raise_for_status=False,
+                warn_if_not_ok=False,
+            )
+            # spec: registries implementing referrers-API MUST return 200 (w/ empty index) for
+            # unknown digests
+            if res.status_code == 200:
+                probed['referrers_api'] = True
+            elif res.status_code == 404:
+                probed['referrers_api'] = False
+
+        if probe_uploads:
+            scope = _scope(image_reference=image_reference, action='push,pull')
+
+        if probe_uploads and capabilities.single_post_upload is None:
+            res = self._request(
+                url=self.routes.single_post_blob_url(
+                    image_reference=image_reference,
+                    digest=_EMPTY_JSON_BLOB_DIGEST,
+                ),
+                image_reference=image_reference,
+                scope=scope,
+                method='POST',
+                headers={
+                    'content-type': 'application/octet-stream',
+                    'content-length': str(len(_EMPTY_JSON_BLOB)),
+                },
+                data=_EMPTY_JSON_BLOB,
+                raise_for_status=False,
+            )
+            # 202 signals registry ignored data, and started a regular upload-session instead
+            if res.status_code == 201:
+                probed['single_post_upload'] = True
+            elif res.status_code == 202:
+                probed['single_post_upload'] = False
+                self._cancel_upload(image_reference=image_reference, scope=scope, res=res)
+
+        if probe_uploads and capabilities.chunked_upload is None:
+            try:
+                self._put_blob_chunked(
+                    image_reference=image_reference,
+                    octets_count=len(_EMPTY_JSON_BLOB),
+                    data_iterator=iter((_EMPTY_JSON_BLOB,)),
+                    digest=_EMPTY_JSON_BLOB_DIGEST,
+                )
+                probed['chunked_upload'] = True
+            except requests.exceptions.HTTPError as he:
+                if he.response is None or he.response.status_code in (401, 403, 404):
+                    raise # not caused by lack of support for chunked uploads
+                logger.info(f'{image_reference.netloc} does not support chunked uploads: {he}')
+                probed['chunked_upload'] = False
+
+        if probe_uploads and capabilities.streaming_upload is None:
+            self._probe_streaming_upload(image_reference=image_reference)
+
+        if probe_uploads and capabilities.blob_mount is None:
+            # ensure blob to mount exists in source repository
+            self.put_blob(
+                image_reference=image_reference,
+                digest=_EMPTY_JSON_BLOB_DIGEST,
+                octets_count=len(_EMPTY_JSON_BLOB),
+                data=_EMPTY_JSON_BLOB,
+            )
+            status_code = self._mount_blob(
+                image_reference=om.OciImageReference(
+                    f'{image_reference.ref_without_tag}/blob-mount-probe',
+                ),
+                digest=_EMPTY_JSON_BLOB_DIGEST,
+                source_image_reference=image_reference,
+            )
+            if status_code == 201:
+                probed['blob_mount'] = True
+            elif status_code == 202:
+                probed['blob_mount'] = False
+
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            probed_at=datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            **probed,
+        )
+
+        return self.capabilities_cache.capabilities(image_reference=image_reference)
+
+    def put_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        octets_count: int,
+        data: requests.models.Response | collections.abc.Generator | bytes | io.IOBase,
         max_chunk=1024 * 1024 * 1, # 1 MiB
         mimetype: str='application/octet-stream',
+        mount_from: str | om.OciImageReference=None,
+        upload_mode: BlobUploadMode=None,
     ):
         '''
         uploads blob as part of an image-upload as specified in oci-distribution-spec:
         https://github.com/opencontainers/distribution-spec/blob/main/spec.md#push
 
+        blobs smaller than `max_chunk`, as well as blobs passed as bytes or file-like objects are
+        uploaded using a single PUT-request. Larger blobs passed as generator or (streamed)
+        requests-response are uploaded according to `upload_mode` (defaults to the client's
+        `blob_upload_mode`; see `BlobUploadMode`).
+
+        if `mount_from` is passed, and refers to a repository hosted by the same registry as
+        `image_reference`, a cross-repository blob mount is attempted first (see `mount_blob`).
+        `data` is only uploaded if registry refuses to mount the blob.
+
         mimetype should not be set to a different value than the default. It is exposed for
         users seeking lowlevel control.
         '''
@@ -1227,6 +2491,15 @@ class Client:
             logger.debug(f'skipping blob upload {digest=} - already exists')
             return
 
+        if mount_from and self.mount_blob(
+            image_reference=image_reference,
+            digest=digest,
+            source_image_reference=mount_from,
+        ):
+            if isinstance(data, requests.models.Response):
+                data.close()
+            return
+
         data_is_requests_resp = isinstance(data, requests.models.Response)
         data_is_generator = isinstance(data, collections.abc.Generator)
         data_is_filelike = hasattr(data, 'read')
@@ -1238,10 +2511,7 @@ class Client:
             elif data_is_generator:
                 # at least GCR does not like chunked-uploads; if small enough, workaround this
                 # and create one (not-that-big) bytes-obj
-                _data = bytes()
-                for chunk in data:
-                    _data += chunk
-                data = _data
+                data = b''.join(data)
             elif data_is_filelike:
                 pass # if filelike, http.client will handle streaming for us
 
@@ -1252,20 +2522,61 @@ class Client:
                 data=data,
                 mimetype=mimetype,
             )
-        elif octets_count >= max_chunk and (data_is_generator or data_is_requests_resp):
-            # workaround: write into temporary file, as at least GCR does not implement
-            # chunked-upload, and requests will not properly work w/ all generators
-            # (in particular, it will not work w/ our "fake" on)
-            with tempfile.TemporaryFile() as tf:
-                if data_is_generator:
-                    for chunk in data:
-                        tf.write(chunk)
-                elif data_is_requests_resp:
-                    while (chunk := data.raw.read(4096)):
-                        tf.write(chunk)
-                else:
-                    # must only enter this codepath, if either generator or requests-response
-                    raise RuntimeError('this line must not be reached')
+
+        if data_is_requests_resp:
+            chunks = _iter_raw_content(res=data)
+        elif data_is_generator:
+            chunks = data
+        else:
+            raise NotImplementedError(type(data))
+
+        upload_mode = upload_mode or self.blob_upload_mode
+        capabilities = self.capabilities_cache.capabilities(image_reference=image_reference)
+
+        if upload_mode is BlobUploadMode.STREAMING and capabilities.streaming_upload is None:
+            # probe using tiny blob, as (consumed) streamed data cannot be re-sent w/o spooling
+            capabilities = self._probe_streaming_upload(image_reference=image_reference)
+
+        # fallback-order: STREAMING -> CHUNKED -> SPOOLED
+        if upload_mode is BlobUploadMode.STREAMING and not capabilities.streaming_upload:
+            logger.debug(f'{image_reference=} does not support streamed uploads - will use chunks')
+            upload_mode = BlobUploadMode.CHUNKED
+        if upload_mode is BlobUploadMode.CHUNKED and capabilities.chunked_upload is False:
+            logger.debug(f'{image_reference=} does not support chunked uploads - will spool')
+            upload_mode = BlobUploadMode.SPOOLED
+
+        logger.debug(f'{upload_mode=} {image_reference=} {digest=} {octets_count=}')
+
+        if upload_mode is BlobUploadMode.STREAMING:
+            return self._put_blob_single_post(
+                image_reference=image_reference,
+                digest=digest,
+                octets_count=octets_count,
+                data=_LengthKnownIterable(
+                    iterable=chunks,
+                    length=octets_count,
+                ),
+                mimetype=mimetype,
+            )
+        elif upload_mode is BlobUploadMode.CHUNKED:
+            return self._put_blob_chunked(
+                image_reference=image_reference,
+                digest=digest,
+                octets_count=octets_count,
+                data_iterator=_iter_fixed_size_chunks(
+                    chunks=chunks,
+                    chunk_size=(chunk_size := self._upload_chunk_size(capabilities)),
+                ),
+                chunk_size=chunk_size,
+                mimetype=mimetype,
+            )
+        elif upload_mode is BlobUploadMode.SPOOLED:
+            # keep (smaller) blobs in memory; larger ones will be transparently written to disk
+            with tempfile.SpooledTemporaryFile(
+                max_size=self.blob_upload_chunk_size,
+            ) as tf:
+                for chunk in chunks:
+                    tf.write(chunk)
                 tf.seek(0)
 
                 return self._put_blob_single_post(
@@ -1276,17 +2587,49 @@ class Client:
                     mimetype=mimetype,
                 )
         else:
-            if data_is_requests_resp:
-                with data:
-                  return self._put_blob_chunked(
-                      image_reference=image_reference,
-                      octets_count=octets_count,
-                      data_iterator=data.iter_content(chunk_size=max_chunk),
-                      chunk_size=max_chunk,
-                      mimetype=mimetype,
-                  )
-            else:
-              raise NotImplementedError
+            raise NotImplementedError(upload_mode)
+
+    def _upload_chunk_size(self, capabilities: RegistryCapabilities) -> int:
+        if capabilities.max_chunk_size:
+            return min(self.blob_upload_chunk_size, capabilities.max_chunk_size)
+        return self.blob_upload_chunk_size
+
+    def _probe_streaming_upload(
+        self,
+        image_reference: om.OciImageReference,
+    ) -> RegistryCapabilities:
+        '''
+        probes whether the registry hosting `image_reference` accepts streamed request-bodies for
+        blob-uploads, by streaming a tiny blob (containing an empty JSON-object), and records the
+        outcome in `capabilities_cache` (nothing is recorded if outcome cannot be determined).
+        '''
+        try:
+            self._put_blob_single_post(
+                image_reference=image_reference,
+                digest=_EMPTY_JSON_BLOB_DIGEST,
+                octets_count=len(_EMPTY_JSON_BLOB),
+                data=_LengthKnownIterable(
+                    iterable=(_EMPTY_JSON_BLOB,),
+                    length=len(_EMPTY_JSON_BLOB),
+                ),
+            )
+            streaming_upload = True
+        except (requests.exceptions.HTTPError, requests.exceptions.ConnectionError) as e:
+            response = getattr(e, 'response', None)
+            if response is not None and response.status_code in (401, 403, 404):
+                raise # not caused by lack of support for streamed uploads
+            if response is None or response.status_code not in (400, 411, 413):
+                logger.warning(f'failed to probe streamed uploads for {image_reference=}: {e}')
+                return self.capabilities_cache.capabilities(image_reference=image_reference)
+
+            logger.info(f'{image_reference.netloc} does not support streamed uploads: {e}')
+            streaming_upload = False
+
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            streaming_upload=streaming_upload,
+        )
+        return self.capabilities_cache.capabilities(image_reference=image_reference)
 
     @initialise_repository_if_required
     def _put_blob_chunked(
@@ -1295,8 +2638,22 @@ class Client:
         octets_count: int,
         data_iterator: collections.abc.Iterator[bytes],
         chunk_size: int=1024 * 1024 * 16, # 16 MiB
-        mimetype='application/octect-stream',
+        mimetype='application/octet-stream',
+        digest: str=None,
     ):
+        '''
+        uploads blob using a chunked upload (sequence of PATCH-requests) as specified in
+        oci-distribution-spec:
+        https://github.com/opencontainers/distribution-spec/blob/main/spec.md#pushing-a-blob-in-chunks
+
+        `data_iterator` must yield chunks of exactly `chunk_size` octets (except for the last one).
+        If `digest` is passed, it is compared against the digest calculated from uploaded data
+        prior to closing the upload-session.
+
+        if uploading a chunk fails (after exhausting retries), the upload-session is resumed from
+        the last offset acknowledged by the registry (see `_patch_blob_chunk`), rather than
+        restarting the upload from scratch.
+        '''
         image_reference = om.OciImageReference(image_reference)
         scope = _scope(image_reference=image_reference, action='push,pull')
         logger.debug(f'chunked-put {chunk_size=}')
@@ -1313,11 +2670,10 @@ class Client:
         )
         res.raise_for_status()
 
-        upload_url = res.headers['location']
+        upload_url = _upload_location(res=res)
 
         octets_left = octets_count
         octets_sent = 0
-        offset = 0
         sha256 = hashlib.sha256()
 
         while octets_left > 0:
@@ -1332,37 +2688,27 @@ class Client:
                 raise ValueError(f'{len(data)=} vs {octets_to_send=}')
 
             logger.debug(f'{octets_to_send=} {octets_left=} {len(data)=}')
-            logger.debug(f'{octets_sent + offset}-{octets_sent + octets_to_send + offset}')
-
-            crange_from = octets_sent
-            crange_to = crange_from + len(data) - 1
 
-            res = self._request(
-                url=upload_url,
+            upload_url = self._patch_blob_chunk(
                 image_reference=image_reference,
                 scope=scope,
-                method='PATCH',
+                upload_url=upload_url,
                 data=data,
-                headers={
-                 'Content-Length': str(octets_to_send),
-                 'Content-Type': mimetype,
-                 'Content-Range': f'{crange_from}-{crange_to}',
-                 'Range': f'{crange_from}-{crange_to}',
-                }
+                offset=octets_sent,
+                chunk_size=chunk_size,
+                mimetype=mimetype,
             )
-            res.raise_for_status()
-
-            upload_url = res.headers['location']
 
             octets_sent += len(data)
 
         sha256_digest = f'sha256:{sha256.hexdigest()}'
 
+        if digest and digest != sha256_digest:
+            raise ValueError(f'uploaded data does not match {digest=}: {sha256_digest=}')
+
         # close uploading session
-        query = urllib.parse.urlencode({'digest': sha256_digest})
-        upload_url = res.headers['location'] + '?' + query
         res = self._request(
-            url=upload_url,
+            url=_with_query(url=upload_url, digest=sha256_digest),
             image_reference=image_reference,
             scope=scope,
             method='PUT',
@@ -1370,8 +2716,133 @@ class Client:
                  'Content-Length': '0',
             },
         )
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            chunked_upload=True,
+        )
         return res
 
+    def _upload_status(
+        self,
+        image_reference: om.OciImageReference,
+        scope: str,
+        upload_url: str,
+    ) -> tuple[str, int]:
+        '''
+        queries status of an upload-session, as specified in oci-distribution-spec:
+        https://github.com/opencontainers/distribution-spec/blob/main/spec.md#closing-a-chunked-blob-upload
+
+        returns upload-url to use for subsequent requests, and count of octets received by registry
+        '''
+        res = self._request(
+            url=upload_url,
+            image_reference=image_reference,
+            scope=scope,
+            method='GET',
+        )
+
+        # Range-header has format `0-<offset-of-last-received-octet>`. Registries commonly also
+        # return `0-0` if no octets were received; assume the latter (worst case, one octet will
+        # be rejected as being sent twice).
+        if (octets_range := res.headers.get('Range')):
+            end = int(octets_range.split('-')[-1])
+            octets_received = end + 1 if end > 0 else 0
+        else:
+            octets_received = 0
+
+        if res.headers.get('Location'):
+            upload_url = _upload_location(res=res)
+
+        return upload_url, octets_received
+
+    def _patch_blob_chunk(
+        self,
+        image_reference: om.OciImageReference,
+        scope: str,
+        upload_url: str,
+        data: bytes,
+        offset: int,
+        chunk_size: int,
+        mimetype: str,
+        remaining_resumes: int=None,
+    ) -> str:
+        '''
+        uploads `data` (starting at `offset` of the blob) as part of a chunked upload, and returns
+        upload-url to use for subsequent requests.
+
+        if the upload fails (after exhausting retries), the upload-status is queried, and the part
+        of `data` not yet acknowledged by the registry is resent (up to `remaining_resumes` times;
+        defaults to `max_retries`).
+        '''
+        if remaining_resumes is None:
+            remaining_resumes = self.max_retries
+
+        octets_acknowledged = 0 # count of octets from `data` acknowledged by registry
+
+        while True:
+            crange_from = offset + octets_acknowledged
+            crange_to = offset + len(data) - 1
+
+            try:
+                res = self._request(
+                    url=upload_url,
+                    image_reference=image_reference,
+                    scope=scope,
+                    method='PATCH',
+                    data=data[octets_acknowledged:],
+                    headers={
+                     'Content-Length': str(len(data) - octets_acknowledged),
+                     'Content-Type': mimetype,
+                     'Content-Range': f'{crange_from}-{crange_to}',
+                     'Range': f'{crange_from}-{crange_to}',
+                    },
+                    raise_for_status=False,
+                )
+                if res.status_code == 413:
+                    # chunk too large; remember for subsequent uploads
+                    self.capabilities_cache.update(
+                        image_reference=image_reference,
+                        max_chunk_size=chunk_size // 2,
+                    )
+                res.raise_for_status()
+
+                return _upload_location(res=res)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.HTTPError,
+            ) as e:
+                if isinstance(e, requests.exceptions.HTTPError) and not (
+                    e.response.status_code >= 500
+                    or e.response.status_code in (408, 416, 429)
+                ):
+                    raise
+                if remaining_resumes == 0:
+                    raise
+                remaining_resumes -= 1
+
+                if self.default_backoff_base_seconds > 0:
+                    time.sleep(self.default_backoff_base_seconds)
+
+                upload_url, octets_received = self._upload_status(
+                    image_reference=image_reference,
+                    scope=scope,
+                    upload_url=upload_url,
+                )
+
+                if not offset <= octets_received <= offset + len(data):
+                    # registry lost previously acknowledged chunks - cannot resume
+                    raise
+
+                octets_acknowledged = octets_received - offset
+                logger.warning(
+                    f'resuming chunked upload for {image_reference=} at {octets_received=} '
+                    f'({remaining_resumes=}); {e}'
+                )
+
+                if octets_acknowledged == len(data):
+                    return upload_url
+
     @initialise_repository_if_required
     def _put_blob_single_post(
         self,
@@ -1385,49 +2856,58 @@ class Client:
         image_reference = om.OciImageReference(image_reference)
         scope = _scope(image_reference=image_reference, action='push,pull')
 
-        # XXX according to distribution-spec, single-POST should also work - however
-        # this seems not to be true for registry-1.docker.io. To keep the code simple(r),
-        # always do a two-step upload; we might add a cfg-option (or maybe even discovery) for
-        # using single-post uploads for registries that support it (such as GCR or artifactory)
-        res = self._request(
-            url=self.routes.uploads_url(
-                image_reference=image_reference,
-            ),
-            image_reference=image_reference,
-            scope=scope,
-            method='POST',
-        )
-
-        upload_url = res.headers.get('Location')
+        if isinstance(data, _LengthKnownIterable):
+            # streamed request-bodies cannot be re-sent
+            retry_kwargs = {'remaining_retries': 0}
+        else:
+            retry_kwargs = {}
 
-        # returned url _may_ be relative
-        if upload_url.startswith('/'):
-            parsed_url = urllib.parse.urlparse(res.url)
-            upload_url = f'{parsed_url.scheme}://{parsed_url.netloc}{upload_url}'
+        capabilities = self.capabilities_cache.capabilities(image_reference=image_reference)
 
-        if '?' in upload_url:
-            prefix = '&'
+        # according to distribution-spec, single-POST should work - however this is not true
+        # for all registries (e.g. registry-1.docker.io). Hence, only use it if registry
+        # is known to support it (see `probe_capabilities`), and do a two-step upload otherwise
+        if capabilities.single_post_upload:
+            method = 'POST'
+            upload_url = self.routes.single_post_blob_url(
+                image_reference=image_reference,
+                digest=digest,
+            )
         else:
-            prefix = '?'
+            res = self._request(
+                url=self.routes.uploads_url(
+                    image_reference=image_reference,
+                ),
+                image_reference=image_reference,
+                scope=scope,
+                method='POST',
+            )
 
-        upload_url += prefix + urllib.parse.urlencode({'digest': digest})
+            method = 'PUT'
+            upload_url = _with_query(
+                url=_upload_location(res=res),
+                digest=digest,
+            )
 
         res = self._request(
             url=upload_url,
             image_reference=image_reference,
             scope=scope,
-            method='PUT',
+            method=method,
             headers={
                 'content-type': mimetype,
                 'content-length': str(octets_count),
             },
             data=data,
             raise_for_status=False,
+            **retry_kwargs,
         )
 
         if res.ok and not res.status_code == 201: # spec says it MUST be 201
             # also, 202 indicates the upload actually did not succeed e.g. for "docker-hub"
-            logger.warning(f'{image_reference=} {res.status_code=} {digest=} - PUT may have failed')
+            logger.warning(
+                f'{image_reference=} {res.status_code=} {digest=} - {method} may have failed'
+            )
 
         res.raise_for_status()
         return res
@@ -6,6 +6,7 @@ import io
 import json
 import logging
 import tempfile
+import time
 
 import aiohttp
 import aiohttp.client_exceptions
@@ -16,6 +17,7 @@ import www_authenticate
 import oci.auth as oa
 import oci.aws
 import oci.client
+import oci.metrics
 import oci.model as om
 
 
@@ -26,6 +28,47 @@ oci_request_logger = logging.getLogger('oci.client.request_logger')
 oci_request_logger.setLevel(logging.DEBUG)
 
 
+def _upload_location(res: aiohttp.ClientResponse) -> str:
+    upload_url = res.headers['Location']
+
+    # returned url _may_ be relative
+    if upload_url.startswith('/'):
+        parsed_url = urllib.parse.urlparse(str(res.url))
+        upload_url = f'{parsed_url.scheme}://{parsed_url.netloc}{upload_url}'
+
+    return upload_url
+
+
+async def _aiter(
+    chunks: collections.abc.Iterable[bytes] | collections.abc.AsyncIterable[bytes],
+) -> collections.abc.AsyncGenerator[bytes, None]:
+    if isinstance(chunks, collections.abc.AsyncIterable):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+async def _aiter_fixed_size_chunks(
+    chunks: collections.abc.AsyncIterable[bytes],
+    chunk_size: int,
+) -> collections.abc.AsyncGenerator[bytes, None]:
+    '''
+    async variant of `oci.client._iter_fixed_size_chunks`
+    '''
+    buf = bytearray()
+
+    async for chunk in chunks:
+        buf += chunk
+        while len(buf) >= chunk_size:
+            yield bytes(buf[:chunk_size])
+            del buf[:chunk_size]
+
+    if buf:
+        yield bytes(buf)
+
+
 def initialise_repository_if_required(func):
     '''
     Some OCI registries require separate repositories for each OCI artefact (e.g. AWS ECR), which
@@ -76,6 +119,11 @@ class Client:
         session: aiohttp.ClientSession=None,
         tag_preprocessing_callback: collections.abc.Callable[[str], str]=None,
         tag_postprocessing_callback: collections.abc.Callable[[str], str]=None,
+        metrics: oci.metrics.Metrics=None,
+        blob_upload_mode: oci.client.BlobUploadMode=oci.client.BlobUploadMode.STREAMING,
+        blob_upload_chunk_size: int=1024 * 1024 * 16, # 16 MiB
+        max_upload_resumes: int=3,
+        capabilities_cache: oci.client.RegistryCapabilitiesCache=None,
     ):
         '''
         :param Callable credentials_lookup:
@@ -90,6 +138,19 @@ class Client:
         :param Callable tag_postprocessing_callback:
             callback which is instrumented _after_ interacting with the OCI registry, i.e. useful to
             revert required sanitisation of `tag_preprocessing_callback`
+        :param Metrics metrics:
+            used to record request-level metrics (see `oci.metrics`); may be shared by multiple
+            clients. Created if not passed
+        :param BlobUploadMode blob_upload_mode:
+            default mode for uploading large streamed blobs (see `put_blob`)
+        :param int blob_upload_chunk_size:
+            chunk-size for chunked uploads; also used as in-memory limit for spooled uploads
+        :param int max_upload_resumes:
+            how many times to resume a chunked upload from the last offset acknowledged by the
+            registry, if uploading a chunk fails
+        :param RegistryCapabilitiesCache capabilities_cache:
+            used to track registry-capabilities learnt from uploads (may be shared w/ instances
+            of `oci.client.Client`)
         '''
         self.credentials_lookup = credentials_lookup
         self.token_cache = oci.client.OauthTokenCache()
@@ -106,6 +167,18 @@ class Client:
             timeout_seconds = int(timeout_seconds)
         self.timeout_seconds = timeout_seconds
 
+        if metrics is None:
+            metrics = oci.metrics.Metrics()
+        self.metrics = metrics
+
+        self.blob_upload_mode = blob_upload_mode
+        self.blob_upload_chunk_size = blob_upload_chunk_size
+        self.max_upload_resumes = max_upload_resumes
+
+        if capabilities_cache is None:
+            capabilities_cache = oci.client.RegistryCapabilitiesCache()
+        self.capabilities_cache = capabilities_cache
+
     async def _authenticate(
         self,
         image_reference: str | om.OciImageReference,
@@ -218,12 +291,20 @@ class Client:
         else:
             auth = None
 
+        started_at = time.monotonic()
         res = await self.session.get(
             url=realm,
             ssl=not self.disable_tls_validation,
             auth=auth,
             timeout=121,
         )
+        registry = om.OciImageReference.to_image_ref(image_reference).netloc
+        self.metrics.inc('oci_token_fetches', registry=registry, status=res.status)
+        self.metrics.observe(
+            'oci_token_fetch_duration_seconds',
+            time.monotonic() - started_at,
+            registry=registry,
+        )
 
         if not res.ok:
             logger.warning(
@@ -355,6 +436,10 @@ class Client:
         except KeyError:
             timeout = 121
 
+        registry = image_reference.netloc
+        operation = oci.metrics.operation(url=url)
+        started_at = time.monotonic()
+
         try:
             res = await self.session.request(
                 method=method,
@@ -365,9 +450,18 @@ class Client:
                 **kwargs,
             )
         except aiohttp.client_exceptions.ClientResponseError as e:
+            self.metrics.inc(
+                'oci_requests',
+                registry=registry,
+                operation=operation,
+                method=method,
+                status=type(e).__name__,
+            )
             if remaining_retries == 0:
                 raise
 
+            self.metrics.inc('oci_retries', registry=registry, reason='connection-error')
+
             logger.warning(f'caught ConnectionError, going to retry... ({remaining_retries=}); {e}')
             return await self._request(
                 url=url,
@@ -381,12 +475,38 @@ class Client:
                 **kwargs,
             )
 
+        self.metrics.inc(
+            'oci_requests',
+            registry=registry,
+            operation=operation,
+            method=method,
+            status=res.status,
+        )
+        self.metrics.observe(
+            'oci_request_duration_seconds',
+            time.monotonic() - started_at,
+            registry=registry,
+            operation=operation,
+        )
+        if res.status in (429, 503):
+            self.metrics.inc('oci_throttled', registry=registry, status=res.status)
+        if (octets_sent := oci.metrics.request_octets(headers=headers, data=kwargs.get('data'))):
+            self.metrics.inc('oci_bytes_sent', octets_sent, registry=registry, operation=operation)
+        if method != 'HEAD' and res.content_length:
+            self.metrics.inc(
+                'oci_bytes_received',
+                res.content_length,
+                registry=registry,
+                operation=operation,
+            )
+
         if not res.ok and warn_if_not_ok:
             logger.warning(
                 f'rq against {url=} failed {res.status=} {res.reason=} {method=} {await res.text()}'
             )
 
         if res.status == 429 and remaining_retries > 0:
+            self.metrics.inc('oci_retries', registry=registry, reason=res.status)
             logger.warning(
                 f'quota was exceeded, will wait a minute and then retry again ({remaining_retries=})'
             )
@@ -487,7 +607,8 @@ class Client:
         if not res and absent_ok:
             return None
 
-        manifest_dict = await res.json()
+        raw_manifest = await res.read()
+        manifest_dict = json.loads(raw_manifest)
 
         # workaround: not all manifests contain `mediaType`
         # -> fallback to content-type header
@@ -499,21 +620,14 @@ class Client:
             om.DOCKER_MANIFEST_LIST_MIME,
             om.OCI_IMAGE_INDEX_MIME,
         ):
-            manifest = dacite.from_dict(
-                data_class=om.OciImageManifestList,
-                data=manifest_dict,
-            )
-            return manifest
+            return om.OciImageManifestList.from_dict(manifest_dict, raw_manifest=raw_manifest)
 
         schema_version = int(manifest_dict['schemaVersion'])
         if schema_version != 2:
             # only support v2 for async operation
             raise NotImplementedError(schema_version)
 
-        return dacite.from_dict(
-            data_class=om.OciImageManifest,
-            data=manifest_dict,
-        )
+        return om.OciImageManifest.from_dict(manifest_dict, raw_manifest=raw_manifest)
 
     async def head_manifest(
         self,
@@ -852,14 +966,29 @@ class Client:
         image_reference: str | om.OciImageReference,
         digest: str,
         octets_count: int,
-        data: aiohttp.ClientResponse | collections.abc.Generator | bytes | io.IOBase,
+        data: (
+            aiohttp.ClientResponse
+            | collections.abc.AsyncIterable[bytes]
+            | collections.abc.Generator
+            | bytes
+            | io.IOBase
+        ),
         max_chunk=1024 * 1024 * 1, # 1 MiB
         mimetype: str='application/octet-stream',
+        upload_mode: oci.client.BlobUploadMode=None,
     ):
         '''
         uploads blob as part of an image-upload as specified in oci-distribution-spec:
         https://github.com/opencontainers/distribution-spec/blob/main/spec.md#push
 
+        blobs smaller than `max_chunk`, as well as blobs passed as bytes are uploaded using a single
+        PUT-request. Larger blobs passed as response (e.g. as returned by `blob`), async iterable,
+        generator, or file-like object are uploaded according to `upload_mode` (defaults to the
+        client's `blob_upload_mode`; see `oci.client.BlobUploadMode`). Chunked uploads are resumed
+        from the last offset acknowledged by the registry if uploading a chunk fails.
+
+        `data` is only read if the blob does not yet exist.
+
         mimetype should not be set to a different value than the default. It is exposed for
         users seeking lowlevel control.
         '''
@@ -872,21 +1001,23 @@ class Client:
             logger.debug(f'skipping blob upload {digest=} - already exists')
             return
 
-        data_is_client_resp = isinstance(data, aiohttp.ClientResponse)
-        data_is_generator = isinstance(data, collections.abc.Generator)
-        data_is_filelike = hasattr(data, 'read')
-        data_is_bytes = isinstance(data, bytes)
+        if isinstance(data, aiohttp.ClientResponse):
+            data = data.content.iter_chunked(4096)
+        elif hasattr(data, 'read'):
+            def iter_filelike(f):
+                while chunk := f.read(4096):
+                    yield chunk
+
+            data = iter_filelike(data)
+
+        if not isinstance(data, (bytes, collections.abc.Iterable, collections.abc.AsyncIterable)):
+            raise NotImplementedError(type(data))
 
-        if octets_count < max_chunk or data_is_bytes:
-            if data_is_client_resp:
-                data = await data.content.read()
-            elif data_is_generator:
+        if octets_count < max_chunk or isinstance(data, bytes):
+            if not isinstance(data, bytes):
                 # at least GCR does not like chunked-uploads; if small enough, workaround this
                 # and create one (not-that-big) bytes-obj
-                _data = bytes()
-                for chunk in data:
-                    _data += chunk
-                data = _data
+                data = b''.join([chunk async for chunk in _aiter(data)])
 
             return await self._put_blob_single_post(
                 image_reference=image_reference,
@@ -895,25 +1026,58 @@ class Client:
                 data=data,
                 mimetype=mimetype,
             )
-        elif (
-            octets_count >= max_chunk
-            and (data_is_generator or data_is_client_resp or data_is_filelike)
+
+        chunks = _aiter(data)
+        upload_mode = upload_mode or self.blob_upload_mode
+        capabilities = self.capabilities_cache.capabilities(image_reference=image_reference)
+
+        if (
+            upload_mode is oci.client.BlobUploadMode.STREAMING
+            and capabilities.streaming_upload is None
+        ):
+            # probe using tiny blob, as (consumed) streamed data cannot be re-sent w/o spooling
+            capabilities = await self._probe_streaming_upload(image_reference=image_reference)
+
+        # fallback-order: STREAMING -> CHUNKED -> SPOOLED (see `oci.client.Client.put_blob`)
+        if (
+            upload_mode is oci.client.BlobUploadMode.STREAMING
+            and not capabilities.streaming_upload
         ):
-            # workaround: write into temporary file, as at least GCR does not implement
-            # chunked-upload, and requests will not properly work w/ all generators
-            # (in particular, it will not work w/ our "fake" on)
-            with tempfile.TemporaryFile() as tf:
-                if data_is_generator:
-                    for chunk in data:
-                        tf.write(chunk)
-                elif data_is_client_resp:
-                    async for chunk in data.content.iter_chunked(4096):
-                        tf.write(chunk)
-                elif data_is_filelike:
-                    while chunk := data.read(4096):
-                        tf.write(chunk)
-                else:
-                    raise RuntimeError('this line must not be reached')
+            upload_mode = oci.client.BlobUploadMode.CHUNKED
+        if upload_mode is oci.client.BlobUploadMode.CHUNKED and capabilities.chunked_upload is False:
+            upload_mode = oci.client.BlobUploadMode.SPOOLED
+
+        logger.debug(f'{upload_mode=} {image_reference=} {digest=} {octets_count=}')
+
+        if upload_mode is oci.client.BlobUploadMode.STREAMING:
+            # content-length is passed, so body is streamed as-is (i.e. w/o chunked
+            # transfer-encoding, which is not supported by all registries)
+            return await self._put_blob_single_post(
+                image_reference=image_reference,
+                digest=digest,
+                octets_count=octets_count,
+                data=chunks,
+                mimetype=mimetype,
+            )
+        elif upload_mode is oci.client.BlobUploadMode.CHUNKED:
+            return await self._put_blob_chunked(
+                image_reference=image_reference,
+                digest=digest,
+                octets_count=octets_count,
+                data_iterator=_aiter_fixed_size_chunks(
+                    chunks=chunks,
+                    chunk_size=self.blob_upload_chunk_size,
+                ),
+                chunk_size=self.blob_upload_chunk_size,
+                mimetype=mimetype,
+            )
+        elif upload_mode is oci.client.BlobUploadMode.SPOOLED:
+            # keep (smaller) blobs in memory; larger ones will be transparently written to disk
+            with tempfile.SpooledTemporaryFile(
+                max_size=self.blob_upload_chunk_size,
+            ) as tf:
+                async for chunk in chunks:
+                    tf.write(chunk)
                 tf.seek(0)
 
                 return await self._put_blob_single_post(
@@ -924,7 +1088,223 @@ class Client:
                     mimetype=mimetype,
                 )
         else:
-            raise NotImplementedError
+            raise NotImplementedError(upload_mode)
+
+    async def _probe_streaming_upload(
+        self,
+        image_reference: om.OciImageReference,
+    ) -> oci.client.RegistryCapabilities:
+        '''
+        async variant of `oci.client.Client._probe_streaming_upload`: probes whether registry
+        accepts streamed request-bodies for blob-uploads, by streaming a tiny blob, and records the
+        outcome in `capabilities_cache` (nothing is recorded if outcome cannot be determined).
+        '''
+        try:
+            await self._put_blob_single_post(
+                image_reference=image_reference,
+                digest=oci.client._EMPTY_JSON_BLOB_DIGEST,
+                octets_count=len(oci.client._EMPTY_JSON_BLOB),
+                data=_aiter((oci.client._EMPTY_JSON_BLOB,)),
+            )
+            streaming_upload = True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = getattr(e, 'status', None)
+            if status in (401, 403, 404):
+                raise # not caused by lack of support for streamed uploads
+            if status not in (400, 411, 413):
+                logger.warning(f'failed to probe streamed uploads for {image_reference=}: {e}')
+                return self.capabilities_cache.capabilities(image_reference=image_reference)
+
+            logger.info(f'{image_reference.netloc} does not support streamed uploads: {e}')
+            streaming_upload = False
+
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            streaming_upload=streaming_upload,
+        )
+        return self.capabilities_cache.capabilities(image_reference=image_reference)
+
+    @initialise_repository_if_required
+    async def _put_blob_chunked(
+        self,
+        image_reference: str | om.OciImageReference,
+        octets_count: int,
+        data_iterator: collections.abc.AsyncIterator[bytes],
+        chunk_size: int=1024 * 1024 * 16, # 16 MiB
+        mimetype='application/octet-stream',
+        digest: str=None,
+    ):
+        '''
+        async variant of `oci.client.Client._put_blob_chunked`: uploads blob using a chunked
+        upload (sequence of PATCH-requests) as specified in oci-distribution-spec:
+        https://github.com/opencontainers/distribution-spec/blob/main/spec.md#pushing-a-blob-in-chunks
+
+        `data_iterator` must yield chunks of exactly `chunk_size` octets (except for the last one).
+        If `digest` is passed, it is compared against the digest calculated from uploaded data
+        prior to closing the upload-session.
+        '''
+        image_reference = om.OciImageReference(image_reference)
+        scope = oci.client._scope(image_reference=image_reference, action='push,pull')
+        logger.debug(f'chunked-put {chunk_size=}')
+
+        # start uploading session
+        res = await self._request(
+            url=self.routes.uploads_url(image_reference=image_reference),
+            image_reference=image_reference,
+            scope=scope,
+            method='POST',
+            headers={
+                'content-length': '0',
+            }
+        )
+
+        upload_url = _upload_location(res=res)
+
+        octets_left = octets_count
+        octets_sent = 0
+        sha256 = hashlib.sha256()
+
+        while octets_left > 0:
+            octets_to_send = min(octets_left, chunk_size)
+            octets_left -= octets_to_send
+
+            data = await anext(data_iterator)
+            sha256.update(data)
+
+            if not len(data) == octets_to_send:
+                # sanity check to detect programming errors
+                raise ValueError(f'{len(data)=} vs {octets_to_send=}')
+
+            upload_url = await self._patch_blob_chunk(
+                image_reference=image_reference,
+                scope=scope,
+                upload_url=upload_url,
+                data=data,
+                offset=octets_sent,
+                mimetype=mimetype,
+            )
+
+            octets_sent += len(data)
+
+        sha256_digest = f'sha256:{sha256.hexdigest()}'
+
+        if digest and digest != sha256_digest:
+            raise ValueError(f'uploaded data does not match {digest=}: {sha256_digest=}')
+
+        # close uploading session
+        res = await self._request(
+            url=oci.client._with_query(url=upload_url, digest=sha256_digest),
+            image_reference=image_reference,
+            scope=scope,
+            method='PUT',
+            headers={
+                 'Content-Length': '0',
+            },
+        )
+        self.capabilities_cache.update(
+            image_reference=image_reference,
+            chunked_upload=True,
+        )
+        return res
+
+    async def _upload_status(
+        self,
+        image_reference: om.OciImageReference,
+        scope: str,
+        upload_url: str,
+    ) -> tuple[str, int]:
+        '''
+        queries status of an upload-session; returns upload-url to use for subsequent requests,
+        and count of octets received by registry (see `oci.client.Client._upload_status`)
+        '''
+        res = await self._request(
+            url=upload_url,
+            image_reference=image_reference,
+            scope=scope,
+            method='GET',
+        )
+
+        # Range-header has format `0-<offset-of-last-received-octet>`. Registries commonly also
+        # return `0-0` if no octets were received; assume the latter (worst case, one octet will
+        # be rejected as being sent twice).
+        if (octets_range := res.headers.get('Range')):
+            end = int(octets_range.split('-')[-1])
+            octets_received = end + 1 if end > 0 else 0
+        else:
+            octets_received = 0
+
+        if res.headers.get('Location'):
+            upload_url = _upload_location(res=res)
+
+        return upload_url, octets_received
+
+    async def _patch_blob_chunk(
+        self,
+        image_reference: om.OciImageReference,
+        scope: str,
+        upload_url: str,
+        data: bytes,
+        offset: int,
+        mimetype: str,
+    ) -> str:
+        '''
+        uploads `data` (starting at `offset` of the blob) as part of a chunked upload, and returns
+        upload-url to use for subsequent requests.
+
+        if the upload fails, the upload-status is queried, and the part of `data` not yet
+        acknowledged by the registry is resent (up to `max_upload_resumes` times).
+        '''
+        remaining_resumes = self.max_upload_resumes
+        octets_acknowledged = 0 # count of octets from `data` acknowledged by registry
+
+        while True:
+            crange_from = offset + octets_acknowledged
+            crange_to = offset + len(data) - 1
+
+            try:
+                res = await self._request(
+                    url=upload_url,
+                    image_reference=image_reference,
+                    scope=scope,
+                    method='PATCH',
+                    data=data[octets_acknowledged:],
+                    headers={
+                     'Content-Length': str(len(data) - octets_acknowledged),
+                     'Content-Type': mimetype,
+                     'Content-Range': f'{crange_from}-{crange_to}',
+                     'Range': f'{crange_from}-{crange_to}',
+                    },
+                )
+
+                return _upload_location(res=res)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, aiohttp.ClientResponseError) and not (
+                    e.status >= 500
+                    or e.status in (408, 416, 429)
+                ):
+                    raise
+                if remaining_resumes == 0:
+                    raise
+                remaining_resumes -= 1
+
+                upload_url, octets_received = await self._upload_status(
+                    image_reference=image_reference,
+                    scope=scope,
+                    upload_url=upload_url,
+                )
+
+                if not offset <= octets_received <= offset + len(data):
+                    # registry lost previously acknowledged chunks - cannot resume
+                    raise
+
+                octets_acknowledged = octets_received - offset
+                logger.warning(
+                    f'resuming chunked upload for {image_reference=} at {octets_received=} '
+                    f'({remaining_resumes=}); {e}'
+                )
+
+                if octets_acknowledged == len(data):
+                    return upload_url
 
     @initialise_repository_if_required
     async def _put_blob_single_post(
@@ -932,7 +1312,7 @@ class Client:
         image_reference: str | om.OciImageReference,
         digest: str,
         octets_count: int,
-        data: bytes,
+        data: bytes | collections.abc.AsyncIterable[bytes] | io.IOBase,
         mimetype: str='application/octet-stream',
     ):
         logger.debug(f'single-post {image_reference=} {octets_count=}')
@@ -952,12 +1332,7 @@ class Client:
             method='POST',
         )
 
-        upload_url = res.headers.get('Location')
-
-        # returned url _may_ be relative
-        if upload_url.startswith('/'):
-            parsed_url = urllib.parse.urlparse(res.url)
-            upload_url = f'{parsed_url.scheme}://{parsed_url.netloc}{upload_url}'
+        upload_url = _upload_location(res=res)
 
         if '?' in upload_url:
             prefix = '&'
@@ -966,6 +1341,12 @@ class Client:
 
         upload_url += prefix + urllib.parse.urlencode({'digest': digest})
 
+        if isinstance(data, bytes):
+            retry_kwargs = {}
+        else:
+            # streamed request-bodies (async iterables, or file-like objects) cannot be re-sent
+            retry_kwargs = {'remaining_retries': 0}
+
         res = await self._request(
             url=upload_url,
             image_reference=image_reference,
@@ -977,6 +1358,7 @@ class Client:
             },
             data=data,
             raise_for_status=False,
+            **retry_kwargs,
         )
 
         if res.ok and not res.status == 201: # spec says it MUST be 201
@@ -0,0 +1,768 @@
+'''
+backend for the OCI image-layout format:
+https://github.com/opencontainers/image-spec/blob/main/image-layout.md
+
+An image-layout is a directory (or a tarball thereof) containing an `oci-layout` file, an
+`index.json` file, and content-addressed blobs (stored as `blobs/<algorithm>/<hex>`). Manifests are
+stored as blobs; symbolic tags are recorded in `index.json`, using the
+`org.opencontainers.image.ref.name` annotation (which holds the image-reference w/ symbolic tag,
+so many repositories may be stored in one image-layout).
+
+`Client` exposes (a subset of) the interface of `oci.client.Client`, so it may be passed to
+`oci.replicate_artifact`, `ctt.process_dependencies.process_images`, or `ocm.upload`. For
+"two-hop" transfers, image-references of a given (pseudo-)registry may be served from the
+image-layout, while all other image-references are delegated to a registry-client:
+
+    client = oci.layout.Client(
+        layout=oci.layout.ImageLayout(path='/mnt/export'),
+        registry='export.local',
+        delegate=oci.client.Client(...),
+    )
+    oci.replicate_artifact(
+        src_image_reference='example.org/foo:1.2.3',
+        tgt_image_reference='export.local/foo:1.2.3',
+        oci_client=client,
+    )
+
+Tarballs may be written from, and extracted into, image-layout directories using `write_tar` and
+`extract_tar` (both operating on streams, so tarballs may be written to pipes or tapes).
+Uncompressed tarballs may also be read directly (read-only) by passing their path to `ImageLayout`.
+'''
+import collections.abc
+import dataclasses
+import functools
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import tarfile
+import tempfile
+import threading
+
+import requests
+
+import oci.cache
+import oci.client
+import oci.model as om
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_LAYOUT_VERSION = '1.0.0'
+REF_NAME_ANNOTATION = 'org.opencontainers.image.ref.name'
+
+
+def _digest(octets: bytes) -> str:
+    return f'sha256:{hashlib.sha256(octets).hexdigest()}'
+
+
+def _symbolic_tag(image_reference: om.OciImageReference) -> str | None:
+    if image_reference.has_symbolical_tag:
+        return image_reference.tag
+    if image_reference.has_mixed_tag:
+        symbolic_tag, _ = image_reference.parsed_mixed_tag
+        return symbolic_tag
+    return None
+
+
+def _ref_name(image_reference: om.OciImageReference) -> str | None:
+    if not (tag := _symbolic_tag(image_reference)):
+        return None
+    return f'{image_reference.ref_without_tag}:{tag}'
+
+
+def _media_type(manifest: bytes) -> str:
+    return json.loads(manifest).get('mediaType', om.OCI_MANIFEST_SCHEMA_V2_MIME)
+
+
+class _FileSection(io.RawIOBase):
+    '''
+    read-only file-like object for the given section of a file (used for reading members of
+    uncompressed tarballs w/o sharing file-objects between threads)
+    '''
+    def __init__(self, path: str, offset: int, size: int):
+        self._f = open(path, 'rb')
+        self._offset = offset
+        self._size = size
+        self.seek(0)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if whence != io.SEEK_SET:
+            raise NotImplementedError(whence)
+
+        self._f.seek(self._offset + offset)
+        self._remaining = self._size - offset
+        return offset
+
+    def readinto(self, b) -> int:
+        if self._remaining <= 0:
+            return 0
+
+        octets = self._f.read(min(len(b), self._remaining))
+        b[:len(octets)] = octets
+        self._remaining -= len(octets)
+
+        return len(octets)
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+@dataclasses.dataclass
+class _TarMember:
+    offset: int
+    size: int
+
+
+class ImageLayout:
+    '''
+    OCI image-layout stored in the given directory (created if absent), or read from the given
+    (uncompressed) tarball. Tarballs are read-only.
+
+    writes are atomic (blobs are verified prior to being inserted, and `index.json` is replaced
+    by renaming), and may be issued concurrently from multiple threads (but not from multiple
+    processes).
+    '''
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.isfile(path):
+            self._blobs = None
+            self._members = self._scan_tar()
+            return
+
+        self._members = None
+        self._blobs = oci.cache.FileSystemCache(
+            root_dir=os.path.join(path, 'blobs'),
+            max_octets=math.inf,
+        )
+
+        if not os.path.exists(layout_path := os.path.join(path, 'oci-layout')):
+            with open(layout_path, 'w') as f:
+                json.dump({'imageLayoutVersion': IMAGE_LAYOUT_VERSION}, f)
+
+        if not os.path.exists(os.path.join(path, 'index.json')):
+            self._write_index(index=self._empty_index())
+
+    @property
+    def read_only(self) -> bool:
+        return self._blobs is None
+
+    def _scan_tar(self) -> dict[str, _TarMember]:
+        members = {}
+
+        with tarfile.open(self.path, mode='r:') as tf:
+            for member in tf:
+                if not member.isfile():
+                    continue
+                members[os.path.normpath(member.name)] = _TarMember(
+                    offset=member.offset_data,
+                    size=member.size,
+                )
+
+        if not 'oci-layout' in members:
+            raise ValueError(f'not an OCI image-layout: {self.path=}')
+
+        return members
+
+    def _open_member(self, name: str) -> _FileSection | None:
+        if not (member := self._members.get(name)):
+            return None
+
+        return _FileSection(path=self.path, offset=member.offset, size=member.size)
+
+    def _empty_index(self) -> dict:
+        return {
+            'schemaVersion': 2,
+            'mediaType': om.OCI_IMAGE_INDEX_MIME,
+            'manifests': [],
+        }
+
+    def index(self) -> dict:
+        if self.read_only:
+            with self._open_member('index.json') as f:
+                return json.loads(f.read())
+
+        with open(os.path.join(self.path, 'index.json')) as f:
+            return json.load(f)
+
+    def _write_index(self, index: dict):
+        f = tempfile.NamedTemporaryFile(
+            mode='w',
+            dir=self.path,
+            prefix='.tmp-',
+            delete=False,
+        )
+        with f:
+            json.dump(index, f, indent=2)
+        os.replace(f.name, os.path.join(self.path, 'index.json'))
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError(f'image-layout is read-only: {self.path=}')
+
+    def blob_size(self, digest: str) -> int | None:
+        if self.read_only:
+            algorithm, hexdigest = digest.split(':', 1)
+            if not (member := self._members.get(os.path.join('blobs', algorithm, hexdigest))):
+                return None
+            return member.size
+
+        try:
+            return os.stat(self._blobs.path(digest)).st_size
+        except FileNotFoundError:
+            return None
+
+    def open_blob(self, digest: str) -> io.IOBase | None:
+        '''
+        returns opened file-object for specified blob (caller is responsible for closing it), or
+        `None` if blob is absent
+        '''
+        if self.read_only:
+            algorithm, hexdigest = digest.split(':', 1)
+            return self._open_member(os.path.join('blobs', algorithm, hexdigest))
+
+        return self._blobs.open(digest)
+
+    def put_blob(
+        self,
+        digest: str,
+        chunks: collections.abc.Iterable[bytes],
+    ):
+        '''
+        stores the given blob, unless it is already present. Raises `ValueError` if content does
+        not match `digest`.
+        '''
+        self._check_writable()
+
+        for _ in self._blobs.tee(digest=digest, chunks=chunks):
+            pass
+
+    def delete_blob(self, digest: str):
+        self._check_writable()
+
+        try:
+            os.unlink(self._blobs.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def lookup(self, ref_name: str) -> om.OciBlobRef | None:
+        '''
+        returns the descriptor of the manifest tagged w/ given ref-name (image-reference w/
+        symbolic tag), or `None` if there is no such manifest
+        '''
+        for entry in self.index()['manifests']:
+            if entry.get('annotations', {}).get(REF_NAME_ANNOTATION) == ref_name:
+                return om.OciBlobRef(
+                    digest=entry['digest'],
+                    mediaType=entry['mediaType'],
+                    size=entry['size'],
+                )
+
+        return None
+
+    def ref_names(self) -> list[str]:
+        return [
+            ref_name for entry in self.index()['manifests']
+            if (ref_name := entry.get('annotations', {}).get(REF_NAME_ANNOTATION))
+        ]
+
+    def tag(
+        self,
+        ref_name: str,
+        manifest: om.OciBlobRef,
+    ):
+        '''
+        records the given manifest (which must already be stored as blob) in `index.json`,
+        replacing any manifest previously tagged w/ given ref-name
+        '''
+        self._check_writable()
+
+        with self._lock:
+            index = self.index()
+            index['manifests'] = [
+                entry for entry in index['manifests']
+                if entry.get('annotations', {}).get(REF_NAME_ANNOTATION) != ref_name
+            ] + [{
+                'mediaType': manifest.mediaType,
+                'digest': manifest.digest,
+                'size': manifest.size,
+                'annotations': {REF_NAME_ANNOTATION: ref_name},
+            }]
+            self._write_index(index=index)
+
+    def untag(
+        self,
+        ref_name: str=None,
+        digest: str=None,
+    ) -> bool:
+        '''
+        removes entries w/ given ref-name, or digest from `index.json`. Returns whether any
+        entries were removed.
+        '''
+        self._check_writable()
+
+        with self._lock:
+            index = self.index()
+            manifests = [
+                entry for entry in index['manifests']
+                if not (
+                    (ref_name and entry.get('annotations', {}).get(REF_NAME_ANNOTATION) == ref_name)
+                    or (digest and entry['digest'] == digest)
+                )
+            ]
+            if len(manifests) == len(index['manifests']):
+                return False
+
+            index['manifests'] = manifests
+            self._write_index(index=index)
+
+        return True
+
+
+def write_tar(
+    layout: ImageLayout | str,
+    fileobj: io.IOBase,
+):
+    '''
+    writes the given image-layout (directory) as (uncompressed) tarball into the given
+    file-object. The tarball is written as a stream (i.e. `fileobj` need not be seekable).
+    `oci-layout` and `index.json` are written first, so readers may process them before
+    receiving the blobs.
+    '''
+    if isinstance(layout, ImageLayout):
+        if layout.read_only:
+            raise ValueError(f'cannot write tarball from tarball: {layout.path=}')
+        layout = layout.path
+
+    with tarfile.open(fileobj=fileobj, mode='w|') as tf:
+        for name in ('oci-layout', 'index.json'):
+            tf.add(os.path.join(layout, name), arcname=name)
+
+        blobs_dir = os.path.join(layout, 'blobs')
+        for algorithm in sorted(os.listdir(blobs_dir)):
+            if not os.path.isdir(algorithm_dir := os.path.join(blobs_dir, algorithm)):
+                continue
+
+            for name in sorted(os.listdir(algorithm_dir)):
+                if name.startswith('.tmp-'):
+                    continue # not (yet) inserted
+                tf.add(
+                    os.path.join(algorithm_dir, name),
+                    arcname=f'blobs/{algorithm}/{name}',
+                )
+
+
+def extract_tar(
+    fileobj: io.IOBase,
+    path: str,
+) -> ImageLayout:
+    '''
+    extracts an image-layout tarball (which may be compressed) from the given file-object
+    (read as a stream) into the given directory, and returns the resulting image-layout
+    '''
+    os.makedirs(path, exist_ok=True)
+
+    with tarfile.open(fileobj=fileobj, mode='r|*') as tf:
+        tf.extractall(path=path, filter='data')
+
+    return ImageLayout(path=path)
+
+
+def _not_found(url: str):
+    res = requests.models.Response()
+    res.status_code = 404
+    res.reason = 'Not Found'
+    res.url = url
+    return res
+
+
+def _blob_response(
+    f: io.IOBase,
+    octets_count: int,
+) -> requests.models.Response:
+    res = requests.models.Response()
+    res.status_code = 200
+    res.headers['Content-Type'] = 'application/octet-stream'
+    res.headers['Content-Length'] = str(octets_count)
+    res.raw = f
+
+    return res
+
+
+def _route(func):
+    '''
+    delegates calls for image-references not hosted by the image-layout to the delegate-client
+    '''
+    @functools.wraps(func)
+    def route(self, *args, **kwargs):
+        if 'image_reference' in kwargs:
+            image_reference = kwargs['image_reference']
+        else:
+            image_reference = args[0]
+
+        if self.is_local(image_reference=image_reference):
+            return func(self, *args, **kwargs)
+
+        if not self.delegate:
+            raise ValueError(f'{image_reference=} is not hosted by {self.registry=}')
+
+        return getattr(self.delegate, func.__name__)(*args, **kwargs)
+
+    return route
+
+
+class Client:
+    '''
+    OCI-client serving image-references from an image-layout, offering (a subset of) the interface
+    of `oci.client.Client`.
+
+    if `registry` is passed, only image-references of the given registry (netloc) are served from
+    the image-layout; calls for other image-references (as well as accesses to attributes not
+    defined by this class) are delegated to `delegate`. Otherwise, all image-references are
+    served from the image-layout.
+
+    note: the asyncio-based replication-engine (see `ctt.process_dependencies.ReplicationEngine`)
+    does not support image-layouts; use the default, threaded engine.
+    '''
+    def __init__(
+        self,
+        layout: ImageLayout | str,
+        registry: str=None,
+        delegate: oci.client.Client=None,
+    ):
+        if isinstance(layout, str):
+            layout = ImageLayout(path=layout)
+
+        self.layout = layout
+        self.registry = registry
+        self.delegate = delegate
+
+    def __getattr__(self, name: str):
+        # only called for attributes not found otherwise
+        if name == 'delegate' or not (delegate := self.__dict__.get('delegate')):
+            raise AttributeError(name)
+
+        return getattr(delegate, name)
+
+    def is_local(self, image_reference: str | om.OciImageReference) -> bool:
+        if not self.registry:
+            return True
+
+        return om.OciImageReference.to_image_ref(image_reference).netloc == self.registry
+
+    def _resolve(self, image_reference: om.OciImageReference) -> om.OciBlobRef | None:
+        if image_reference.has_digest_tag:
+            digest = image_reference.tag
+            if (size := self.layout.blob_size(digest)) is None:
+                return None
+
+            with self.layout.open_blob(digest) as f:
+                media_type = _media_type(f.read())
+
+            return om.OciBlobRef(digest=digest, mediaType=media_type, size=size)
+
+        return self.layout.lookup(ref_name=_ref_name(image_reference))
+
+    @_route
+    def manifest_raw(
+        self,
+        image_reference: str | om.OciImageReference,
+        absent_ok: bool=False,
+        accept: str=None,
+    ) -> requests.models.Response | None:
+        '''
+        returns the stored manifest. Note that, other than registries, `accept` is not honoured
+        (i.e. manifests are always returned as stored).
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+
+        if not (descriptor := self._resolve(image_reference=image_reference)):
+            if absent_ok:
+                return None
+            _not_found(url=str(image_reference)).raise_for_status()
+
+        with self.layout.open_blob(descriptor.digest) as f:
+            octets = f.read()
+
+        return oci.client._cached_response(
+            octets=octets,
+            content_type=descriptor.mediaType,
+        )
+
+    @_route
+    def manifest(
+        self,
+        image_reference: str | om.OciImageReference,
+        absent_ok: bool=False,
+        accept: str=None,
+    ) -> om.OciImageManifest | om.OciImageManifestList | None:
+        if not (res := self.manifest_raw(
+            image_reference=image_reference,
+            absent_ok=absent_ok,
+            accept=accept,
+        )):
+            return None
+
+        return om.as_manifest(
+            manifest=res.content,
+            media_type=res.headers['Content-Type'],
+        )
+
+    @_route
+    def head_manifest(
+        self,
+        image_reference: str | om.OciImageReference,
+        absent_ok=False,
+        accept: str=None,
+    ) -> om.OciBlobRef | None:
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+
+        if (descriptor := self._resolve(image_reference=image_reference)):
+            return descriptor
+
+        if absent_ok:
+            return None
+        _not_found(url=str(image_reference)).raise_for_status()
+
+    def head_manifests(
+        self,
+        image_references: collections.abc.Iterable[str | om.OciImageReference],
+        accept: str=None,
+        max_workers: int=8,
+    ) -> dict[str | om.OciImageReference, om.OciBlobRef | None]:
+        return {
+            image_reference: self.head_manifest(
+                image_reference=image_reference,
+                absent_ok=True,
+                accept=accept,
+            ) for image_reference in image_references
+        }
+
+    def to_digest_hash(
+        self,
+        image_reference: str | om.OciImageReference,
+        accept: str=None,
+    ) -> str:
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        if image_reference.has_digest_tag:
+            return str(image_reference)
+
+        digest = self.head_manifest(
+            image_reference=image_reference,
+            accept=accept,
+        ).digest
+
+        return f'{image_reference.ref_without_tag}@{digest}'
+
+    @_route
+    def iter_tags(self, image_reference: str) -> collections.abc.Iterable[str]:
+        prefix = f'{om.OciImageReference.to_image_ref(image_reference).ref_without_tag}:'
+
+        for ref_name in self.layout.ref_names():
+            if ref_name.startswith(prefix):
+                yield ref_name.removeprefix(prefix)
+
+    def tags(self, image_reference: str) -> list[str]:
+        return list(self.iter_tags(image_reference=image_reference))
+
+    @_route
+    def has_multiarch(self, image_reference: str) -> bool:
+        return self.head_manifest(image_reference=image_reference).mediaType in (
+            om.DOCKER_MANIFEST_LIST_MIME,
+            om.OCI_IMAGE_INDEX_MIME,
+        )
+
+    @_route
+    def put_manifest(
+        self,
+        image_reference: str | om.OciImageReference,
+        manifest: bytes,
+    ) -> requests.models.Response:
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+
+        if isinstance(manifest, str):
+            manifest = manifest.encode('utf-8')
+
+        digest = _digest(manifest)
+        if image_reference.has_digest_tag and image_reference.tag != digest:
+            raise ValueError(f'{image_reference=} does not match {digest=}')
+
+        self.layout.put_blob(digest=digest, chunks=(manifest,))
+
+        if (ref_name := _ref_name(image_reference)):
+            self.layout.tag(
+                ref_name=ref_name,
+                manifest=om.OciBlobRef(
+                    digest=digest,
+                    mediaType=_media_type(manifest),
+                    size=len(manifest),
+                ),
+            )
+
+        res = requests.models.Response()
+        res.status_code = 201
+        res.headers['Docker-Content-Digest'] = digest
+        return res
+
+    @_route
+    def delete_manifest(
+        self,
+        image_reference: om.OciImageReference | str,
+        purge: bool=False,
+        accept: str=om.MimeTypes.prefer_multiarch,
+        absent_ok: bool=False,
+    ):
+        '''
+        if `image_reference` contains a symbolic tag, the tag is removed (and the manifest is also
+        removed if `purge` is set). If it contains a digest, the manifest is removed, alongside
+        all tags referring to it. Blobs referenced by the manifest are not removed.
+        '''
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+
+        if not (descriptor := self._resolve(image_reference=image_reference)):
+            if absent_ok:
+                return
+            _not_found(url=str(image_reference)).raise_for_status()
+
+        if image_reference.has_digest_tag or purge:
+            self.layout.untag(digest=descriptor.digest)
+            self.layout.delete_blob(digest=descriptor.digest)
+        else:
+            self.layout.untag(ref_name=_ref_name(image_reference))
+
+    @_route
+    def head_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        absent_ok=True,
+    ) -> requests.models.Response:
+        if (size := self.layout.blob_size(digest)) is None:
+            res = _not_found(url=f'{image_reference}@{digest}')
+            if not absent_ok:
+                res.raise_for_status()
+            return res
+
+        res = requests.models.Response()
+        res.status_code = 200
+        res.headers['Content-Length'] = str(size)
+        res.headers['Docker-Content-Digest'] = digest
+        return res
+
+    @_route
+    def head_blobs(
+        self,
+        image_reference: str | om.OciImageReference,
+        digests: collections.abc.Iterable[str],
+        max_workers: int=8,
+    ) -> dict[str, bool]:
+        return {
+            digest: self.layout.blob_size(digest) is not None
+            for digest in digests
+        }
+
+    @_route
+    def blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        stream=True,
+        absent_ok=False,
+    ) -> requests.models.Response | None:
+        if (size := self.layout.blob_size(digest)) is None or not (
+            f := self.layout.open_blob(digest)
+        ):
+            if absent_ok:
+                return None
+            _not_found(url=f'{image_reference}@{digest}').raise_for_status()
+
+        return _blob_response(f=f, octets_count=size)
+
+    @_route
+    def iter_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        chunk_size: int=1024 * 1024, # 1 MiB
+        start: int=0,
+        end: int=None,
+        remaining_resumes: int=None,
+    ) -> collections.abc.Generator[bytes, None, None]:
+        if not (f := self.layout.open_blob(digest)):
+            _not_found(url=f'{image_reference}@{digest}').raise_for_status()
+
+        with f:
+            if start:
+                f.seek(start)
+
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                if remaining is None:
+                    chunk = f.read(chunk_size)
+                else:
+                    chunk = f.read(min(chunk_size, remaining))
+                    remaining -= len(chunk)
+                if not chunk:
+                    break
+                yield chunk
+
+    @_route
+    def mount_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        source_image_reference: str | om.OciImageReference,
+    ) -> bool:
+        '''
+        blobs are shared between all repositories of an image-layout; hence, blobs present in
+        the image-layout are always "mounted"
+        '''
+        return self.layout.blob_size(digest) is not None
+
+    @_route
+    def put_blob(
+        self,
+        image_reference: str | om.OciImageReference,
+        digest: str,
+        octets_count: int,
+        data: requests.models.Response | collections.abc.Iterable[bytes] | bytes | io.IOBase,
+        max_chunk=1024 * 1024 * 1, # 1 MiB
+        mimetype: str='application/octet-stream',
+        mount_from: str | om.OciImageReference=None,
+        upload_mode: oci.client.BlobUploadMode=None,
+    ):
+        if self.layout.blob_size(digest) is not None:
+            logger.debug(f'skipping blob upload {digest=} - already exists')
+            if isinstance(data, requests.models.Response):
+                data.close()
+            return
+
+        if isinstance(data, requests.models.Response):
+            chunks = oci.client._iter_raw_content(res=data, chunk_size=max_chunk)
+        elif isinstance(data, bytes):
+            chunks = (data,)
+        elif hasattr(data, 'read'):
+            chunks = iter(functools.partial(data.read, max_chunk), b'')
+        else:
+            chunks = data
+
+        self.layout.put_blob(digest=digest, chunks=chunks)
+
+    @_route
+    def delete_blob(
+        self,
+        image_reference: om.OciImageReference | str,
+        digest: str,
+    ):
+        self.layout.delete_blob(digest=digest)
@@ -0,0 +1,207 @@
+'''
+request-level metrics for OCI clients (see `oci.client.Client`, `oci.client_async.Client`).
+
+Metrics are recorded per registry (netloc) and operation (see `operation`), and may be exported
+in OpenMetrics text-format, or as JSON (see `Metrics.dump`).
+'''
+import collections
+import dataclasses
+import json
+import math
+import threading
+import urllib.parse
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300,
+)
+
+# {name: (type, help)}
+METRICS = {
+    'oci_requests': ('counter', 'requests sent to OCI registries'),
+    'oci_request_duration_seconds': ('histogram', 'duration until response-headers were received'),
+    'oci_concurrency_wait_seconds': ('histogram', 'time waited for a concurrency-slot'),
+    'oci_bytes_sent': ('counter', 'octets sent as request-bodies'),
+    'oci_bytes_received': ('counter', 'octets received as response-bodies (as announced)'),
+    'oci_retries': ('counter', 'retried requests'),
+    'oci_throttled': ('counter', 'responses signalling throttling (429, 503)'),
+    'oci_token_fetches': ('counter', 'auth-tokens fetched from token-servers'),
+    'oci_token_fetch_duration_seconds': ('histogram', 'duration of auth-token retrieval'),
+    'oci_cache_hits': ('counter', 'requests served from caches'),
+    'oci_cache_misses': ('counter', 'cache-lookups not served from caches'),
+}
+
+
+def operation(url: str) -> str:
+    '''
+    derives operation (manifest, blob, blob-upload, tags, referrers, other) from given url
+    '''
+    path = urllib.parse.urlparse(url).path
+
+    if '/manifests/' in path:
+        return 'manifest'
+    if '/blobs/uploads' in path:
+        return 'blob-upload'
+    if '/blobs/' in path:
+        return 'blob'
+    if path.endswith('/tags/list'):
+        return 'tags'
+    if '/referrers/' in path:
+        return 'referrers'
+    return 'other'
+
+
+def request_octets(headers: dict, data) -> int:
+    '''
+    returns count of octets sent as request-body (based on content-length header, if present)
+    '''
+    for name, value in headers.items():
+        if name.lower() == 'content-length':
+            return int(value)
+
+    if isinstance(data, bytes):
+        return len(data)
+    return 0
+
+
+@dataclasses.dataclass
+class Histogram:
+    buckets: tuple[float]
+    counts: list[int]
+    sum: float = 0
+    count: int = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+
+        for idx, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[idx] += 1
+                break
+
+
+def _labels(labels: dict) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    def escape(value: str):
+        return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metrics:
+    '''
+    thread-safe store for counters and histograms, identified by name and labels
+    '''
+    def __init__(self, buckets: tuple[float]=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = collections.defaultdict(float) # {(name, labels): value}
+        self._histograms = {} # {(name, labels): Histogram}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float=1, /, **labels):
+        with self._lock:
+            self._counters[(name, _labels(labels))] += value
+
+    def observe(self, name: str, value: float, /, **labels):
+        key = (name, _labels(labels))
+
+        with self._lock:
+            if not (histogram := self._histograms.get(key)):
+                histogram = self._histograms[key] = Histogram(
+                    buckets=self.buckets,
+                    counts=[0] * len(self.buckets),
+                )
+            histogram.observe(value)
+
+    def counter(self, name: str, /, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, /, **labels) -> Histogram | None:
+        with self._lock:
+            return self._histograms.get((name, _labels(labels)))
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'buckets': dict(zip(histogram.buckets, histogram.counts)),
+                    'sum': histogram.sum,
+                    'count': histogram.count,
+                } for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+
+        return {
+            'counters': counters,
+            'histograms': histograms,
+        }
+
+    def as_openmetrics(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, dataclasses.replace(histogram, counts=list(histogram.counts)))
+                for key, histogram in self._histograms.items()
+            )
+
+        samples = collections.defaultdict(list) # {name: [line]}
+
+        for (name, labels), value in counters:
+            samples[name].append(f'{name}_total{_format_labels(labels)} {_format_number(value)}')
+
+        for (name, labels), histogram in histograms:
+            cumulative_count = 0
+            for upper_bound, count in zip(
+                (*histogram.buckets, math.inf),
+                (*histogram.counts, histogram.count - sum(histogram.counts)),
+            ):
+                cumulative_count += count
+                bucket_labels = _format_labels((*labels, ('le', _format_number(upper_bound))))
+                samples[name].append(f'{name}_bucket{bucket_labels} {cumulative_count}')
+
+            samples[name].append(
+                f'{name}_sum{_format_labels(labels)} {_format_number(histogram.sum)}'
+            )
+            samples[name].append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+        lines = []
+        for name, metric_samples in samples.items():
+            metric_type, help = METRICS.get(name, ('unknown', None))
+            lines.append(f'# TYPE {name} {metric_type}')
+            if help:
+                lines.append(f'# HELP {name} {help}')
+            lines.extend(metric_samples)
+        lines.append('# EOF')
+
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str):
+        '''
+        writes metrics to given path, as JSON if path ends with `.json`, or in OpenMetrics
+        text-format otherwise
+        '''
+        with open(path, 'w') as f:
+            if path.endswith('.json'):
+                json.dump(self.as_dict(), f, indent=2)
+            else:
+                f.write(self.as_openmetrics())
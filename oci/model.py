@@ -1,12 +1,11 @@
 import collections.abc
 import dataclasses
 import enum
-import functools
+import hashlib
 import json
 import typing
 import urllib.parse
-
-import dacite
+import weakref
 
 import oci.util
 
@@ -78,6 +77,30 @@ class OciRegistryType(enum.Enum):
 
 
 class OciImageReference:
+    '''
+    immutable value-object representing an OCI image reference. References are normalised and
+    parsed lazily (once, upon first access); instances are interned (identical references passed
+    with identical `normalise` flag yield the same instance, as long as it is referenced
+    elsewhere).
+
+    Equality and hash are based on the normalised form (i.e. `alpine:3` equals
+    `registry-1.docker.io/library/alpine:3`).
+    '''
+    __slots__ = (
+        '_orig_image_reference',
+        '_normalise',
+        '_normalised_image_reference',
+        '_key',
+        '_urlparsed',
+        '_ref_without_tag',
+        '_name',
+        '_tag',
+        '_tag_type',
+        '__weakref__',
+    )
+    _interned: 'weakref.WeakValueDictionary[tuple[str, bool], OciImageReference]' = \
+        weakref.WeakValueDictionary()
+
     @staticmethod
     def to_image_ref(
         image_reference: typing.Union[str, 'OciImageReference'],
@@ -91,128 +114,154 @@ class OciImageReference:
                 normalise=normalise,
             )
 
-    def __init__(
-        self,
+    def __new__(
+        cls,
         image_reference: typing.Union[str, 'OciImageReference'],
         normalise: bool=True,
     ):
         if isinstance(image_reference, OciImageReference):
-            self._orig_image_reference = image_reference._orig_image_reference
-        elif isinstance(image_reference, str):
-            self._orig_image_reference = image_reference
-        else:
+            if image_reference._normalise == normalise:
+                return image_reference
+            image_reference = image_reference._orig_image_reference
+        elif not isinstance(image_reference, str):
             raise ValueError(image_reference)
+
+        if (self := cls._interned.get((image_reference, normalise))) is not None:
+            return self
+
+        self = super().__new__(cls)
+        self._orig_image_reference = image_reference
         self._normalise = normalise
 
+        return cls._interned.setdefault((image_reference, normalise), self)
+
+    def __getattr__(self, name: str):
+        # only called for slots which are not yet populated -> compute lazily, so that
+        # references which cannot be normalised only fail if normalised form is actually needed
+        if name == '_normalised_image_reference':
+            # raises ValueError
+            self._normalised_image_reference = oci.util.normalise_image_reference(
+                self._orig_image_reference,
+            )
+        elif name == '_key':
+            try:
+                self._key = self._normalised_image_reference
+            except ValueError:
+                # references which cannot be normalised are only equal if identical
+                self._key = self._orig_image_reference
+        elif name in ('_urlparsed', '_ref_without_tag', '_name', '_tag', '_tag_type'):
+            self._parse()
+        else:
+            raise AttributeError(name)
+
+        return object.__getattribute__(self, name)
+
+    def _parse(self):
+        img_ref = str(self)
+        if not '://' in img_ref and not img_ref.startswith('/'):
+            self._urlparsed = p = urllib.parse.urlparse(f'https://{img_ref}')
+        else:
+            self._urlparsed = p = urllib.parse.urlparse(img_ref)
+
+        path_without_digest_tag, digest_sep, digest_tag = p.path.rpartition('@')
+        if not digest_sep:
+            path_without_digest_tag = p.path
+        path_without_tag, tag_sep, tag = path_without_digest_tag.rpartition(':')
+        if not tag_sep:
+            path_without_tag = path_without_digest_tag
+
+        self._ref_without_tag = p.netloc + path_without_tag
+        self._name = path_without_tag[1:]
+
+        if digest_sep:
+            self._tag = digest_tag
+            self._tag_type = OciTagType.DIGEST
+        elif tag_sep:
+            self._tag = tag
+            self._tag_type = OciTagType.SYMBOLIC
+        else:
+            self._tag = None
+            self._tag_type = OciTagType.NO_TAG
+
     @property
     def original_image_reference(self) -> str:
         return self._orig_image_reference
 
     @property
-    @functools.cache
     def normalised_image_reference(self) -> str:
-        return oci.util.normalise_image_reference(self._orig_image_reference)
+        return self._normalised_image_reference
 
     @property
-    @functools.cache
     def netloc(self) -> str:
-        return self.urlparsed.netloc
+        return self._urlparsed.netloc
 
     @property
-    @functools.cache
     def ref_without_tag(self) -> str:
         '''
         returns the (normalised) image reference w/o the tag or digest tag.
         '''
-        p = self.urlparsed
-        name = p.netloc + p.path.rsplit('@', 1)[0].rsplit(':', 1)[0]
-
-        return name
+        return self._ref_without_tag
 
     @property
-    @functools.cache
     def name(self) -> str:
         '''
         returns the (normalised) image name (omitting api-prefix and tag)
         '''
-        p = self.urlparsed
-        name = p.path[1:].rsplit('@', 1)[0].rsplit(':', 1)[0]
-
-        return name
+        return self._name
 
     @property
-    @functools.cache
     def has_digest_tag(self) -> bool:
-        return self.tag_type is OciTagType.DIGEST
+        return self._tag_type is OciTagType.DIGEST
 
     @property
-    @functools.cache
     def has_symbolical_tag(self) -> bool:
-        return self.tag_type is OciTagType.SYMBOLIC
+        return self._tag_type is OciTagType.SYMBOLIC
 
     @property
-    @functools.cache
     def has_mixed_tag(self) -> bool:
         if not self.has_digest_tag:
             return False
 
-        p = self.urlparsed
+        p = self._urlparsed
         ref_without_digest_tag = p.netloc + p.path.rsplit('@', 1)[0]
 
         return ':' in ref_without_digest_tag
 
     @property
-    @functools.cache
     def with_symbolical_tag(self) -> 'OciImageReference':
         if not (self.has_symbolical_tag or self.has_mixed_tag):
             raise ValueError(f'does not contain a symbolical tag: {str(self)=}')
 
-        p = self.urlparsed
+        p = self._urlparsed
         return OciImageReference(
             image_reference=p.netloc + p.path.rsplit('@', 1)[0],
             normalise=self._normalise,
         )
 
     @property
-    @functools.cache
     def with_unmixed_tag(self) -> str:
         return str(self.with_tag(self.tag))
 
     @property
-    @functools.cache
     def has_tag(self):
-        return not self.tag_type is OciTagType.NO_TAG
+        return not self._tag_type is OciTagType.NO_TAG
 
     @property
-    @functools.cache
     def tag(self) -> str:
-        p = self.urlparsed
-
-        if '@' in p.path:
-            return p.path.rsplit('@', 1)[-1]
-        elif ':' in p.path:
-            return p.path.rsplit(':', 1)[-1]
-        else:
+        if self._tag is None:
             raise ValueError(f'no tag found for {str(self)}')
+        return self._tag
 
     @property
-    @functools.cache
     def tag_type(self) -> OciTagType:
-        p = self.urlparsed
-
-        if '@' in p.path:
-            return OciTagType.DIGEST
-        elif ':' in p.path:
-            return OciTagType.SYMBOLIC
-        else:
-            return OciTagType.NO_TAG
+        return self._tag_type
 
     @property
     def parsed_mixed_tag(self) -> tuple[str, str]:
         if not self.has_mixed_tag:
             raise ValueError(f'not a mixed-tag: {str(self)=}')
 
-        p = self.urlparsed
+        p = self._urlparsed
         digest_tag = p.path.rsplit('@', 1)[-1]
         symbolical_tag = p.path.rsplit('@', 1)[0].rsplit(':', 1)[-1]
         return symbolical_tag, digest_tag
@@ -232,17 +281,13 @@ class OciImageReference:
 
     @property
     def local_ref(self) -> str:
-        return self.urlparsed.path.removeprefix('/')
+        return self._urlparsed.path.removeprefix('/')
 
     @property
-    @functools.cache
     def urlparsed(self) -> urllib.parse.ParseResult:
-        if not '://' in (img_ref := str(self)) and not img_ref.startswith('/'):
-            return urllib.parse.urlparse(f'https://{img_ref}')
-        return urllib.parse.urlparse(img_ref)
+        return self._urlparsed
 
     @property
-    @functools.cache
     def registry_type(self) -> OciRegistryType:
         return OciRegistryType.from_image_ref(self)
 
@@ -274,25 +319,27 @@ class OciImageReference:
 
     def __str__(self) -> str:
         if self._normalise:
-            return self.normalised_image_reference
+            return self._normalised_image_reference
         return self._orig_image_reference
 
     def __repr__(self) -> str:
         return f'OciImageReference({str(self)})'
 
+    def __reduce__(self):
+        return OciImageReference, (self._orig_image_reference, self._normalise)
+
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+
         if not isinstance(other, OciImageReference):
             # XXX: should we return True for str with same value?
             return False
 
-        if self._orig_image_reference == other._orig_image_reference:
-            return True
-
-        return oci.util.normalise_image_reference(self._orig_image_reference) == \
-               oci.util.normalise_image_reference(other._orig_image_reference)
+        return self._key == other._key
 
     def __hash__(self):
-        return hash((self._orig_image_reference,))
+        return hash(self._key)
 
 
 class OciManifestSchemaVersion(enum.Enum):
@@ -311,6 +358,19 @@ class OciBlobRef:
     size: int
     annotations: dict | None = None
 
+    @staticmethod
+    def from_dict(raw: dict, /) -> typing.Self:
+        '''
+        deserialises blob-ref; equivalent to (but much faster than) `dacite.from_dict`, omitting
+        type-checks
+        '''
+        return OciBlobRef(
+            digest=raw['digest'],
+            mediaType=raw['mediaType'],
+            size=raw['size'],
+            annotations=raw.get('annotations'),
+        )
+
     def as_dict(self) -> dict:
         raw = dataclasses.asdict(self)
         # fields that are None should not be included in the output
@@ -353,6 +413,33 @@ class OciImageManifest:
     subject: 'OciBlobRef | None' = None
     # OCI 1.1: media-type of the artefact described by this manifest (e.g. 'application/spdx+json')
     artifactType: str | None = None
+    # octets this manifest was deserialised from (if any); not updated upon modifications
+    raw_manifest: bytes | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    @staticmethod
+    def from_dict(raw: dict, /, raw_manifest: bytes=None) -> typing.Self:
+        '''
+        deserialises manifest; equivalent to (but much faster than) `dacite.from_dict`, omitting
+        type-checks. If passed, `raw_manifest` is retained (so it can be reused, e.g. for
+        calculating or verifying the manifest's digest).
+        '''
+        manifest = OciImageManifest(
+            config=OciBlobRef.from_dict(raw['config']),
+            layers=[OciBlobRef.from_dict(layer) for layer in raw['layers']],
+            mediaType=raw.get('mediaType', OCI_MANIFEST_SCHEMA_V2_MIME),
+            schemaVersion=raw.get('schemaVersion', 2),
+            annotations=raw.get('annotations') or {},
+            subject=OciBlobRef.from_dict(subject) if (subject := raw.get('subject')) else None,
+            artifactType=raw.get('artifactType'),
+        )
+        manifest.raw_manifest = raw_manifest
+
+        return manifest
 
     def as_dict(self) -> dict:
         def layer_to_dict(layer):
@@ -420,6 +507,15 @@ class OciPlatform:
     variant: str | None = None
     features: list[str] | None = None
 
+    @staticmethod
+    def from_dict(raw: dict, /) -> typing.Self:
+        return OciPlatform(
+            architecture=raw['architecture'],
+            os=raw['os'],
+            variant=raw.get('variant'),
+            features=raw.get('features'),
+        )
+
     def as_dict(self) -> dict:
         # need custom serialisation, because some OCI registries do not like null-values
         # (must be absent instead)
@@ -453,6 +549,19 @@ class OciImageManifestListEntry(OciBlobRef):
     platform: OciPlatform | None = None
     urls: list[str] | None = None
 
+    @staticmethod
+    def from_dict(raw: dict, /) -> typing.Self:
+        return OciImageManifestListEntry(
+            digest=raw['digest'],
+            mediaType=raw['mediaType'],
+            size=raw['size'],
+            annotations=raw.get('annotations'),
+            artifactType=raw.get('artifactType'),
+            data=raw.get('data'),
+            platform=OciPlatform.from_dict(platform) if (platform := raw.get('platform')) else None,
+            urls=raw.get('urls'),
+        )
+
     def as_dict(self) -> dict:
         raw = OciBlobRef.as_dict(self)
         # platform is an optional attribute according to oci spec
@@ -475,6 +584,28 @@ class OciImageManifestList:
     mediaType: str = OCI_IMAGE_INDEX_MIME
     schemaVersion: int = 2
     annotations: dict = dataclasses.field(default_factory=dict)
+    # octets this manifest-list was deserialised from (if any); not updated upon modifications
+    raw_manifest: bytes | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    @staticmethod
+    def from_dict(raw: dict, /, raw_manifest: bytes=None) -> typing.Self:
+        '''
+        deserialises manifest-list; see `OciImageManifest.from_dict`
+        '''
+        manifest_list = OciImageManifestList(
+            manifests=[OciImageManifestListEntry.from_dict(entry) for entry in raw['manifests']],
+            mediaType=raw.get('mediaType', OCI_IMAGE_INDEX_MIME),
+            schemaVersion=raw.get('schemaVersion', 2),
+            annotations=raw.get('annotations') or {},
+        )
+        manifest_list.raw_manifest = raw_manifest
+
+        return manifest_list
 
     def as_dict(self):
         raw = {
@@ -505,8 +636,14 @@ def as_manifest(
     if isinstance(manifest, (OciImageManifest, OciImageManifestList)):
         return manifest
 
-    if isinstance(manifest, (str, bytes)):
+    if isinstance(manifest, str):
+        manifest = manifest.encode('utf-8')
+
+    if isinstance(manifest, bytes):
+        raw_manifest = manifest
         manifest = json.loads(manifest)
+    else:
+        raw_manifest = None
 
     media_type = media_type or manifest.get('mediaType')
 
@@ -514,18 +651,88 @@ def as_manifest(
         DOCKER_MANIFEST_LIST_MIME,
         OCI_IMAGE_INDEX_MIME,
     ):
-        return dacite.from_dict(
-            data_class=OciImageManifestList,
-            data=manifest,
-        )
+        return OciImageManifestList.from_dict(manifest, raw_manifest=raw_manifest)
 
     if media_type in (
         DOCKER_MANIFEST_SCHEMA_V2_MIME,
         OCI_MANIFEST_SCHEMA_V2_MIME,
     ):
-        return dacite.from_dict(
-            data_class=OciImageManifest,
-            data=manifest,
-        )
+        return OciImageManifest.from_dict(manifest, raw_manifest=raw_manifest)
 
     raise ValueError(manifest, 'unknown schema-version')
+
+
+class TrackedManifest:
+    '''
+    wraps a (deserialised) manifest or manifest-list, along w/ the octets it was deserialised from.
+
+    As long as the wrapped manifest is not patched, the original octets are retained (and used
+    for uploading), which avoids costs for re-serialisation, as well as (accidental) changes of
+    the manifest-digest (e.g. caused by different formatting). Modifications of the wrapped
+    manifest must be announced using `mark_patched`; the manifest is then re-serialised (and its
+    digest re-calculated) once needed.
+    '''
+    def __init__(
+        self,
+        manifest: OciImageManifest | OciImageManifestList,
+        raw_manifest: bytes | None=None,
+    ):
+        self.manifest = manifest
+        if raw_manifest is None:
+            raw_manifest = manifest.raw_manifest
+        self._raw_manifest = raw_manifest
+        self._digest = None
+        self._dirty = raw_manifest is None
+
+    @property
+    def dirty(self) -> bool:
+        '''
+        whether the wrapped manifest was patched (or not deserialised from octets at all)
+        '''
+        return self._dirty
+
+    def mark_patched(self):
+        self._raw_manifest = None
+        self._digest = None
+        self._dirty = True
+
+    def patch_annotations(self, annotations: dict[str, str] | None) -> bool:
+        '''
+        adds the given annotations to the wrapped manifest. To avoid unnecessary changes, the
+        manifest is only marked as patched if any annotations are new or have different values.
+        Returns whether the manifest was patched.
+        '''
+        patched = False
+
+        for k, v in (annotations or {}).items():
+            if self.manifest.annotations.get(k) == v:
+                continue
+            self.manifest.annotations[k] = v
+            patched = True
+
+        if patched:
+            self.mark_patched()
+
+        return patched
+
+    @property
+    def raw_manifest(self) -> bytes:
+        if self._raw_manifest is None:
+            self._raw_manifest = json.dumps(self.manifest.as_dict()).encode('utf-8')
+
+        return self._raw_manifest
+
+    @property
+    def hexdigest(self) -> str:
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.raw_manifest).hexdigest()
+
+        return self._digest
+
+    @property
+    def digest(self) -> str:
+        return f'sha256:{self.hexdigest}'
+
+    @property
+    def size(self) -> int:
+        return len(self.raw_manifest)
@@ -0,0 +1,336 @@
+'''
+asyncio-based replication of OCI artefacts, built on `oci.client_async.Client` (see
+`oci.replicate_artifact` for the blocking counterpart).
+
+Blobs are streamed from source- into target-registry (w/o being buffered in memory, or written
+to disk). Concurrent blob-transfers are limited per registry (see `RegistrySemaphores`), so many
+artefacts may be replicated concurrently from within a single thread.
+'''
+import asyncio
+import collections.abc
+import contextlib
+import dataclasses
+import hashlib
+import json
+import logging
+
+import aiohttp
+
+import oci
+import oci.client_async
+import oci.model as om
+
+
+logger = logging.getLogger(__name__)
+
+
+class RegistrySemaphores:
+    '''
+    limits count of concurrent blob-transfers per registry (netloc). By default, `limit`
+    concurrent transfers are allowed for each registry; `limits` may be used to configure
+    different limits for specific registries.
+
+    must only be used from within one event-loop.
+    '''
+    def __init__(
+        self,
+        limit: int=16,
+        limits: dict[str, int]=None,
+    ):
+        self.limit = limit
+        self.limits = limits or {}
+        self._semaphores = {} # {netloc: asyncio.Semaphore}
+
+    def semaphore(self, netloc: str) -> asyncio.Semaphore:
+        if not (semaphore := self._semaphores.get(netloc)):
+            semaphore = self._semaphores[netloc] = asyncio.Semaphore(
+                self.limits.get(netloc, self.limit),
+            )
+
+        return semaphore
+
+    @contextlib.asynccontextmanager
+    async def acquire(
+        self,
+        *image_references: str | om.OciImageReference,
+    ) -> collections.abc.AsyncGenerator[None, None]:
+        '''
+        acquires a slot for each distinct registry of the given image-references (in a
+        well-defined order, so concurrent callers will not deadlock)
+        '''
+        netlocs = sorted({
+            om.OciImageReference.to_image_ref(image_reference).netloc
+            for image_reference in image_references
+        })
+
+        async with contextlib.AsyncExitStack() as stack:
+            for netloc in netlocs:
+                await stack.enter_async_context(self.semaphore(netloc))
+            yield
+
+
+async def replicate_blob(
+    src_image_reference: str | om.OciImageReference,
+    tgt_image_reference: str | om.OciImageReference,
+    blob: om.OciBlobRef,
+    oci_client: oci.client_async.Client,
+    semaphores: RegistrySemaphores,
+    chunk_size: int=1024 * 1024, # 1 MiB
+):
+    '''
+    replicates the given blob from source- to target-repository, unless it is already present in
+    the target-repository. The blob is streamed from source into target.
+    '''
+    async def iter_chunks():
+        # only retrieved (lazily) if blob is absent in tgt
+        res = await oci_client.blob(
+            image_reference=src_image_reference,
+            digest=blob.digest,
+        )
+        async for chunk in res.content.iter_chunked(chunk_size):
+            yield chunk
+
+    async with semaphores.acquire(src_image_reference, tgt_image_reference):
+        await oci_client.put_blob(
+            image_reference=tgt_image_reference,
+            digest=blob.digest,
+            octets_count=blob.size,
+            data=iter_chunks(),
+        )
+
+
+async def platform(
+    image_reference: str | om.OciImageReference,
+    oci_client: oci.client_async.Client,
+    base_platform: om.OciPlatform=None,
+) -> om.OciPlatform:
+    '''
+    async variant of `oci.platform.from_single_image`
+    '''
+    manifest = await oci_client.manifest(image_reference=image_reference)
+
+    if not isinstance(manifest, om.OciImageManifest):
+        raise ValueError(f'{image_reference=} did not yield OciImageManifest: {type(manifest)=}')
+
+    if base_platform:
+        cfg = base_platform.as_dict()
+    else:
+        cfg = {}
+
+    res = await oci_client.blob(
+        image_reference=image_reference,
+        digest=manifest.config.digest,
+    )
+    cfg |= json.loads(await res.read())
+
+    return om.OciPlatform.from_dict(cfg)
+
+
+async def _put_manifest(
+    tgt_image_reference: om.OciImageReference,
+    manifest: om.TrackedManifest,
+    oci_client: oci.client_async.Client,
+) -> tuple[aiohttp.ClientResponse, om.OciImageReference, bytes]:
+    tgt_image_reference = tgt_image_reference.with_new_digest(digest=manifest.hexdigest)
+
+    res = await oci_client.put_manifest(
+        image_reference=tgt_image_reference,
+        manifest=manifest.raw_manifest,
+    )
+
+    return res, tgt_image_reference, manifest.raw_manifest
+
+
+async def replicate_artifact(
+    src_image_reference: str | om.OciImageReference,
+    tgt_image_reference: str | om.OciImageReference,
+    oci_client: oci.client_async.Client,
+    mode: oci.ReplicationMode=oci.ReplicationMode.REGISTRY_DEFAULTS,
+    platform_filter: collections.abc.Callable[[om.OciPlatform], bool]=None,
+    annotations: dict[str, str]=None,
+    semaphores: RegistrySemaphores=None,
+) -> tuple[aiohttp.ClientResponse, om.OciImageReference, bytes]:
+    '''
+    async variant of `oci.replicate_artifact` (see there for a description of replication
+    semantics). Returns the response of the manifest-upload, the target-image-reference (w/
+    updated digest, if it contains one), and the uploaded manifest.
+
+    blobs (and sub-manifests of multi-arch artefacts) are replicated concurrently; concurrent
+    blob-transfers are limited per registry using `semaphores` (which should be shared between
+    concurrent invocations; created if not passed). The manifest is uploaded after all blobs
+    (or sub-manifests) were replicated.
+
+    in contrast to `oci.replicate_artifact`, "legacy / v1" artefacts are not supported.
+    '''
+    src_image_reference = om.OciImageReference.to_image_ref(src_image_reference)
+    tgt_image_reference = om.OciImageReference.to_image_ref(tgt_image_reference)
+
+    if not semaphores:
+        semaphores = RegistrySemaphores()
+
+    # we need the unaltered - manifest for verbatim replication
+    res = await oci_client.manifest_raw(
+        image_reference=src_image_reference,
+        accept=mode.accept_header(),
+    )
+    raw_manifest = await res.read()
+    manifest_dict = json.loads(raw_manifest)
+
+    schema_version = int(manifest_dict['schemaVersion'])
+    if schema_version != 2:
+        # only support v2 for async operation
+        raise NotImplementedError(f'{schema_version=} ({src_image_reference=})')
+
+    # workaround: some manifests do not contain `mediaType`
+    #             -> fallback to Content-Type header
+    media_type = manifest_dict.get(
+        'mediaType',
+        res.headers.get('Content-Type', om.DOCKER_MANIFEST_SCHEMA_V2_MIME),
+    )
+
+    if media_type in (
+        om.DOCKER_MANIFEST_LIST_MIME,
+        om.OCI_IMAGE_INDEX_MIME,
+    ):
+        manifest = om.TrackedManifest(
+            manifest=om.OciImageManifestList.from_dict(
+                manifest_dict | {'mediaType': media_type},
+                raw_manifest=raw_manifest,
+            ),
+        )
+        manifest_list: om.OciImageManifestList = manifest.manifest
+        src_name = src_image_reference.ref_without_tag
+        tgt_name = tgt_image_reference.ref_without_tag
+
+        # only propagate PREFER_MULTIARCH (preserves nested indices); never pass
+        # NORMALISE_TO_MULTIARCH as it would wrap sub-manifests in spurious index layers
+        recursive_mode = oci.ReplicationMode.REGISTRY_DEFAULTS
+        if mode is oci.ReplicationMode.PREFER_MULTIARCH:
+            recursive_mode = oci.ReplicationMode.PREFER_MULTIARCH
+
+        async def replicate_sub_manifest(
+            sub_manifest: om.OciImageManifestListEntry,
+        ) -> om.OciImageManifestListEntry | None:
+            src_reference = f'{src_name}@{sub_manifest.digest}'
+
+            if platform_filter:
+                sub_manifest_platform = await platform(
+                    image_reference=src_reference,
+                    oci_client=oci_client,
+                    base_platform=sub_manifest.platform,
+                )
+                if not platform_filter(sub_manifest_platform):
+                    logger.info(f'skipping {sub_manifest_platform=} for {src_image_reference=}')
+                    return None
+
+            _, _, sub_manifest_bytes = await replicate_artifact(
+                src_image_reference=src_reference,
+                tgt_image_reference=tgt_name,
+                oci_client=oci_client,
+                mode=recursive_mode,
+                annotations=annotations,
+                semaphores=semaphores,
+            )
+
+            sub_manifest_digest = f'sha256:{hashlib.sha256(sub_manifest_bytes).hexdigest()}'
+            if sub_manifest_digest == sub_manifest.digest:
+                return sub_manifest
+
+            return dataclasses.replace(
+                sub_manifest,
+                digest=sub_manifest_digest,
+                size=len(sub_manifest_bytes),
+            )
+
+        # gather retains order of sub-manifests
+        replicated_manifests = await asyncio.gather(*(
+            replicate_sub_manifest(sub_manifest) for sub_manifest in manifest_list.manifests
+        ))
+
+        # try to avoid modifications (from x-serialisation) - unless we have to
+        if any(
+            replicated_manifest is not sub_manifest
+            for replicated_manifest, sub_manifest
+            in zip(replicated_manifests, manifest_list.manifests)
+        ):
+            manifest_list.manifests = [
+                replicated_manifest for replicated_manifest in replicated_manifests
+                if replicated_manifest
+            ]
+            manifest.mark_patched()
+
+        manifest.patch_annotations(annotations)
+
+        return await _put_manifest(
+            tgt_image_reference=tgt_image_reference,
+            manifest=manifest,
+            oci_client=oci_client,
+        )
+
+    if not media_type in (
+        om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        om.DOCKER_MANIFEST_SCHEMA_V2_MIME,
+    ):
+        raise NotImplementedError(f'{media_type=}')
+
+    if mode is oci.ReplicationMode.NORMALISE_TO_MULTIARCH:
+        if not src_image_reference.has_digest_tag:
+            src_image_reference = om.OciImageReference.to_image_ref(
+                await oci_client.to_digest_hash(image_reference=src_image_reference)
+            )
+
+        src_platform = await platform(
+            image_reference=src_image_reference,
+            oci_client=oci_client,
+        )
+
+        # force usage of digest-tag (symbolic tag required for manifest-list
+        _, _, manifest_bytes = await replicate_artifact(
+            src_image_reference=src_image_reference,
+            tgt_image_reference=f'{tgt_image_reference.ref_without_tag}@{src_image_reference.tag}',
+            oci_client=oci_client,
+            annotations=annotations,
+            semaphores=semaphores,
+        )
+
+        manifest_list = om.TrackedManifest(
+            manifest=om.OciImageManifestList(
+                manifests=[
+                    om.OciImageManifestListEntry(
+                        digest=f'sha256:{hashlib.sha256(manifest_bytes).hexdigest()}',
+                        mediaType=media_type,
+                        size=len(manifest_bytes),
+                        platform=src_platform,
+                    ),
+                ],
+                mediaType=om.DOCKER_MANIFEST_LIST_MIME,
+            ),
+        )
+
+        return await _put_manifest(
+            tgt_image_reference=tgt_image_reference,
+            manifest=manifest_list,
+            oci_client=oci_client,
+        )
+
+    manifest = om.TrackedManifest(
+        manifest=om.OciImageManifest.from_dict(manifest_dict, raw_manifest=raw_manifest),
+    )
+
+    await asyncio.gather(*(
+        replicate_blob(
+            src_image_reference=src_image_reference,
+            tgt_image_reference=tgt_image_reference,
+            blob=blob,
+            oci_client=oci_client,
+            semaphores=semaphores,
+        ) for blob in manifest.manifest.blobs()
+    ))
+
+    manifest.patch_annotations(annotations)
+
+    return await _put_manifest(
+        tgt_image_reference=tgt_image_reference,
+        manifest=manifest,
+        oci_client=oci_client,
+    )
@@ -48,10 +48,15 @@ try:
     import oci
     import oci.auth
     import oci.client
+    import oci.metrics
     _have_oci = True
 except ImportError:
     _have_oci = False
 
+if _have_oci:
+    # shared by all oci-clients, so metrics can be dumped after running a command
+    _metrics = oci.metrics.Metrics()
+
 
 if _have_yaml:
     _yaml_or_json_load = yaml.safe_load
@@ -213,6 +218,7 @@ def upload(parsed):
 
     oci_client = oci.client.Client(
         credentials_lookup=oci.auth.docker_credentials_lookup(),
+        metrics=_metrics,
     )
     component_descriptor = ocm.ComponentDescriptor.from_dict(_parse_yaml_or_json(parsed.file))
     component = component_descriptor.component
@@ -287,6 +293,7 @@ def download(parsed):
     cname, cversion = parsed.component.split(':')
     oci_client = oci.client.Client(
         credentials_lookup=oci.auth.docker_credentials_lookup(absent_ok=True),
+        metrics=_metrics,
     )
 
     ocm_repo = ocm.OciOcmRepository(
@@ -512,7 +519,7 @@ def download(parsed):
 
 
 def replicate(parsed):
-    ctt.__main__.replicate(parsed)
+    ctt.__main__.replicate(parsed, metrics=_metrics)
 
 
 def _traverse(parsed):
@@ -537,6 +544,7 @@ def _traverse(parsed):
         credentials_lookup=oci.auth.docker_credentials_lookup(
             docker_cfg=parsed.docker_cfg,
         ),
+        metrics=_metrics,
     )
 
     component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
@@ -674,6 +682,7 @@ def imagevector(parsed):
         credentials_lookup=oci.auth.docker_credentials_lookup(
             docker_cfg=parsed.docker_cfg,
         ),
+        metrics=_metrics,
     )
 
     component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
@@ -791,6 +800,7 @@ def helm_values(parsed):
         credentials_lookup=oci.auth.docker_credentials_lookup(
             docker_cfg=parsed.docker_cfg,
         ),
+        metrics=_metrics,
     )
 
     component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
@@ -824,6 +834,7 @@ def _normalise(parsed) -> tuple[ocm.ComponentDescriptor, str]:
         credentials_lookup=oci.auth.docker_credentials_lookup(
             docker_cfg=parsed.docker_cfg,
         ),
+        metrics=_metrics,
     )
 
     component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
@@ -933,6 +944,7 @@ def edit(parsed):
         credentials_lookup=oci.auth.docker_credentials_lookup(
             docker_cfg=parsed.docker_cfg,
         ),
+        metrics=_metrics,
     )
 
     ocm_repo = ocm.OciOcmRepository(baseUrl=parsed.ocm_repository)
@@ -1038,6 +1050,14 @@ def edit(parsed):
 
 def main():
     parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--metrics-file',
+        default=argparse.SUPPRESS,
+        help=(
+            'if passed, OCI-request-metrics are written to the given file after running command '
+            '(as JSON if filename ends with .json, in OpenMetrics text-format otherwise)'
+        ),
+    )
     maincmd_parsers = parser.add_subparsers(
         title='commands',
         required=True,
@@ -1396,6 +1416,9 @@ def main():
 
     parsed.callable(parsed)
 
+    if _have_oci and (metrics_file := getattr(parsed, 'metrics_file', None)):
+        _metrics.dump(path=metrics_file)
+
 
 if __name__ == '__main__':
     main()
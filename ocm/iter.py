@@ -1,4 +1,5 @@
 import collections.abc
+import concurrent.futures
 import dataclasses
 import enum
 
@@ -110,6 +111,7 @@ def iter(
     component_filter: collections.abc.Callable[[ocm.Component], bool]=None,
     reftype_filter: collections.abc.Callable[[NodeReferenceType], bool]=None,
     strip_component_descriptor: bool=True,
+    max_workers: int=1,
 ) -> collections.abc.Generator[Node, None, None]:
     '''
     returns a generator yielding the transitive closure of nodes accessible from the given component.
@@ -124,6 +126,9 @@ def iter(
                             dependencies; -1 will resolve w/o recursion limit, 0 will not resolve
                             component dependencies
     @param prune_unique: if true, redundant component-versions will only be traversed once
+                         (i.e. component-versions reachable via multiple paths will neither be
+                         looked-up nor expanded again, thus omitting their artefacts and
+                         references)
     @param node_filter:  use to filter emitted nodes (see Filter for predefined filters)
     @param ocm_repo:     optional OCM Repository to be used to override in the lookup
     @param component_filter: use to exclude components (and their references) from the iterator;
@@ -133,19 +138,83 @@ def iter(
                            should be filtered out
     @param strip_component_descriptor: if True, yielded nodes will contain `ocm.Component`.
                                        otherwise, `ocm.ComponentDescriptor`.
+    @param max_workers: if greater than 1, all component descriptors referenced by a component
+                        are looked-up concurrently (using a thread-pool of the given size, thus
+                        `lookup` must be thread-safe); nodes are yielded in the same order
     '''
     if strip_component_descriptor:
         component = component.component
 
-    seen_component_ids = set()
+    # component-ids of already traversed component-versions, and remaining recursion-depth of
+    # their traversal (a component-version reached again w/ greater remaining recursion-depth
+    # needs its references to be traversed again)
+    seen_component_ids: dict[ocm.ComponentIdentity, int] = {}
 
     if not lookup and not recursion_depth == 0:
         raise ValueError('lookup is required if recusion is not disabled (recursion_depth==0)')
 
+    if reftype_filter and reftype_filter(NodeReferenceType.COMPONENT_REFERENCE):
+        return # root component is regarded as being referenced "regularly"
+
+    if max_workers > 1:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        executor = None
+    # (prefetched) lookups, shared for entire traversal
+    lookups: dict[ocm.ComponentIdentity, concurrent.futures.Future] = {}
+
+    def expanded(component_id: ocm.ComponentIdentity, recursion_depth: int) -> bool:
+        if not prune_unique:
+            return False
+        if (seen_recursion_depth := seen_component_ids.get(component_id)) is None:
+            return False
+        if seen_recursion_depth < 0:
+            return True
+        return 0 <= recursion_depth <= seen_recursion_depth
+
+    def _lookup(component_id: ocm.ComponentIdentity):
+        if ocm_repo:
+            return lookup(component_id, ocm_repo)
+        return lookup(component_id)
+
+    def prefetch(component_id: ocm.ComponentIdentity) -> concurrent.futures.Future:
+        if not (future := lookups.get(component_id)):
+            future = lookups[component_id] = executor.submit(_lookup, component_id)
+        return future
+
+    def resolve(component_id: ocm.ComponentIdentity):
+        if executor:
+            component_descriptor = prefetch(component_id).result()
+        else:
+            component_descriptor = _lookup(component_id)
+
+        if strip_component_descriptor:
+            return component_descriptor.component
+        return component_descriptor
+
+    def iter_references(
+        component: ocm.Component | ocm.ComponentDescriptor,
+    ) -> collections.abc.Generator[tuple[ocm.ComponentIdentity, NodeReferenceType], None, None]:
+        for cref in component.component.componentReferences:
+            yield ocm.ComponentIdentity(
+                name=cref.componentName,
+                version=cref.version,
+            ), NodeReferenceType.COMPONENT_REFERENCE
+
+        if not (extra_crefs_label := component.component.find_label(
+            name=ocm.gardener.ExtraComponentReferencesLabel.name,
+        )):
+            return
+
+        for extra_cref in extra_crefs_label.value:
+            yield ocm.ComponentIdentity(
+                name=extra_cref['component_reference']['name'],
+                version=extra_cref['component_reference']['version'],
+            ), NodeReferenceType.EXTRA_COMPONENT_REFS_LABEL
+
     # need to nest actual iterator to keep global state of seen component-IDs
     def inner_iter(
         component: ocm.Component | ocm.ComponentDescriptor,
-        lookup: ocm.ComponentDescriptorLookup,
         recursion_depth,
         path: tuple[NodePathEntry]=(),
         reftype: NodeReferenceType=NodeReferenceType.COMPONENT_REFERENCE,
@@ -153,96 +222,75 @@ def iter(
         if component_filter and component_filter(component.component):
             return
 
-        if reftype_filter and reftype_filter(reftype):
-            return
-
         path = (*path, NodePathEntry(component, reftype))
 
-        yield ComponentNode(
-            path=path,
-        )
-
-        for resource in component.component.resources:
-            yield ResourceNode(
+        if prune_unique:
+            component_id = component.component.identity()
+            seen = component_id in seen_component_ids
+            seen_component_ids[component_id] = recursion_depth
+        else:
+            seen = False
+
+        # component-version might have been reached before w/ lower remaining recursion-depth;
+        # in this case, only references need to be traversed (again)
+        if not seen:
+            yield ComponentNode(
                 path=path,
-                resource=resource,
             )
 
-        for source in component.component.sources:
-            yield SourceNode(
-                path=path,
-                source=source,
-            )
+            for resource in component.component.resources:
+                yield ResourceNode(
+                    path=path,
+                    resource=resource,
+                )
+
+            for source in component.component.sources:
+                yield SourceNode(
+                    path=path,
+                    source=source,
+                )
 
         if recursion_depth == 0:
             return # stop resolving referenced components
         elif recursion_depth > 0:
             recursion_depth -= 1
 
-        for cref in component.component.componentReferences:
-            cref_id = ocm.ComponentIdentity(
-                name=cref.componentName,
-                version=cref.version,
-            )
-
-            if ocm_repo:
-                referenced_component_descriptor = lookup(cref_id, ocm_repo)
-            else:
-                referenced_component_descriptor = lookup(cref_id)
-
-            if strip_component_descriptor:
-                referenced_component_descriptor = referenced_component_descriptor.component
-
-            yield from inner_iter(
-                component=referenced_component_descriptor,
-                lookup=lookup,
-                recursion_depth=recursion_depth,
-                path=path,
-            )
-
-        if not (extra_crefs_label := component.component.find_label(
-            name=ocm.gardener.ExtraComponentReferencesLabel.name,
-        )):
-            return
-
-        for extra_cref in extra_crefs_label.value:
-            extra_cref_id = ocm.ComponentIdentity(
-                name=extra_cref['component_reference']['name'],
-                version=extra_cref['component_reference']['version'],
-            )
+        references = [
+            (component_id, reftype) for component_id, reftype in iter_references(component)
+            if not (reftype_filter and reftype_filter(reftype))
+        ]
 
-            if ocm_repo:
-                referenced_component_descriptor = lookup(extra_cref_id, ocm_repo)
-            else:
-                referenced_component_descriptor = lookup(extra_cref_id)
+        if executor:
+            # lookup all references concurrently; they are still traversed in order
+            for component_id, _ in references:
+                if not expanded(component_id=component_id, recursion_depth=recursion_depth):
+                    prefetch(component_id)
 
-            if strip_component_descriptor:
-                referenced_component_descriptor = referenced_component_descriptor.component
+        for component_id, reftype in references:
+            # might have been expanded meanwhile (via a previous reference)
+            if expanded(component_id=component_id, recursion_depth=recursion_depth):
+                continue
 
             yield from inner_iter(
-                component=referenced_component_descriptor,
-                lookup=lookup,
+                component=resolve(component_id),
                 recursion_depth=recursion_depth,
                 path=path,
-                reftype=NodeReferenceType.EXTRA_COMPONENT_REFS_LABEL,
+                reftype=reftype,
             )
 
-    for node in inner_iter(
-        component=component,
-        lookup=lookup,
-        recursion_depth=recursion_depth,
-        path=(),
-    ):
-        if node_filter and not node_filter(node):
-            continue
-
-        if prune_unique and isinstance(node, ComponentNode):
-            if node.component.component.identity() in seen_component_ids:
+    try:
+        for node in inner_iter(
+            component=component,
+            recursion_depth=recursion_depth,
+            path=(),
+        ):
+            if node_filter and not node_filter(node):
                 continue
-            else:
-                seen_component_ids.add(node.component_id)
 
-        yield node
+            yield node
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 def iter_resources(
@@ -253,6 +301,7 @@ def iter_resources(
     component_filter: collections.abc.Callable[[ocm.Component], bool]=None,
     reftype_filter: collections.abc.Callable[[NodeReferenceType], bool]=None,
     strip_component_descriptor: bool=True,
+    max_workers: int=1,
 ) -> collections.abc.Generator[ResourceNode, None, None]:
     '''
     curried version of `iter` w/ node-filter preset to yield only resource-nodes
@@ -266,4 +315,5 @@ def iter_resources(
         component_filter=component_filter,
         reftype_filter=reftype_filter,
         strip_component_descriptor=strip_component_descriptor,
+        max_workers=max_workers,
     )
@@ -1,3 +1,4 @@
+import asyncio
 import collections.abc
 
 import cnudie.retrieve_async
@@ -15,6 +16,7 @@ async def iter(
     ocm_repo: ocm.OcmRepository | str=None,
     component_filter: collections.abc.Callable[[ocm.Component], bool]=None,
     reftype_filter: collections.abc.Callable[[ocm.iter.NodeReferenceType], bool]=None,
+    max_concurrent_lookups: int=16,
 ) -> collections.abc.AsyncGenerator[ocm.iter.Node, None, None]:
     '''
     returns a generator yielding the transitive closure of nodes accessible from the given component.
@@ -29,6 +31,9 @@ async def iter(
                             dependencies; -1 will resolve w/o recursion limit, 0 will not resolve
                             component dependencies
     @param prune_unique: if true, redundant component-versions will only be traversed once
+                         (i.e. component-versions reachable via multiple paths will neither be
+                         looked-up nor expanded again, thus omitting their artefacts and
+                         references)
     @param node_filter:  use to filter emitted nodes (see Filter for predefined filters)
     @param ocm_repo:     optional OCM Repository to be used to override in the lookup
     @param component_filter: use to exclude components (and their references) from the iterator;
@@ -36,19 +41,75 @@ async def iter(
     @param reftype_filter: use to exclude components (and their references) from the iterator if
                            they are of a certain reference type; thereby `True` means the component
                            should be filtered out
+    @param max_concurrent_lookups: lookups for all references of a component are scheduled
+                                   concurrently (at most the given amount at a time); each
+                                   component-version is looked-up at most once. Nodes are
+                                   yielded in the same order as for sequential traversal.
     '''
     if isinstance(component, ocm.ComponentDescriptor):
         component = component.component
 
-    seen_component_ids = set()
+    # component-ids of already traversed component-versions, and remaining recursion-depth of
+    # their traversal (see `ocm.iter.iter`)
+    seen_component_ids: dict[ocm.ComponentIdentity, int] = {}
 
     if not lookup and not recursion_depth == 0:
         raise ValueError('lookup is required if recusion is not disabled (recursion_depth==0)')
 
+    if reftype_filter and reftype_filter(ocm.iter.NodeReferenceType.COMPONENT_REFERENCE):
+        return # root component is regarded as being referenced "regularly"
+
+    semaphore = asyncio.Semaphore(max_concurrent_lookups)
+    # (in-flight) lookups, shared for entire traversal
+    lookups: dict[ocm.ComponentIdentity, asyncio.Task] = {}
+
+    def expanded(component_id: ocm.ComponentIdentity, recursion_depth: int) -> bool:
+        if not prune_unique:
+            return False
+        if (seen_recursion_depth := seen_component_ids.get(component_id)) is None:
+            return False
+        if seen_recursion_depth < 0:
+            return True
+        return 0 <= recursion_depth <= seen_recursion_depth
+
+    async def _lookup(component_id: ocm.ComponentIdentity) -> ocm.ComponentDescriptor:
+        async with semaphore:
+            if ocm_repo:
+                return await lookup(component_id, ocm_repo)
+            return await lookup(component_id)
+
+    def prefetch(component_id: ocm.ComponentIdentity) -> asyncio.Task:
+        if not (task := lookups.get(component_id)):
+            task = lookups[component_id] = asyncio.create_task(_lookup(component_id))
+        return task
+
+    def iter_references(
+        component: ocm.Component,
+    ) -> collections.abc.Generator[
+        tuple[ocm.ComponentIdentity, ocm.iter.NodeReferenceType],
+        None,
+        None,
+    ]:
+        for cref in component.componentReferences:
+            yield ocm.ComponentIdentity(
+                name=cref.componentName,
+                version=cref.version,
+            ), ocm.iter.NodeReferenceType.COMPONENT_REFERENCE
+
+        if not (extra_crefs_label := component.find_label(
+            name=ocm.gardener.ExtraComponentReferencesLabel.name,
+        )):
+            return
+
+        for extra_cref in extra_crefs_label.value:
+            yield ocm.ComponentIdentity(
+                name=extra_cref['component_reference']['name'],
+                version=extra_cref['component_reference']['version'],
+            ), ocm.iter.NodeReferenceType.EXTRA_COMPONENT_REFS_LABEL
+
     # need to nest actual iterator to keep global state of seen component-IDs
     async def inner_iter(
         component: ocm.Component,
-        lookup: cnudie.retrieve_async.ComponentDescriptorLookupById,
         recursion_depth,
         path: tuple[ocm.iter.NodePathEntry]=(),
         reftype: ocm.iter.NodeReferenceType=ocm.iter.NodeReferenceType.COMPONENT_REFERENCE,
@@ -56,92 +117,78 @@ async def iter(
         if component_filter and component_filter(component):
             return
 
-        if reftype_filter and reftype_filter(reftype):
-            return
-
         path = (*path, ocm.iter.NodePathEntry(component, reftype))
 
-        yield ocm.iter.ComponentNode(
-            path=path,
-        )
+        if prune_unique:
+            component_id = component.identity()
+            seen = component_id in seen_component_ids
+            seen_component_ids[component_id] = recursion_depth
+        else:
+            seen = False
 
-        for resource in component.resources:
-            yield ocm.iter.ResourceNode(
+        if not seen:
+            yield ocm.iter.ComponentNode(
                 path=path,
-                resource=resource,
             )
 
-        for source in component.sources:
-            yield ocm.iter.SourceNode(
-                path=path,
-                source=source,
-            )
+            for resource in component.resources:
+                yield ocm.iter.ResourceNode(
+                    path=path,
+                    resource=resource,
+                )
+
+            for source in component.sources:
+                yield ocm.iter.SourceNode(
+                    path=path,
+                    source=source,
+                )
 
         if recursion_depth == 0:
             return # stop resolving referenced components
         elif recursion_depth > 0:
             recursion_depth -= 1
 
-        for cref in component.componentReferences:
-            cref_id = ocm.ComponentIdentity(
-                name=cref.componentName,
-                version=cref.version,
-            )
-
-            if ocm_repo:
-                referenced_component_descriptor = await lookup(cref_id, ocm_repo)
-            else:
-                referenced_component_descriptor = await lookup(cref_id)
+        references = [
+            (component_id, reftype) for component_id, reftype in iter_references(component)
+            if not (reftype_filter and reftype_filter(reftype))
+        ]
 
-            async for node in inner_iter(
-                component=referenced_component_descriptor.component,
-                lookup=lookup,
-                recursion_depth=recursion_depth,
-                path=path,
-            ):
-                yield node
-
-        if not (extra_crefs_label := component.find_label(
-            name=ocm.gardener.ExtraComponentReferencesLabel.name,
-        )):
-            return
+        # schedule lookups for all references; they are still traversed in order
+        for component_id, _ in references:
+            if not expanded(component_id=component_id, recursion_depth=recursion_depth):
+                prefetch(component_id)
 
-        for extra_cref in extra_crefs_label.value:
-            extra_cref_id = ocm.ComponentIdentity(
-                name=extra_cref['component_reference']['name'],
-                version=extra_cref['component_reference']['version'],
-            )
+        for component_id, reftype in references:
+            # might have been expanded meanwhile (via a previous reference)
+            if expanded(component_id=component_id, recursion_depth=recursion_depth):
+                continue
 
-            if ocm_repo:
-                referenced_component_descriptor = await lookup(extra_cref_id, ocm_repo)
-            else:
-                referenced_component_descriptor = await lookup(extra_cref_id)
+            referenced_component_descriptor = await prefetch(component_id)
 
             async for node in inner_iter(
                 component=referenced_component_descriptor.component,
-                lookup=lookup,
                 recursion_depth=recursion_depth,
                 path=path,
-                reftype=ocm.iter.NodeReferenceType.EXTRA_COMPONENT_REFS_LABEL,
+                reftype=reftype,
             ):
                 yield node
 
-    async for node in inner_iter(
-        component=component,
-        lookup=lookup,
-        recursion_depth=recursion_depth,
-        path=(),
-    ):
-        if node_filter and not node_filter(node):
-            continue
-
-        if prune_unique and isinstance(node, ocm.iter.ComponentNode):
-            if node.component.identity() in seen_component_ids:
+    try:
+        async for node in inner_iter(
+            component=component,
+            recursion_depth=recursion_depth,
+            path=(),
+        ):
+            if node_filter and not node_filter(node):
                 continue
-            else:
-                seen_component_ids.add(node.component_id)
 
-        yield node
+            yield node
+    finally:
+        for task in lookups.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception() # mark exceptions of unused lookups as retrieved
 
 
 def iter_resources(
@@ -151,6 +198,7 @@ def iter_resources(
     prune_unique: bool=True,
     component_filter: collections.abc.Callable[[ocm.Component], bool]=None,
     reftype_filter: collections.abc.Callable[[ocm.iter.NodeReferenceType], bool]=None,
+    max_concurrent_lookups: int=16,
 ) -> collections.abc.AsyncGenerator[ocm.iter.ResourceNode, None, None]:
     '''
     curried version of `iter` w/ node-filter preset to yield only resource-nodes
@@ -163,4 +211,5 @@ def iter_resources(
         node_filter=ocm.iter.Filter.resources,
         component_filter=component_filter,
         reftype_filter=reftype_filter,
+        max_concurrent_lookups=max_concurrent_lookups,
     )
@@ -0,0 +1,3 @@
+'''
+benchmark-suite for OCI replication and OCM traversal (see `test.bench.benchmarks`)
+'''
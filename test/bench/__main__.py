@@ -0,0 +1,67 @@
+'''
+runs benchmarks, and writes results as JSON:
+
+    python -m test.bench --output bench.json [--baseline previous-bench.json]
+'''
+import argparse
+import json
+import sys
+
+import test.bench.benchmarks as benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        choices=benchmarks.SCENARIOS,
+        help='scenario to run (may be passed multiple times; defaults to all)',
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='append',
+        choices=benchmarks.BENCHMARKS,
+        help='benchmark to run (may be passed multiple times; defaults to all)',
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='path to write results to (defaults to stdout)')
+    parser.add_argument('--baseline', help='path to results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+
+    parsed = parser.parse_args()
+
+    results = benchmarks.run(
+        scenarios=parsed.scenario,
+        benchmarks=parsed.benchmark,
+        repeat=parsed.repeat,
+        seed=parsed.seed,
+    )
+
+    if parsed.output:
+        with open(parsed.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if not parsed.baseline:
+        return
+
+    with open(parsed.baseline) as f:
+        baseline = json.load(f)
+
+    if (regressions := benchmarks.compare(
+        results=results,
+        baseline=baseline,
+        tolerance=parsed.tolerance,
+    )):
+        for regression in regressions:
+            print(f'regression: {regression}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,482 @@
+'''
+benchmarks for OCI replication and OCM traversal hot-paths, run against fake registries (see
+`test.bench.fake_registry`) serving synthetic content (see `test.bench.synthetic`).
+
+Results are returned as JSON-serialisable dicts. Besides wall-clock durations (which naturally
+vary between runs and machines), results contain counts of requests and transferred octets as
+observed by the fake registries, which are stable between runs (for a given scenario and
+seed), and thus well-suited for spotting regressions in review.
+'''
+import collections.abc
+import concurrent.futures
+import dataclasses
+import os
+import statistics
+import tempfile
+import time
+
+import yaml
+
+import cnudie.retrieve
+import ctt.process_dependencies
+import oci
+import ocm
+import ocm.iter
+
+import test.bench.fake_registry as fr
+import test.bench.synthetic as synthetic
+
+SRC_REGISTRY = 'src.registry.local'
+TGT_REGISTRY = 'tgt.registry.local'
+SRC_OCM_REPOSITORY = f'{SRC_REGISTRY}/ocm'
+TGT_OCM_REPOSITORY = f'{TGT_REGISTRY}/ocm'
+
+
+@dataclasses.dataclass
+class Scenario:
+    name: str
+    registry: fr.FakeRegistryConfig = dataclasses.field(default_factory=fr.FakeRegistryConfig)
+    image_count: int = 16
+    image: synthetic.ImageSpec = dataclasses.field(default_factory=synthetic.ImageSpec)
+    graph: synthetic.ComponentGraphSpec = dataclasses.field(
+        default_factory=synthetic.ComponentGraphSpec,
+    )
+    max_workers: int = 8
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario(name='baseline'),
+        Scenario(
+            name='latency',
+            registry=fr.FakeRegistryConfig(
+                latency_seconds=0.005,
+                bandwidth_octets_per_second=64 * 1024 * 1024,
+            ),
+        ),
+        Scenario(
+            name='throttled',
+            registry=fr.FakeRegistryConfig(throttle_every=7),
+        ),
+        Scenario(
+            name='multiarch',
+            image=synthetic.ImageSpec(platforms=('amd64', 'arm64', 's390x')),
+            image_count=8,
+        ),
+        Scenario(
+            name='upload-quirks',
+            registry=fr.FakeRegistryConfig(
+                single_post_upload=False,
+                chunked_upload=False,
+                relative_locations=False,
+            ),
+            image=synthetic.ImageSpec(layer_count=2, layer_size=2 * 1024 * 1024),
+            image_count=4,
+        ),
+        Scenario(
+            # many paths to the same component-versions (as typical for "landscape" components)
+            name='diamonds',
+            graph=synthetic.ComponentGraphSpec(
+                width=8,
+                depth=4,
+                fan_out=4,
+                images_per_component=2,
+                image=synthetic.ImageSpec(layer_count=1, layer_size=1024),
+            ),
+            image_count=1,
+        ),
+    )
+}
+
+
+@dataclasses.dataclass
+class _Environment:
+    registries: dict[str, fr.FakeRegistry]
+    oci_client: 'oci.client.Client'
+    tmp_dir: str
+
+
+def _src_image_references(scenario: Scenario) -> list[str]:
+    return [
+        f'{SRC_REGISTRY}/images/image-{idx}:1.0.0'
+        for idx in range(scenario.image_count)
+    ]
+
+
+def _setup_images(env: _Environment, scenario: Scenario, seed: int):
+    src_registry = env.registries[SRC_REGISTRY]
+    for image_reference in _src_image_references(scenario=scenario):
+        image_reference = oci.model.OciImageReference(image_reference)
+        synthetic.put_image(
+            registry=src_registry,
+            name=image_reference.name,
+            tag=image_reference.tag,
+            spec=scenario.image,
+            seed=seed,
+        )
+
+
+def _setup_component_graph(env: _Environment, scenario: Scenario, seed: int) -> ocm.Component:
+    components = synthetic.component_graph(
+        spec=scenario.graph,
+        image_registry=SRC_REGISTRY,
+    )
+    synthetic.put_component_graph(
+        components=components,
+        registries={SRC_REGISTRY: env.registries[SRC_REGISTRY]},
+        ocm_repository=SRC_OCM_REPOSITORY,
+        image=scenario.graph.image,
+        seed=seed,
+    )
+    return components[0]
+
+
+def _replicate_images(env: _Environment, scenario: Scenario) -> int:
+    def replicate(src_image_reference: str):
+        oci.replicate_artifact(
+            src_image_reference=src_image_reference,
+            tgt_image_reference=src_image_reference.replace(SRC_REGISTRY, TGT_REGISTRY, 1),
+            oci_client=env.oci_client,
+            mode=oci.ReplicationMode.PREFER_MULTIARCH,
+        )
+
+    image_references = _src_image_references(scenario=scenario)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=scenario.max_workers) as executor:
+        for _ in executor.map(replicate, image_references):
+            pass
+
+    return len(image_references)
+
+
+def bench_replicate_artifact(env: _Environment, scenario: Scenario, seed: int):
+    _setup_images(env=env, scenario=scenario, seed=seed)
+
+    return lambda: _replicate_images(env=env, scenario=scenario)
+
+
+def bench_replicate_artifact_existing(env: _Environment, scenario: Scenario, seed: int):
+    '''
+    replication of artefacts already present in target (i.e. the common case for recurring
+    replications)
+    '''
+    _setup_images(env=env, scenario=scenario, seed=seed)
+    _replicate_images(env=env, scenario=scenario)
+
+    return lambda: _replicate_images(env=env, scenario=scenario)
+
+
+def bench_process_images(env: _Environment, scenario: Scenario, seed: int):
+    root_component = _setup_component_graph(env=env, scenario=scenario, seed=seed)
+
+    processing_cfg_path = os.path.join(env.tmp_dir, 'processing.cfg')
+    with open(processing_cfg_path, 'w') as f:
+        yaml.safe_dump({
+            'targets': {
+                'tgt': {
+                    'type': 'RegistriesTarget',
+                    'kwargs': {
+                        'registries': [TGT_REGISTRY],
+                        'ocm_repository': TGT_OCM_REPOSITORY,
+                    },
+                },
+            },
+            'processors': {
+                'no-op': {'type': 'NoOpProcessor'},
+            },
+            'uploaders': {
+                'prepend-target': {
+                    'type': 'PrependTargetUploader',
+                    'kwargs': {'remove_prefixes': [SRC_REGISTRY]},
+                },
+            },
+            'image_processing_cfg': [{
+                'name': 'default',
+                'filter': [{'type': 'MatchAllFilter'}],
+                'processor': 'no-op',
+                'target': 'tgt',
+                'upload': ['prepend-target'],
+            }],
+        }, f)
+
+    def process_images() -> int:
+        component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
+            ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(SRC_OCM_REPOSITORY),
+            oci_client=env.oci_client,
+            fallback_to_service_mapping=False,
+        )
+
+        return sum(1 for _ in ctt.process_dependencies.process_images(
+            processing_cfg_path=processing_cfg_path,
+            root_component_descriptor=component_descriptor_lookup(root_component.identity()),
+            component_descriptor_lookup=component_descriptor_lookup,
+            oci_client=env.oci_client,
+            max_workers=scenario.max_workers,
+        ))
+
+    return process_images
+
+
+def bench_cnudie_lookup(env: _Environment, scenario: Scenario, seed: int):
+    '''
+    uncached retrieval of all component descriptors of the component graph
+    '''
+    root_component = _setup_component_graph(env=env, scenario=scenario, seed=seed)
+    component_ids = [
+        node.component.identity() for node in ocm.iter.iter(
+            component=root_component,
+            lookup=cnudie.retrieve.oci_component_descriptor_lookup(
+                ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(SRC_OCM_REPOSITORY),
+                oci_client=env.oci_client,
+            ),
+            node_filter=ocm.iter.Filter.components,
+        )
+    ]
+
+    def lookup() -> int:
+        component_descriptor_lookup = cnudie.retrieve.oci_component_descriptor_lookup(
+            ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(SRC_OCM_REPOSITORY),
+            oci_client=env.oci_client,
+        )
+        for component_id in component_ids:
+            component_descriptor_lookup(component_id)
+
+        return len(component_ids)
+
+    return lookup
+
+
+def bench_cnudie_lookup_multi_repository(env: _Environment, scenario: Scenario, seed: int):
+    '''
+    repeated retrieval of all component descriptors of the component graph (plus absent versions
+    thereof) using the default (composite) lookup, w/ component descriptors only being present in
+    the last of multiple OCM repositories
+    '''
+    root_component = _setup_component_graph(env=env, scenario=scenario, seed=seed)
+    ocm_repository_lookup = cnudie.retrieve.ocm_repository_lookup(
+        f'{SRC_REGISTRY}/ocm-empty-0',
+        f'{SRC_REGISTRY}/ocm-empty-1',
+        SRC_OCM_REPOSITORY,
+    )
+    component_ids = [
+        node.component.identity() for node in ocm.iter.iter(
+            component=root_component,
+            lookup=cnudie.retrieve.oci_component_descriptor_lookup(
+                ocm_repository_lookup=ocm_repository_lookup,
+                oci_client=env.oci_client,
+            ),
+            node_filter=ocm.iter.Filter.components,
+        )
+    ]
+    component_ids += [
+        dataclasses.replace(component_id, version='0.0.0-absent')
+        for component_id in component_ids
+    ]
+
+    def lookup() -> int:
+        component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
+            ocm_repository_lookup=ocm_repository_lookup,
+            oci_client=env.oci_client,
+            default_absent_ok=True,
+            fallback_to_service_mapping=False,
+            negative_cache=cnudie.retrieve.NegativeCache(),
+        )
+        for _ in range(3):
+            for component_id in component_ids:
+                component_descriptor_lookup(component_id)
+
+        return 3 * len(component_ids)
+
+    return lookup
+
+
+def bench_ocm_iter(env: _Environment, scenario: Scenario, seed: int):
+    '''
+    traversal of the component graph (using an in-memory-cached, registry-backed lookup)
+    '''
+    root_component = _setup_component_graph(env=env, scenario=scenario, seed=seed)
+
+    def iterate() -> int:
+        component_descriptor_lookup = cnudie.retrieve.create_default_component_descriptor_lookup(
+            ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(SRC_OCM_REPOSITORY),
+            oci_client=env.oci_client,
+            fallback_to_service_mapping=False,
+        )
+        return sum(1 for _ in ocm.iter.iter(
+            component=root_component,
+            lookup=component_descriptor_lookup,
+        ))
+
+    return iterate
+
+
+def bench_ocm_iter_uncached(
+    env: _Environment,
+    scenario: Scenario,
+    seed: int,
+    max_workers: int=1,
+):
+    '''
+    traversal of the component graph using an uncached, registry-backed lookup (so registry
+    requests reflect count of lookups)
+    '''
+    root_component = _setup_component_graph(env=env, scenario=scenario, seed=seed)
+
+    def iterate() -> int:
+        component_descriptor_lookup = cnudie.retrieve.oci_component_descriptor_lookup(
+            ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(SRC_OCM_REPOSITORY),
+            oci_client=env.oci_client,
+        )
+        return sum(1 for _ in ocm.iter.iter(
+            component=root_component,
+            lookup=component_descriptor_lookup,
+            max_workers=max_workers,
+        ))
+
+    return iterate
+
+
+def bench_ocm_iter_prefetch(env: _Environment, scenario: Scenario, seed: int):
+    '''
+    same as `bench_ocm_iter_uncached`, but w/ concurrent prefetching of referenced components
+    '''
+    return bench_ocm_iter_uncached(
+        env=env,
+        scenario=scenario,
+        seed=seed,
+        max_workers=scenario.max_workers,
+    )
+
+
+BENCHMARKS = {
+    'replicate-artifact': bench_replicate_artifact,
+    'replicate-artifact-existing': bench_replicate_artifact_existing,
+    'process-images': bench_process_images,
+    'cnudie-lookup': bench_cnudie_lookup,
+    'cnudie-lookup-multi-repository': bench_cnudie_lookup_multi_repository,
+    'ocm-iter': bench_ocm_iter,
+    'ocm-iter-uncached': bench_ocm_iter_uncached,
+    'ocm-iter-prefetch': bench_ocm_iter_prefetch,
+}
+
+
+def run_benchmark(
+    benchmark: collections.abc.Callable,
+    scenario: Scenario,
+    repeat: int=3,
+    seed: int=0,
+) -> dict:
+    '''
+    runs the given benchmark `repeat` times (each time against fresh registries). Registry
+    statistics are reported from the first run.
+    '''
+    durations = []
+    registry_stats = None
+    items = None
+
+    for _ in range(repeat):
+        registries = {
+            SRC_REGISTRY: fr.FakeRegistry(config=scenario.registry),
+            TGT_REGISTRY: fr.FakeRegistry(config=scenario.registry),
+        }
+        for registry in registries.values():
+            registry.start()
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                env = _Environment(
+                    registries=registries,
+                    oci_client=fr.client(registries=registries),
+                    tmp_dir=tmp_dir,
+                )
+                run = benchmark(env=env, scenario=scenario, seed=seed)
+                for registry in registries.values():
+                    registry.reset_stats()
+
+                started_at = time.perf_counter()
+                items = run()
+                durations.append(time.perf_counter() - started_at)
+        finally:
+            for registry in registries.values():
+                registry.stop()
+
+        if registry_stats is None:
+            registry_stats = {
+                netloc: registry.stats.as_dict()
+                for netloc, registry in registries.items()
+            }
+
+    return {
+        'items': items,
+        'seconds': {
+            'min': round(min(durations), 4),
+            'median': round(statistics.median(durations), 4),
+            'max': round(max(durations), 4),
+        },
+        'registries': registry_stats,
+    }
+
+
+def run(
+    scenarios: collections.abc.Iterable[str]=None,
+    benchmarks: collections.abc.Iterable[str]=None,
+    repeat: int=3,
+    seed: int=0,
+) -> dict:
+    scenarios = list(scenarios or SCENARIOS)
+    benchmarks = list(benchmarks or BENCHMARKS)
+
+    return {
+        'repeat': repeat,
+        'seed': seed,
+        'scenarios': {
+            scenario_name: {
+                'config': dataclasses.asdict(SCENARIOS[scenario_name]),
+                'results': {
+                    benchmark_name: run_benchmark(
+                        benchmark=BENCHMARKS[benchmark_name],
+                        scenario=SCENARIOS[scenario_name],
+                        repeat=repeat,
+                        seed=seed,
+                    ) for benchmark_name in benchmarks
+                },
+            } for scenario_name in scenarios
+        },
+    }
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    tolerance: float=0.2,
+) -> list[str]:
+    '''
+    compares results against baseline-results. Returns a list of regressions (median durations
+    exceeding baseline by more than `tolerance`, or increased counts of requests or transferred
+    octets).
+    '''
+    regressions = []
+
+    for scenario_name, scenario in results['scenarios'].items():
+        if not (baseline_scenario := baseline['scenarios'].get(scenario_name)):
+            continue
+
+        for benchmark_name, result in scenario['results'].items():
+            if not (baseline_result := baseline_scenario['results'].get(benchmark_name)):
+                continue
+            prefix = f'{scenario_name}/{benchmark_name}'
+
+            median = result['seconds']['median']
+            baseline_median = baseline_result['seconds']['median']
+            if median > baseline_median * (1 + tolerance):
+                regressions.append(f'{prefix}: median {baseline_median}s -> {median}s')
+
+            for netloc, stats in result['registries'].items():
+                if not (baseline_stats := baseline_result['registries'].get(netloc)):
+                    continue
+                for key in ('requests_total', 'octets_received', 'octets_sent'):
+                    if stats[key] > baseline_stats[key]:
+                        regressions.append(
+                            f'{prefix}: {netloc} {key} {baseline_stats[key]} -> {stats[key]}'
+                        )
+
+    return regressions
@@ -0,0 +1,557 @@
+'''
+hermetic, in-process stand-in for an OCI registry (implementing the subset of the
+distribution-spec used by `oci.client.Client`), w/ configurable latency, bandwidth, throttling
+(429-injection), and upload-quirks of real-world registries.
+
+    with FakeRegistry(config=FakeRegistryConfig(latency_seconds=0.01)) as registry:
+        oci_client = client(registries={'example.org': registry})
+        ...
+
+Content is kept in memory. Blobs are shared between all repositories (so cross-repository
+mounts succeed for any present blob). Several (logical) registries may be served by distinct
+`FakeRegistry` instances, which are mapped to image-reference-netlocs using `routes`.
+'''
+import collections
+import dataclasses
+import hashlib
+import http.server
+import json
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+
+import oci.client
+import oci.metrics
+import oci.model as om
+
+
+@dataclasses.dataclass
+class FakeRegistryConfig:
+    '''
+    :param latency_seconds: delay before each response is sent
+    :param bandwidth_octets_per_second: limits transfer-rate of request- and response-bodies (per
+        connection); unlimited if not set
+    :param throttle_every: if set, every n-th request is rejected w/ HTTP 429
+    :param retry_after_seconds: value of `Retry-After` header sent w/ injected 429-responses
+    :param single_post_upload: if false, monolithic uploads (POST w/ digest) are ignored, and an
+        upload-session is started instead (HTTP 202), as done e.g. by registry-1.docker.io
+    :param chunked_upload: if false, PATCH-requests for chunked uploads are rejected
+    :param max_chunk_size: if set, PATCH-requests w/ larger bodies are rejected w/ HTTP 413
+    :param relative_locations: whether `Location` headers are relative or absolute urls
+    :param honour_tags_last: whether `last` query-parameter is honoured for tag-listings
+    '''
+    latency_seconds: float = 0
+    bandwidth_octets_per_second: int | None = None
+    throttle_every: int | None = None
+    retry_after_seconds: int = 0
+    single_post_upload: bool = True
+    chunked_upload: bool = True
+    max_chunk_size: int | None = None
+    relative_locations: bool = True
+    honour_tags_last: bool = True
+
+
+@dataclasses.dataclass
+class FakeRegistryStats:
+    requests: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+    throttled: int = 0
+    octets_received: int = 0
+    octets_sent: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': {
+                f'{method} {operation}': count
+                for (method, operation), count in sorted(self.requests.items())
+            },
+            'requests_total': sum(self.requests.values()),
+            'throttled': self.throttled,
+            'octets_received': self.octets_received,
+            'octets_sent': self.octets_sent,
+        }
+
+
+_path_pattern = re.compile(
+    r'^/v2/(?P<name>.+?)/('
+    r'manifests/(?P<reference>[^/]+)'
+    r'|blobs/uploads/(?P<upload>[^/]*)'
+    r'|blobs/(?P<digest>[^/]+)'
+    r'|tags/list'
+    r'|referrers/(?P<subject>[^/]+)'
+    r')$'
+)
+
+
+def _digest(octets: bytes) -> str:
+    return f'sha256:{hashlib.sha256(octets).hexdigest()}'
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def log_message(self, format, *args):
+        pass # silence access-log
+
+    @property
+    def registry(self) -> 'FakeRegistry':
+        return self.server.registry
+
+    @property
+    def config(self) -> FakeRegistryConfig:
+        return self.server.registry.config
+
+    def _throttle(self, octets_count: int):
+        if (bandwidth := self.config.bandwidth_octets_per_second):
+            time.sleep(octets_count / bandwidth)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while (chunk_size := int(self.rfile.readline().split(b';')[0], 16)):
+                chunks.append(self.rfile.read(chunk_size))
+                self.rfile.readline() # CRLF
+            while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                pass # trailers
+            body = b''.join(chunks)
+        else:
+            octets_left = int(self.headers.get('Content-Length') or 0)
+            chunks = []
+            while octets_left > 0:
+                chunk = self.rfile.read(min(octets_left, 64 * 1024))
+                if not chunk:
+                    break
+                self._throttle(len(chunk))
+                chunks.append(chunk)
+                octets_left -= len(chunk)
+            body = b''.join(chunks)
+
+        with self.registry.lock:
+            self.registry.stats.octets_received += len(body)
+
+        return body
+
+    def _respond(
+        self,
+        status: int,
+        body: bytes=b'',
+        headers: dict=None,
+        send_body: bool=True,
+    ):
+        self.send_response(status)
+        headers = headers or {}
+        headers.setdefault('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if not send_body or not body:
+            return
+
+        for idx in range(0, len(body), 64 * 1024):
+            chunk = body[idx:idx + 64 * 1024]
+            self._throttle(len(chunk))
+            self.wfile.write(chunk)
+
+        with self.registry.lock:
+            self.registry.stats.octets_sent += len(body)
+
+    def _error(self, status: int, code: str, send_body: bool=True):
+        self._respond(
+            status=status,
+            body=json.dumps({'errors': [{'code': code}]}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            send_body=send_body,
+        )
+
+    def _location(self, path: str) -> str:
+        if self.config.relative_locations:
+            return path
+        return f'http://{self.registry.netloc}{path}'
+
+    def _handle(self):
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        method = self.command
+
+        with self.registry.lock:
+            stats = self.registry.stats
+            stats.requests[(method, oci.metrics.operation(url.path))] += 1
+            request_count = sum(stats.requests.values())
+            throttle = (
+                (throttle_every := self.config.throttle_every)
+                and request_count % throttle_every == 0
+            )
+            if throttle:
+                stats.throttled += 1
+
+        if self.config.latency_seconds:
+            time.sleep(self.config.latency_seconds)
+
+        body = self._read_body()
+
+        if throttle:
+            return self._respond(
+                status=429,
+                headers={'Retry-After': str(self.config.retry_after_seconds)},
+            )
+
+        if url.path in ('/v2', '/v2/'):
+            return self._respond(status=200)
+
+        if not (match := _path_pattern.match(url.path)):
+            return self._error(status=404, code='NAME_UNKNOWN')
+
+        name = match.group('name')
+
+        if (reference := match.group('reference')):
+            return self._handle_manifest(method=method, name=name, reference=reference, body=body)
+
+        if match.group('upload') is not None:
+            return self._handle_upload(
+                method=method,
+                name=name,
+                upload_id=match.group('upload'),
+                query=query,
+                body=body,
+            )
+
+        if (digest := match.group('digest')):
+            return self._handle_blob(method=method, digest=digest)
+
+        if match.group('subject'):
+            return self._error(status=404, code='UNSUPPORTED')
+
+        return self._handle_tags(name=name, query=query)
+
+    def _handle_manifest(self, method: str, name: str, reference: str, body: bytes):
+        registry = self.registry
+
+        if method == 'PUT':
+            registry.put_manifest(
+                name=name,
+                reference=reference,
+                manifest=body,
+                media_type=self.headers.get('Content-Type'),
+            )
+            return self._respond(
+                status=201,
+                headers={
+                    'Docker-Content-Digest': _digest(body),
+                    'Location': self._location(f'/v2/{name}/manifests/{_digest(body)}'),
+                },
+            )
+
+        with registry.lock:
+            entry = registry.manifests.get((name, reference))
+
+        if not entry:
+            return self._error(status=404, code='MANIFEST_UNKNOWN', send_body=method != 'HEAD')
+
+        if method == 'DELETE':
+            with registry.lock:
+                registry.manifests.pop((name, reference), None)
+            return self._respond(status=202)
+
+        manifest, media_type = entry
+        return self._respond(
+            status=200,
+            body=manifest,
+            headers={
+                'Content-Type': media_type,
+                'Docker-Content-Digest': _digest(manifest),
+            },
+            send_body=method != 'HEAD',
+        )
+
+    def _handle_blob(self, method: str, digest: str):
+        with self.registry.lock:
+            blob = self.registry.blobs.get(digest)
+
+        if blob is None:
+            return self._error(status=404, code='BLOB_UNKNOWN', send_body=method != 'HEAD')
+
+        if method == 'DELETE':
+            with self.registry.lock:
+                self.registry.blobs.pop(digest, None)
+            return self._respond(status=202)
+
+        status = 200
+        headers = {
+            'Content-Type': 'application/octet-stream',
+            'Docker-Content-Digest': digest,
+        }
+
+        if (octets_range := self.headers.get('Range')) and octets_range.startswith('bytes='):
+            start, end = octets_range.removeprefix('bytes=').split('-')
+            start = int(start)
+            end = int(end) if end else len(blob) - 1
+            headers['Content-Range'] = f'bytes {start}-{end}/{len(blob)}'
+            blob = blob[start:end + 1]
+            status = 206
+
+        return self._respond(
+            status=status,
+            body=blob,
+            headers=headers,
+            send_body=method != 'HEAD',
+        )
+
+    def _handle_upload(
+        self,
+        method: str,
+        name: str,
+        upload_id: str,
+        query: dict,
+        body: bytes,
+    ):
+        registry = self.registry
+
+        def upload_location(upload_id: str) -> str:
+            return self._location(f'/v2/{name}/blobs/uploads/{upload_id}')
+
+        def upload_range(upload: bytearray) -> str:
+            return f'0-{max(len(upload) - 1, 0)}'
+
+        if method == 'POST':
+            if (mount := query.get('mount')):
+                with registry.lock:
+                    mounted = mount[0] in registry.blobs
+                if mounted:
+                    return self._respond(
+                        status=201,
+                        headers={
+                            'Docker-Content-Digest': mount[0],
+                            'Location': self._location(f'/v2/{name}/blobs/{mount[0]}'),
+                        },
+                    )
+            elif (digest := query.get('digest')) and self.config.single_post_upload:
+                if _digest(body) != digest[0]:
+                    return self._error(status=400, code='DIGEST_INVALID')
+                registry.put_blob(octets=body)
+                return self._respond(
+                    status=201,
+                    headers={
+                        'Docker-Content-Digest': digest[0],
+                        'Location': self._location(f'/v2/{name}/blobs/{digest[0]}'),
+                    },
+                )
+
+            upload_id = str(uuid.uuid4())
+            with registry.lock:
+                registry.uploads[upload_id] = bytearray()
+            return self._respond(
+                status=202,
+                headers={
+                    'Location': upload_location(upload_id),
+                    'Range': '0-0',
+                    'Docker-Upload-UUID': upload_id,
+                },
+            )
+
+        with registry.lock:
+            upload = registry.uploads.get(upload_id)
+
+        if upload is None:
+            return self._error(status=404, code='BLOB_UPLOAD_UNKNOWN')
+
+        if method == 'GET':
+            return self._respond(
+                status=204,
+                headers={
+                    'Location': upload_location(upload_id),
+                    'Range': upload_range(upload),
+                },
+            )
+
+        if method == 'PATCH':
+            if not self.config.chunked_upload:
+                return self._error(status=400, code='BLOB_UPLOAD_INVALID')
+            if (max_chunk_size := self.config.max_chunk_size) and len(body) > max_chunk_size:
+                return self._error(status=413, code='SIZE_INVALID')
+            if (content_range := self.headers.get('Content-Range')):
+                start = int(content_range.split('-')[0])
+                if start != len(upload):
+                    return self._respond(
+                        status=416,
+                        headers={
+                            'Location': upload_location(upload_id),
+                            'Range': upload_range(upload),
+                        },
+                    )
+            upload.extend(body)
+            return self._respond(
+                status=202,
+                headers={
+                    'Location': upload_location(upload_id),
+                    'Range': upload_range(upload),
+                },
+            )
+
+        if method == 'PUT':
+            upload.extend(body)
+            digest = query['digest'][0]
+            if _digest(bytes(upload)) != digest:
+                return self._error(status=400, code='DIGEST_INVALID')
+
+            registry.put_blob(octets=bytes(upload))
+            with registry.lock:
+                registry.uploads.pop(upload_id, None)
+
+            return self._respond(
+                status=201,
+                headers={
+                    'Docker-Content-Digest': digest,
+                    'Location': self._location(f'/v2/{name}/blobs/{digest}'),
+                },
+            )
+
+        if method == 'DELETE':
+            with registry.lock:
+                registry.uploads.pop(upload_id, None)
+            return self._respond(status=204)
+
+        return self._error(status=405, code='UNSUPPORTED')
+
+    def _handle_tags(self, name: str, query: dict):
+        with self.registry.lock:
+            tags = sorted(
+                reference for repository, reference in self.registry.manifests
+                if repository == name and not reference.startswith('sha256:')
+            )
+
+        if (last := query.get('last')) and self.config.honour_tags_last:
+            tags = [tag for tag in tags if tag > last[0]]
+
+        headers = {'Content-Type': 'application/json'}
+        if (n := query.get('n')) and len(tags) > int(n[0]):
+            tags = tags[:int(n[0])]
+            headers['Link'] = f'</v2/{name}/tags/list?n={n[0]}&last={tags[-1]}>; rel="next"'
+
+        return self._respond(
+            status=200,
+            body=json.dumps({'name': name, 'tags': tags}).encode('utf-8'),
+            headers=headers,
+        )
+
+    do_GET = _handle
+    do_HEAD = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_PATCH = _handle
+    do_DELETE = _handle
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    registry: 'FakeRegistry'
+
+
+class FakeRegistry:
+    '''
+    OCI registry served from a background-thread, listening on a random port of the loopback
+    interface. Use as context-manager (or call `start` and `stop`).
+    '''
+    def __init__(self, config: FakeRegistryConfig=None):
+        self.config = config or FakeRegistryConfig()
+        self.manifests = {} # {(name, tag-or-digest): (manifest, media-type)}
+        self.blobs = {} # {digest: octets}
+        self.uploads = {} # {upload-id: bytearray}
+        self.stats = FakeRegistryStats()
+        self.lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def netloc(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'{host}:{port}'
+
+    @property
+    def base_url(self) -> str:
+        return f'http://{self.netloc}/v2/'
+
+    def start(self) -> 'FakeRegistry':
+        self._server = _Server(('127.0.0.1', 0), _RequestHandler)
+        self._server.registry = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> 'FakeRegistry':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = FakeRegistryStats()
+
+    def put_blob(self, octets: bytes) -> str:
+        digest = _digest(octets)
+        with self.lock:
+            self.blobs[digest] = octets
+        return digest
+
+    def put_manifest(
+        self,
+        name: str,
+        reference: str,
+        manifest: bytes,
+        media_type: str=None,
+    ) -> str:
+        '''
+        stores manifest (always addressable by its digest, and additionally by `reference`, if it
+        is a symbolic tag); returns manifest-digest
+        '''
+        if not media_type:
+            media_type = json.loads(manifest).get('mediaType', om.OCI_MANIFEST_SCHEMA_V2_MIME)
+
+        digest = _digest(manifest)
+        with self.lock:
+            self.manifests[(name, digest)] = (manifest, media_type)
+            self.manifests[(name, reference)] = (manifest, media_type)
+        return digest
+
+
+def routes(registries: dict[str, FakeRegistry]) -> oci.client.OciRoutes:
+    '''
+    returns routes mapping the given netlocs to the respective fake registries
+    '''
+    def base_api_url(image_reference: str) -> str:
+        netloc = om.OciImageReference.to_image_ref(image_reference).netloc
+        return registries[netloc].base_url
+
+    return oci.client.OciRoutes(base_api_url_lookup=base_api_url)
+
+
+def client(
+    registries: dict[str, FakeRegistry],
+    **kwargs,
+) -> oci.client.Client:
+    '''
+    returns an OCI client for the given fake registries (using anonymous basic-auth; retries are
+    not delayed, unless requested by registries using `Retry-After`)
+    '''
+    kwargs.setdefault('default_backoff_base_seconds', 0)
+    oci_client = oci.client.Client(
+        routes=routes(registries=registries),
+        **kwargs,
+    )
+
+    for netloc in registries:
+        oci_client.token_cache.set_auth_method(
+            image_reference=netloc,
+            auth_method=oci.client.AuthMethod.BASIC,
+        )
+
+    return oci_client
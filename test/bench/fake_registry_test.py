@@ -0,0 +1,102 @@
+import pytest
+import requests
+
+import oci
+import oci.client
+
+import test.bench.benchmarks as benchmarks
+import test.bench.fake_registry as fr
+import test.bench.synthetic as synthetic
+
+
+def test_replicate_artifact_with_quirks():
+    src_registry = fr.FakeRegistry()
+    tgt_registry = fr.FakeRegistry(config=fr.FakeRegistryConfig(
+        throttle_every=5,
+        single_post_upload=False,
+        max_chunk_size=128 * 1024,
+        relative_locations=False,
+    ))
+
+    with src_registry, tgt_registry:
+        synthetic.put_image(
+            registry=src_registry,
+            name='foo',
+            tag='1.2.3',
+            spec=synthetic.ImageSpec(
+                layer_count=1,
+                layer_size=1536 * 1024, # chunked uploads are only used for blobs > 1 MiB
+                platforms=('amd64', 'arm64'),
+            ),
+        )
+        oci_client = fr.client(
+            registries={'src.example.org': src_registry, 'tgt.example.org': tgt_registry},
+            blob_upload_mode=oci.client.BlobUploadMode.CHUNKED,
+            blob_upload_chunk_size=256 * 1024,
+        )
+
+        # too large chunks are rejected; max chunk-size is remembered for subsequent uploads
+        with pytest.raises(requests.exceptions.HTTPError):
+            oci.replicate_artifact(
+                src_image_reference='src.example.org/foo:1.2.3',
+                tgt_image_reference='tgt.example.org/foo:1.2.3',
+                oci_client=oci_client,
+                mode=oci.ReplicationMode.PREFER_MULTIARCH,
+            )
+        assert oci_client.capabilities_cache.capabilities(
+            image_reference='tgt.example.org/foo',
+        ).max_chunk_size == 128 * 1024
+
+        oci.replicate_artifact(
+            src_image_reference='src.example.org/foo:1.2.3',
+            tgt_image_reference='tgt.example.org/foo:1.2.3',
+            oci_client=oci_client,
+            mode=oci.ReplicationMode.PREFER_MULTIARCH,
+        )
+
+        assert tgt_registry.blobs == src_registry.blobs
+        assert tgt_registry.manifests[('foo', '1.2.3')] == src_registry.manifests[('foo', '1.2.3')]
+        assert tgt_registry.stats.throttled > 0
+
+        # blobs present in target must not be transferred again
+        tgt_registry.reset_stats()
+        oci.replicate_artifact(
+            src_image_reference='src.example.org/foo:1.2.3',
+            tgt_image_reference='tgt.example.org/foo:1.2.3',
+            oci_client=oci_client,
+            mode=oci.ReplicationMode.PREFER_MULTIARCH,
+        )
+        assert tgt_registry.stats.octets_received < 1024 * 1024
+
+
+def test_benchmarks():
+    scenario = benchmarks.Scenario(
+        name='test',
+        image_count=2,
+        image=synthetic.ImageSpec(layer_count=1, layer_size=1024),
+        graph=synthetic.ComponentGraphSpec(width=2, depth=2, images_per_component=1),
+    )
+
+    results = {
+        'scenarios': {
+            'test': {
+                'results': {
+                    name: benchmarks.run_benchmark(
+                        benchmark=benchmark,
+                        scenario=scenario,
+                        repeat=1,
+                    ) for name, benchmark in benchmarks.BENCHMARKS.items()
+                },
+            },
+        },
+    }
+
+    results_by_name = results['scenarios']['test']['results']
+    assert results_by_name['replicate-artifact']['items'] == 2
+    # root + 2 layers of 2 components
+    assert results_by_name['cnudie-lookup']['items'] == 5
+    assert results_by_name['ocm-iter']['registries'][benchmarks.TGT_REGISTRY][
+        'requests_total'
+    ] == 0
+
+    assert not benchmarks.compare(results=results, baseline=results)
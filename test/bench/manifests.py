@@ -0,0 +1,112 @@
+'''
+compares deserialisation of (large) manifests and manifest-lists using `dacite` against the
+specialised `from_dict` constructors from `oci.model`:
+
+    python -m test.bench.manifests [--entries 256] [--repeat 5]
+'''
+import argparse
+import json
+import statistics
+import time
+
+import dacite
+
+import oci.model as om
+
+
+def manifest_list_dict(entries: int) -> dict:
+    return {
+        'schemaVersion': 2,
+        'mediaType': om.OCI_IMAGE_INDEX_MIME,
+        'manifests': [
+            {
+                'digest': f'sha256:{idx:064x}',
+                'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+                'size': 1024 + idx,
+                'platform': {'architecture': f'arch-{idx}', 'os': 'linux'},
+                'annotations': {'org.opencontainers.image.ref.name': f'{idx}'},
+            } for idx in range(entries)
+        ],
+        'annotations': {},
+    }
+
+
+def manifest_dict(layers: int) -> dict:
+    return {
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {
+            'digest': f'sha256:{0:064x}',
+            'mediaType': 'application/vnd.oci.image.config.v1+json',
+            'size': 1024,
+        },
+        'layers': [
+            {
+                'digest': f'sha256:{idx:064x}',
+                'mediaType': 'application/vnd.oci.image.layer.v1.tar+gzip',
+                'size': 1024 * idx,
+            } for idx in range(layers)
+        ],
+    }
+
+
+def _median_seconds(function, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started_at)
+
+    return round(statistics.median(durations), 6)
+
+
+def run(
+    entries: int=256,
+    repeat: int=5,
+) -> dict:
+    '''
+    returns median durations (in seconds) for deserialising a manifest-list and a manifest, each
+    with `entries` entries (or layers, respectively)
+    '''
+    results = {}
+
+    for name, data_class, data in (
+        ('manifest-list', om.OciImageManifestList, manifest_list_dict(entries=entries)),
+        ('manifest', om.OciImageManifest, manifest_dict(layers=entries)),
+    ):
+        raw = json.dumps(data).encode('utf-8')
+
+        dacite_seconds = _median_seconds(
+            lambda: dacite.from_dict(data_class=data_class, data=json.loads(raw)),
+            repeat=repeat,
+        )
+        from_dict_seconds = _median_seconds(
+            lambda: data_class.from_dict(json.loads(raw), raw_manifest=raw),
+            repeat=repeat,
+        )
+
+        results[name] = {
+            'dacite': dacite_seconds,
+            'from_dict': from_dict_seconds,
+            'speedup': round(dacite_seconds / from_dict_seconds, 1),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=256)
+    parser.add_argument('--repeat', type=int, default=5)
+
+    parsed = parser.parse_args()
+
+    print(json.dumps(
+        run(entries=parsed.entries, repeat=parsed.repeat),
+        indent=2,
+        sort_keys=True,
+    ))
+
+
+if __name__ == '__main__':
+    main()
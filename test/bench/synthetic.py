@@ -0,0 +1,250 @@
+'''
+generators for synthetic (but deterministic) OCI images and OCM component graphs
+'''
+import dataclasses
+import json
+import random
+
+import oci.model as om
+import ocm
+import ocm.upload
+
+import test.bench.fake_registry as fr
+
+
+@dataclasses.dataclass
+class ImageSpec:
+    '''
+    :param layer_count: count of layers per image (per platform, for multi-arch images)
+    :param layer_size: size of each layer, in octets
+    :param platforms: if more than one platform is given, a multi-arch image (image-index) is
+        created
+    '''
+    layer_count: int = 3
+    layer_size: int = 64 * 1024
+    platforms: tuple[str, ...] = ('amd64',)
+
+
+def _image_manifest(
+    registry: fr.FakeRegistry,
+    rnd: random.Random,
+    architecture: str,
+    spec: ImageSpec,
+) -> bytes:
+    cfg = json.dumps({
+        'architecture': architecture,
+        'os': 'linux',
+        'rootfs': {'type': 'layers', 'diff_ids': []},
+    }).encode('utf-8')
+
+    layers = [rnd.randbytes(spec.layer_size) for _ in range(spec.layer_count)]
+
+    return json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {
+            'mediaType': 'application/vnd.oci.image.config.v1+json',
+            'digest': registry.put_blob(octets=cfg),
+            'size': len(cfg),
+        },
+        'layers': [
+            {
+                'mediaType': 'application/vnd.oci.image.layer.v1.tar',
+                'digest': registry.put_blob(octets=layer),
+                'size': len(layer),
+            } for layer in layers
+        ],
+    }).encode('utf-8')
+
+
+def put_image(
+    registry: fr.FakeRegistry,
+    name: str,
+    tag: str,
+    spec: ImageSpec=ImageSpec(),
+    seed: int | str=0,
+) -> str:
+    '''
+    stores a synthetic image (w/ random layer-content derived from `seed`) directly into the given
+    registry (i.e. w/o sending any requests); returns manifest-digest
+    '''
+    rnd = random.Random(f'{seed}:{name}:{tag}')
+
+    if len(spec.platforms) == 1:
+        return registry.put_manifest(
+            name=name,
+            reference=tag,
+            manifest=_image_manifest(
+                registry=registry,
+                rnd=rnd,
+                architecture=spec.platforms[0],
+                spec=spec,
+            ),
+        )
+
+    entries = []
+    for architecture in spec.platforms:
+        manifest = _image_manifest(
+            registry=registry,
+            rnd=rnd,
+            architecture=architecture,
+            spec=spec,
+        )
+        entries.append({
+            'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+            'digest': registry.put_manifest(name=name, reference=tag, manifest=manifest),
+            'size': len(manifest),
+            'platform': {'architecture': architecture, 'os': 'linux'},
+        })
+
+    return registry.put_manifest(
+        name=name,
+        reference=tag,
+        manifest=json.dumps({
+            'schemaVersion': 2,
+            'mediaType': om.OCI_IMAGE_INDEX_MIME,
+            'manifests': entries,
+        }).encode('utf-8'),
+    )
+
+
+@dataclasses.dataclass
+class ComponentGraphSpec:
+    '''
+    components are arranged in `depth` layers of `width` components each, below a single root
+    component. Each component references `fan_out` components of the next layer (so
+    components are shared, forming "diamonds"), and declares `images_per_component` OCI images.
+
+    :param shared_images: if set, images are shared by all components of a layer (rather than
+        being distinct for each component)
+    '''
+    width: int = 4
+    depth: int = 3
+    fan_out: int = 2
+    images_per_component: int = 2
+    shared_images: bool = False
+    image: ImageSpec = dataclasses.field(default_factory=ImageSpec)
+
+
+def _component_name(layer: int, idx: int) -> str:
+    return f'example.org/bench/layer-{layer}/component-{idx}'
+
+
+def component_graph(
+    spec: ComponentGraphSpec,
+    image_registry: str,
+) -> list[ocm.Component]:
+    '''
+    returns components of a synthetic component graph; the root component is returned first.
+    Images are referenced from `image_registry` (see `put_component_graph` for creating them).
+    '''
+    version = '1.0.0'
+
+    def component(
+        name: str,
+        layer: int,
+        idx: int,
+        references: list[tuple[int, int]],
+        image_count: int,
+    ) -> ocm.Component:
+        image_owner = f'layer-{layer}' if spec.shared_images else f'layer-{layer}/component-{idx}'
+
+        return ocm.Component(
+            name=name,
+            version=version,
+            repositoryContexts=[],
+            provider='bench',
+            sources=[],
+            componentReferences=[
+                ocm.ComponentReference(
+                    name=f'ref-{ref_idx}',
+                    componentName=_component_name(layer=ref_layer, idx=ref_idx),
+                    version=version,
+                ) for ref_layer, ref_idx in references
+            ],
+            resources=[
+                ocm.Resource(
+                    name=f'image-{image_idx}',
+                    version=version,
+                    type=ocm.ArtefactType.OCI_IMAGE,
+                    access=ocm.OciAccess(
+                        imageReference=(
+                            f'{image_registry}/images/{image_owner}/image-{image_idx}:{version}'
+                        ),
+                    ),
+                    relation=ocm.ResourceRelation.EXTERNAL,
+                ) for image_idx in range(image_count)
+            ],
+        )
+
+    components = [
+        component(
+            name='example.org/bench/root',
+            layer=-1,
+            idx=0,
+            references=[(0, idx) for idx in range(spec.width)],
+            image_count=0,
+        ),
+    ]
+
+    for layer in range(spec.depth):
+        for idx in range(spec.width):
+            if layer + 1 < spec.depth:
+                references = [
+                    (layer + 1, (idx + offset) % spec.width)
+                    for offset in range(min(spec.fan_out, spec.width))
+                ]
+            else:
+                references = []
+
+            components.append(component(
+                name=_component_name(layer=layer, idx=idx),
+                layer=layer,
+                idx=idx,
+                references=references,
+                image_count=spec.images_per_component,
+            ))
+
+    return components
+
+
+def put_component_graph(
+    components: list[ocm.Component],
+    registries: dict[str, fr.FakeRegistry],
+    ocm_repository: str,
+    image: ImageSpec=ImageSpec(),
+    seed: int | str=0,
+):
+    '''
+    stores images referenced by the given components, and uploads the component descriptors
+    into `ocm_repository` (using `ocm.upload`). Statistics of the involved registries are reset
+    afterwards.
+    '''
+    for component in components:
+        for resource in component.resources:
+            image_reference = om.OciImageReference(resource.access.imageReference)
+            registry = registries[image_reference.netloc]
+            if (image_reference.name, image_reference.tag) in registry.manifests:
+                continue # shared image
+            put_image(
+                registry=registry,
+                name=image_reference.name,
+                tag=image_reference.tag,
+                spec=image,
+                seed=seed,
+            )
+
+    oci_client = fr.client(registries=registries)
+    for component in components:
+        ocm.upload.upload_component_descriptor(
+            component_descriptor=ocm.ComponentDescriptor(
+                meta=ocm.Metadata(),
+                component=component,
+                signatures=[],
+            ),
+            oci_client=oci_client,
+            ocm_repository=ocm_repository,
+        )
+
+    for registry in registries.values():
+        registry.reset_stats()
@@ -0,0 +1,140 @@
+import asyncio
+import collections
+import dataclasses
+import threading
+import time
+
+import ocm
+
+import cnudie.retrieve
+import cnudie.retrieve_async
+
+
+component_id = ocm.ComponentIdentity(name='acme.org/foo', version='1.2.3')
+component_descriptor = ocm.ComponentDescriptor(
+    meta=ocm.Metadata(),
+    component=ocm.Component(
+        name=component_id.name,
+        version=component_id.version,
+        repositoryContexts=[],
+        provider='acme',
+        sources=[],
+        componentReferences=[],
+        resources=[],
+    ),
+    signatures=[],
+)
+
+
+def ocm_repository_lookup(component):
+    yield 'acme.org/ocm'
+
+
+def test_composite_lookup_single_flight():
+    callers = 4
+    lookups = collections.Counter()
+    barrier = threading.Barrier(callers, timeout=10)
+
+    def slow_lookup(component_id, ocm_repository_lookup=None):
+        lookups[component_id.name] += 1
+        time.sleep(0.2)
+        return component_descriptor
+
+    lookup = cnudie.retrieve.composite_component_descriptor_lookup(
+        lookups=(slow_lookup,),
+        ocm_repository_lookup=ocm_repository_lookup,
+    )
+
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(lookup(component_id))
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [component_descriptor] * callers
+    assert lookups[component_id.name] == 1
+
+    # results are not retained once the lookup has completed
+    assert lookup(component_id) == component_descriptor
+    assert lookups[component_id.name] == 2
+
+
+def test_composite_lookup_single_flight_async():
+    lookups = collections.Counter()
+
+    async def slow_lookup(component_id, ocm_repository_lookup=None):
+        lookups[component_id.name] += 1
+        await asyncio.sleep(0.01)
+        return component_descriptor
+
+    async def absent_lookup(component_id, ocm_repository_lookup=None):
+        lookups['absent'] += 1
+        await asyncio.sleep(0.01)
+
+    async def lookup_concurrently():
+        lookup = cnudie.retrieve_async.composite_component_descriptor_lookup(
+            lookups=(absent_lookup, slow_lookup),
+            ocm_repository_lookup=ocm_repository_lookup,
+        )
+        return await asyncio.gather(*(lookup(component_id) for _ in range(4)))
+
+    assert asyncio.run(lookup_concurrently()) == [component_descriptor] * 4
+    assert lookups == {component_id.name: 1, 'absent': 1}
+
+
+def test_negative_cache():
+    ocm_repos = ('acme.org/ocm-1', 'acme.org/ocm-2', 'acme.org/ocm-3')
+    requested_image_references = []
+
+    class OciClient:
+        def manifest(self, image_reference, absent_ok=False):
+            requested_image_references.append(image_reference)
+            return None
+
+    negative_cache = cnudie.retrieve.NegativeCache()
+    lookup = cnudie.retrieve.oci_component_descriptor_lookup(
+        ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(*ocm_repos),
+        oci_client=OciClient(),
+        negative_cache=negative_cache,
+    )
+
+    assert lookup(component_id) is None
+    assert len(requested_image_references) == len(ocm_repos)
+    assert all(negative_cache.is_absent(component_id, ocm_repo) for ocm_repo in ocm_repos)
+
+    # absence is remembered per OCM repository
+    requested_image_references.clear()
+    negative_cache.discard(component_id, 'acme.org/ocm-2')
+    assert lookup(component_id) is None
+    assert requested_image_references == [
+        'acme.org/ocm-2/component-descriptors/acme.org/foo:1.2.3',
+    ]
+
+    # writing back a component descriptor removes it from negative cache
+    in_memory_lookup = cnudie.retrieve.in_memory_cache_component_descriptor_lookup(
+        ocm_repository_lookup=cnudie.retrieve.ocm_repository_lookup(*ocm_repos),
+        negative_cache=negative_cache,
+    )
+    writeback = in_memory_lookup(component_id)
+    assert isinstance(writeback, cnudie.retrieve.WriteBack)
+
+    found_component_descriptor = ocm.ComponentDescriptor.from_dict(
+        dataclasses.asdict(component_descriptor),
+    )
+    found_component_descriptor.component.set_current_ocm_repo(
+        ocm.OciOcmRepository(baseUrl='acme.org/ocm-3'),
+    )
+    writeback(component_id, found_component_descriptor)
+
+    assert not negative_cache.is_absent(component_id, 'acme.org/ocm-3')
+    assert in_memory_lookup(component_id) is found_component_descriptor
+
+    negative_cache = cnudie.retrieve.NegativeCache(ttl=0)
+    negative_cache.add(component_id, 'acme.org/ocm-1')
+    assert not negative_cache.is_absent(component_id, 'acme.org/ocm-1')
@@ -0,0 +1,75 @@
+import threading
+import time
+import types
+
+import pytest
+
+import ctt.oci_util
+import ctt.process_dependencies as pd
+import oci.model as om
+
+
+@pytest.fixture
+def upload_state(monkeypatch):
+    monkeypatch.setattr(pd, 'uploaded_image_refs_to_digests', {})
+    monkeypatch.setattr(pd, 'uploaded_image_refs_to_ready_events', {})
+
+
+def test_failed_async_replication_is_retried_once(upload_state, monkeypatch):
+    tgt_ref = om.OciImageReference('example.org/tgt:1.0')
+    element = types.SimpleNamespace(
+        src_ref=om.OciImageReference('example.org/src:1.0'),
+        tgt_ref=tgt_ref,
+        digest=None,
+        remove_files=None,
+    )
+    release_async_replication = threading.Event()
+
+    async def replicate_async(**kwargs):
+        release_async_replication.wait()
+        raise RuntimeError('async replication failed')
+
+    monkeypatch.setattr(pd, '_replicate_async', replicate_async)
+
+    filter_image_calls = []
+
+    def filter_image(target_ref, **kwargs):
+        filter_image_calls.append(target_ref)
+        time.sleep(0.1) # allow other waiters to (incorrectly) start replication concurrently
+        return None, target_ref, b'{}'
+
+    monkeypatch.setattr(ctt.oci_util, 'filter_image', filter_image)
+
+    async_thread = threading.Thread(
+        target=pd.replicate_async,
+        kwargs=dict(
+            replication_resource_elements=[element],
+            oci_client=None,
+        ),
+    )
+    async_thread.start()
+
+    while tgt_ref not in pd.uploaded_image_refs_to_ready_events:
+        time.sleep(0.01)
+
+    digests = []
+
+    def process_upload_request():
+        digests.append(pd.process_upload_request(
+            replication_resource_element=element,
+            oci_client=None,
+        ))
+
+    waiters = [threading.Thread(target=process_upload_request) for _ in range(2)]
+    for waiter in waiters:
+        waiter.start()
+
+    time.sleep(0.1) # let waiters block on upload-event
+    release_async_replication.set()
+
+    async_thread.join()
+    for waiter in waiters:
+        waiter.join()
+
+    assert filter_image_calls == [tgt_ref]
+    assert digests == [pd.uploaded_image_refs_to_digests[tgt_ref]] * 2
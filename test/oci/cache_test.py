@@ -0,0 +1,297 @@
+import hashlib
+import io
+import json
+import os
+import unittest.mock
+import urllib.parse
+
+import pytest
+import requests
+import urllib3.response
+
+import oci.cache
+import oci.client as co
+import oci.model as om
+
+
+def _digest(octets: bytes) -> str:
+    return f'sha256:{hashlib.sha256(octets).hexdigest()}'
+
+
+def test_incomplete_cache():
+    class IncompleteCache(oci.cache.Cache):
+        def get(self, digest: str) -> bytes | None:
+            return None
+
+    # missing `put` must be detected upon creation (rather than upon first cache-miss)
+    with pytest.raises(TypeError):
+        IncompleteCache()
+
+
+def test_in_memory_cache_lru():
+    cache = oci.cache.InMemoryCache(max_octets=6)
+
+    cache.put('sha256:a', b'aaa')
+    cache.put('sha256:b', b'bbb')
+    assert cache.get('sha256:a') == b'aaa' # a is now most recently used
+
+    cache.put('sha256:c', b'ccc')
+
+    assert cache.get('sha256:b') is None
+    assert cache.get('sha256:a') == b'aaa'
+    assert cache.get('sha256:c') == b'ccc'
+
+
+def test_file_system_cache(tmp_path):
+    cache = oci.cache.FileSystemCache(root_dir=str(tmp_path), max_octets=6)
+    a, b, c = (_digest(octets) for octets in (b'aaa', b'bbb', b'ccc'))
+
+    cache.put(a, b'aaa')
+    cache.put(b, b'bbb')
+    os.utime(cache.path(a), (0, 0)) # a is least recently used
+
+    cache.put(c, b'ccc')
+
+    assert cache.get(a) is None
+    assert cache.get(b) == b'bbb'
+    assert cache.get(c) == b'ccc'
+
+    # entries must survive re-instantiation
+    cache = oci.cache.FileSystemCache(root_dir=str(tmp_path), max_octets=6)
+    assert cache.get(c) == b'ccc'
+
+
+def test_file_system_cache_tee(tmp_path):
+    cache = oci.cache.FileSystemCache(root_dir=str(tmp_path))
+    digest = _digest(b'abcdef')
+
+    assert list(cache.tee(digest=digest, chunks=(b'abc', b'def'))) == [b'abc', b'def']
+    assert cache.get(digest) == b'abcdef'
+
+    # corrupt content must not be inserted
+    digest = _digest(b'foo')
+    with pytest.raises(ValueError):
+        list(cache.tee(digest=digest, chunks=(b'bar',)))
+    assert digest not in cache
+
+    # partially consumed content must not be inserted
+    chunks = cache.tee(digest=digest, chunks=(b'f', b'oo'))
+    next(chunks)
+    chunks.close()
+    assert digest not in cache
+    assert os.listdir(os.path.dirname(cache.path(digest))) == [os.path.basename(cache.path(
+        _digest(b'abcdef'),
+    ))]
+
+
+def test_client_cache_manifest():
+    manifest = json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {},
+        'layers': [],
+    }).encode('utf-8')
+
+    session = unittest.mock.MagicMock()
+    session.request.return_value.content = manifest
+    session.request.return_value.status_code = 200
+    cache = oci.cache.ClientCache()
+    client = co.Client(session=session, cache=cache)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=co.AuthMethod.BASIC,
+    )
+
+    for _ in range(2):
+        res = client.manifest_raw(image_reference='example.org/foo:1.2.3')
+        assert res.content == manifest
+
+    session.request.assert_called_once()
+    assert cache.stats.tag_misses == 1
+    assert cache.stats.tag_hits == 1
+
+    # resolved digest must be served from cache
+    res = client.manifest_raw(image_reference=f'example.org/foo@{_digest(manifest)}')
+    assert res.content == manifest
+    assert res.headers['Content-Type'] == om.OCI_MANIFEST_SCHEMA_V2_MIME
+    session.request.assert_called_once()
+    assert cache.stats.manifest_hits == 2
+
+    # existence-checks must not be served from cache
+    client.manifest_raw(
+        image_reference=f'example.org/bar@{_digest(manifest)}',
+        absent_ok=True,
+    )
+    assert session.request.call_count == 2
+
+
+def test_client_cache_invalidates_written_tags():
+    def manifest(layer_count: int) -> bytes:
+        return json.dumps({
+            'schemaVersion': 2,
+            'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+            'config': {},
+            'layers': [{}] * layer_count,
+        }).encode('utf-8')
+
+    registry_manifest = manifest(layer_count=0)
+    concurrent_lookup = False
+
+    def request(method, url, data=None, **kwargs):
+        nonlocal registry_manifest
+        res = unittest.mock.MagicMock()
+        res.status_code = 201 if method == 'PUT' else 200
+        res.ok = True
+        if method == 'PUT':
+            if concurrent_lookup:
+                # concurrent lookup while upload is in progress re-caches outdated tag-resolution
+                client.manifest_raw(image_reference='example.org/foo:1')
+            registry_manifest = data
+        res.content = registry_manifest
+        return res
+
+    session = unittest.mock.MagicMock()
+    session.request.side_effect = request
+    cache = oci.cache.ClientCache()
+    client = co.Client(session=session, cache=cache)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=co.AuthMethod.BASIC,
+    )
+
+    assert client.manifest_raw(image_reference='example.org/foo:1').content == manifest(0)
+    assert client.manifest_raw(image_reference='example.org/foo:1').content == manifest(0)
+    assert session.request.call_count == 1
+
+    # tag-resolution must not be served from cache after tag was pushed to
+    client.put_manifest(image_reference='example.org/foo:1', manifest=manifest(1))
+    assert client.manifest_raw(image_reference='example.org/foo:1').content == manifest(1)
+
+    client.delete_manifest(image_reference='example.org/foo:1')
+    assert cache.stats.tag_misses == 2
+    client.manifest_raw(image_reference='example.org/foo:1')
+    assert cache.stats.tag_misses == 3
+
+    concurrent_lookup = True
+    client.put_manifest(image_reference='example.org/foo:1', manifest=manifest(2))
+    assert client.manifest_raw(image_reference='example.org/foo:1').content == manifest(2)
+
+
+def test_client_blob_store(tmp_path):
+    octets = b'layer-content' * 100
+    digest = _digest(octets)
+
+    session = unittest.mock.MagicMock()
+    session.request.return_value.status_code = 200
+    session.request.return_value.raw.stream.side_effect = lambda *args, **kwargs: iter(
+        (octets[:500], octets[500:]),
+    )
+    client = co.Client(
+        session=session,
+        blob_store=oci.cache.FileSystemCache(root_dir=str(tmp_path)),
+    )
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=co.AuthMethod.BASIC,
+    )
+
+    assert b''.join(client.iter_blob(image_reference='example.org/foo:1', digest=digest)) == octets
+    session.request.assert_called_once()
+
+    # blob must be served from store for other repositories, too
+    assert b''.join(client.iter_blob(image_reference='example.org/bar:1', digest=digest)) == octets
+    assert client.blob(image_reference='example.org/bar:1', digest=digest).content == octets
+    assert b''.join(client.iter_blob(
+        image_reference='example.org/bar:1',
+        digest=digest,
+        start=10,
+        end=19,
+    )) == octets[10:20]
+    session.request.assert_called_once()
+
+
+def test_client_blob_store_streamed_blob(tmp_path):
+    octets = b'layer-content' * 100
+    digest = _digest(octets)
+
+    def request(*args, **kwargs):
+        res = requests.models.Response()
+        res.status_code = 200
+        res.headers['Content-Length'] = str(len(octets))
+        res.raw = urllib3.response.HTTPResponse(
+            body=io.BytesIO(octets),
+            preload_content=False,
+        )
+        return res
+
+    session = unittest.mock.MagicMock()
+    session.request.side_effect = request
+    blob_store = oci.cache.FileSystemCache(root_dir=str(tmp_path))
+    client = co.Client(
+        session=session,
+        blob_store=blob_store,
+    )
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=co.AuthMethod.BASIC,
+    )
+
+    res = client.blob(image_reference='example.org/foo:1', digest=digest, stream=True)
+    assert res.content == octets
+    session.request.assert_called_once()
+
+    # blob must have been stored while being read
+    assert blob_store.open(digest=digest).read() == octets
+    assert client.blob(image_reference='example.org/foo:1', digest=digest).content == octets
+    session.request.assert_called_once()
+
+
+def test_tag_list_cache():
+    registry_tags = ['1.0.0', '1.1.0', '1.2.0']
+    requested_urls = []
+    honour_last = True
+
+    def request(method, url, **kwargs):
+        requested_urls.append(url)
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        if (last := query.get('last')) and honour_last:
+            tags = [tag for tag in registry_tags if tag > last[0]]
+        else:
+            tags = registry_tags
+
+        res = unittest.mock.MagicMock()
+        res.status_code = 200
+        res.headers = {}
+        res.json.return_value = {'tags': tags}
+        return res
+
+    session = unittest.mock.MagicMock()
+    session.request.side_effect = request
+    tag_list_cache = oci.cache.TagListCache(ttl_seconds=60)
+    client = co.Client(
+        session=session,
+        tag_list_cache=tag_list_cache,
+        tags_page_size=100,
+    )
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=co.AuthMethod.BASIC,
+    )
+
+    assert client.tags(image_reference='example.org/foo') == registry_tags
+    assert client.tags(image_reference='example.org/foo') == registry_tags
+    assert requested_urls == ['https://example.org/v2/foo/tags/list?n=100']
+
+    # stale listing must be refreshed incrementally
+    tag_list_cache.ttl_seconds = -1
+    registry_tags.append('1.3.0')
+
+    assert client.tags(image_reference='example.org/foo') == registry_tags
+    assert requested_urls[-1] == 'https://example.org/v2/foo/tags/list?n=100&last=1.2.0'
+
+    # fallback to complete listing if registry does not honour `last`
+    honour_last = False
+    registry_tags.remove('1.0.0')
+
+    assert client.tags(image_reference='example.org/foo') == registry_tags
+    assert len(requested_urls) == 3
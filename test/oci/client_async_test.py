@@ -0,0 +1,144 @@
+import asyncio
+import collections.abc
+import hashlib
+import unittest.mock
+
+import aiohttp
+
+import oci.client
+import oci.client_async
+
+
+class FakeSession:
+    '''
+    minimal stand-in for aiohttp.ClientSession, emulating a registry accepting chunked uploads.
+    The second PATCH-request fails after registry received the first half of the chunk.
+    '''
+    def __init__(self):
+        self.received = bytearray()
+        self.requests = []
+        self.patch_count = 0
+
+    async def request(self, method, url, headers, data=None, **kwargs):
+        self.requests.append((method, url, headers.get('Content-Range')))
+        res = unittest.mock.MagicMock()
+        res.status = 202
+        res.ok = True
+        res.content_length = None
+        res.url = url
+        res.headers = {'Location': '/v2/foo/blobs/uploads/abc'}
+
+        if method == 'HEAD':
+            res.status = 404
+            res.ok = False
+        elif method == 'PATCH':
+            self.patch_count += 1
+            if self.patch_count == 2:
+                self.received += data[:len(data) // 2]
+                raise aiohttp.ClientConnectionError('connection reset')
+            self.received += data
+        elif method == 'GET':
+            res.status = 204
+            res.headers |= {'Range': f'0-{len(self.received) - 1}'}
+        elif method == 'PUT':
+            res.status = 201
+
+        return res
+
+
+def test_put_blob_chunked_resume():
+    octets = b'0123456789'
+    digest = f'sha256:{hashlib.sha256(octets).hexdigest()}'
+    session = FakeSession()
+    client = oci.client_async.Client(
+        session=session,
+        blob_upload_mode=oci.client.BlobUploadMode.CHUNKED,
+        blob_upload_chunk_size=4,
+    )
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=oci.client.AuthMethod.BASIC,
+    )
+
+    async def iter_chunks():
+        for idx in range(0, len(octets), 3):
+            yield octets[idx:idx + 3]
+
+    asyncio.run(client.put_blob(
+        image_reference='example.org/foo:1',
+        digest=digest,
+        octets_count=len(octets),
+        data=iter_chunks(),
+        max_chunk=1,
+    ))
+
+    assert bytes(session.received) == octets
+    assert [
+        content_range for method, _, content_range in session.requests if method == 'PATCH'
+    ] == ['0-3', '4-7', '6-7', '8-9']
+    method, url, _ = session.requests[-1]
+    assert method == 'PUT'
+    assert url == f'https://example.org/v2/foo/blobs/uploads/abc?digest={digest.replace(":", "%3A")}'
+
+
+def test_put_blob_streaming_not_retried():
+    octets = b'x' * 1024
+    digest = f'sha256:{hashlib.sha256(octets).hexdigest()}'
+    requests = []
+    received = bytearray()
+
+    class ThrottlingSession:
+        async def request(self, method, url, headers, data=None, **kwargs):
+            res = unittest.mock.MagicMock()
+            res.status = {'HEAD': 404, 'POST': 202, 'PATCH': 202, 'PUT': 201}[method]
+            res.content_length = None
+            res.url = url
+            res.headers = {'Location': '/v2/foo/blobs/uploads/abc'}
+
+            if method == 'PUT' and isinstance(data, collections.abc.AsyncIterable):
+                # registry throttles after having consumed (part of) streamed body
+                await anext(aiter(data))
+                res.status = 429
+            elif method == 'PATCH':
+                received.extend(data)
+
+            requests.append((method, res.status))
+            res.ok = res.status < 400
+            if not res.ok:
+                res.text = unittest.mock.AsyncMock(return_value='')
+                res.raise_for_status.side_effect = aiohttp.ClientResponseError(
+                    request_info=unittest.mock.MagicMock(real_url=url),
+                    history=(),
+                    status=res.status,
+                )
+            return res
+
+    client = oci.client_async.Client(
+        session=ThrottlingSession(),
+        blob_upload_chunk_size=256,
+    )
+    client.token_cache.set_auth_method(
+        image_reference='example.org/foo',
+        auth_method=oci.client.AuthMethod.BASIC,
+    )
+
+    async def iter_chunks():
+        for idx in range(0, len(octets), 128):
+            yield octets[idx:idx + 128]
+
+    asyncio.run(client.put_blob(
+        image_reference='example.org/foo:1',
+        digest=digest,
+        octets_count=len(octets),
+        data=iter_chunks(),
+        max_chunk=1,
+    ))
+
+    # streamed (probing) PUT must not be retried (body was already consumed); as support for
+    # streamed uploads could not be determined, blob is uploaded using chunks
+    assert [method for method, status in requests if status == 429] == ['PUT']
+    assert bytes(received) == octets
+    assert requests[-1] == ('PUT', 201)
+    capabilities = client.capabilities_cache.capabilities('example.org/foo')
+    assert capabilities.streaming_upload is None
+    assert capabilities.chunked_upload is True
@@ -1,5 +1,13 @@
 import base64
+import contextlib
+import hashlib
+import threading
+import unittest.mock
+import urllib.parse
 
+import pytest
+import requests
+import urllib3.exceptions
 
 import oci.client as co
 
@@ -15,3 +23,498 @@ def test_append_b64_padding_if_missing():
     encode_and_decode(b'ab')
     encode_and_decode(b'abc')
     encode_and_decode(b'abcd')
+
+
+def test_mount_blob_url():
+    routes = co.OciRoutes()
+
+    url = routes.mount_blob_url(
+        image_reference='example.org/tgt/image:1.2.3',
+        digest='sha256:abcd',
+        source_image_reference='example.org/src/image:1.2.3',
+    )
+
+    assert url == \
+        'https://example.org/v2/tgt/image/blobs/uploads/?mount=sha256%3Aabcd&from=src%2Fimage'
+
+
+def test_mount_blob():
+    session = unittest.mock.MagicMock()
+    client = co.Client(session=session)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/tgt',
+        auth_method=co.AuthMethod.BASIC,
+    )
+
+    # different registries -> mounting must not be attempted
+    assert not client.mount_blob(
+        image_reference='example.org/tgt:1',
+        digest='sha256:abcd',
+        source_image_reference='other.example.org/src:1',
+    )
+    session.request.assert_not_called()
+
+    session.request.return_value.status_code = 201
+    assert client.mount_blob(
+        image_reference='example.org/tgt:1',
+        digest='sha256:abcd',
+        source_image_reference='example.org/src:1',
+    )
+    assert session.request.call_args.kwargs['method'] == 'POST'
+
+    # 202 -> registry refused mount (and started regular upload-session instead)
+    client.capabilities_cache = co.RegistryCapabilitiesCache()
+    session.request.return_value.status_code = 202
+    session.request.return_value.headers = {'Location': '/v2/tgt/blobs/uploads/abc'}
+    session.request.return_value.url = 'https://example.org/v2/tgt/blobs/uploads/'
+    for _ in range(2):
+        assert not client.mount_blob(
+            image_reference='example.org/tgt:1',
+            digest='sha256:abcd',
+            source_image_reference='example.org/src:1',
+        )
+
+        # upload-session must be cancelled
+        assert session.request.call_args.kwargs['method'] == 'DELETE'
+        assert session.request.call_args.kwargs['url'] == \
+            'https://example.org/v2/tgt/blobs/uploads/abc'
+
+    # single refusal must not disable mounting for registry
+    assert client.capabilities_cache.capabilities('example.org/tgt').blob_mount is None
+
+
+def test_probe_blob_mount():
+    session = unittest.mock.MagicMock()
+    client = co.Client(session=session)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/tgt',
+        auth_method=co.AuthMethod.BASIC,
+    )
+    client.capabilities_cache.update(
+        image_reference='example.org/tgt',
+        referrers_api=True,
+        single_post_upload=True,
+        chunked_upload=True,
+    )
+    session.request.return_value.status_code = 202
+    session.request.return_value.headers = {'Location': '/v2/tgt/blob-mount-probe/uploads/abc'}
+    session.request.return_value.url = 'https://example.org/v2/tgt/blob-mount-probe/uploads/'
+
+    capabilities = client.probe_capabilities(
+        image_reference='example.org/tgt:1',
+        probe_uploads=True,
+    )
+
+    assert capabilities.blob_mount is False
+    assert [
+        (call.kwargs['method'], urllib.parse.urlparse(call.kwargs['url']).path)
+        for call in session.request.call_args_list
+    ][-2:] == [
+        ('POST', '/v2/tgt/blob-mount-probe/blobs/uploads/'),
+        ('DELETE', '/v2/tgt/blob-mount-probe/uploads/abc'),
+    ]
+
+
+def test_iter_fixed_size_chunks():
+    chunks = co._iter_fixed_size_chunks(
+        chunks=(b'a', b'bcdef', b'', b'ghij', b'k'),
+        chunk_size=3,
+    )
+
+    assert list(chunks) == [b'abc', b'def', b'ghi', b'jk']
+
+
+def test_put_blob_streaming():
+    session = unittest.mock.MagicMock()
+    cache = co.RegistryCapabilitiesCache()
+    cache.update(
+        image_reference='example.org/tgt',
+        streaming_upload=True,
+        auth_method=co.AuthMethod.BASIC,
+    )
+    client = co.Client(session=session, capabilities_cache=cache)
+
+    def request(method, url, **kwargs):
+        res = unittest.mock.MagicMock()
+        res.ok = method != 'HEAD' # blob does not yet exist
+        res.status_code = 201
+        res.headers = {'Location': '/v2/tgt/blobs/uploads/abc?state=x'}
+        res.url = url
+        return res
+
+    session.request.side_effect = request
+
+    octets = [b'x' * 1024] * 4
+
+    client.put_blob(
+        image_reference='example.org/tgt:1',
+        digest='sha256:abcd',
+        octets_count=4096,
+        data=(chunk for chunk in octets),
+        max_chunk=1024,
+    )
+
+    put_kwargs = session.request.call_args.kwargs
+    assert put_kwargs['method'] == 'PUT'
+    assert put_kwargs['url'] == \
+        'https://example.org/v2/tgt/blobs/uploads/abc?state=x&digest=sha256%3Aabcd'
+    # data must be streamed (not concatenated into one bytes-object)
+    assert len(put_kwargs['data']) == 4096
+    assert list(put_kwargs['data']) == octets
+
+
+def test_put_blob_streaming_fallback():
+    session = unittest.mock.MagicMock()
+    client = co.Client(session=session, blob_upload_chunk_size=1024)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/tgt',
+        auth_method=co.AuthMethod.BASIC,
+    )
+    octets = [b'x' * 1024] * 4
+    requests_sent = []
+    streaming_upload = False
+    chunked_upload = True
+
+    def request(method, url, data=None, **kwargs):
+        res = unittest.mock.MagicMock()
+        res.url = url
+        res.headers = {'Location': '/v2/tgt/blobs/uploads/abc'}
+        res.status_code = {'HEAD': 404, 'POST': 202, 'PATCH': 202, 'PUT': 201}[method]
+
+        if isinstance(data, co._LengthKnownIterable):
+            data = list(data)
+            if not streaming_upload:
+                res.status_code = 411
+        elif method == 'PATCH' and not chunked_upload:
+            res.status_code = 405
+
+        if hasattr(data, 'read'):
+            data = data.read()
+        requests_sent.append((method, data))
+
+        res.ok = res.status_code < 400
+        if not res.ok:
+            res.raise_for_status.side_effect = requests.exceptions.HTTPError(response=res)
+        return res
+
+    session.request.side_effect = request
+
+    def put_blob():
+        requests_sent.clear()
+        client.put_blob(
+            image_reference='example.org/tgt:1',
+            digest=f'sha256:{hashlib.sha256(b"".join(octets)).hexdigest()}',
+            octets_count=4096,
+            data=(chunk for chunk in octets),
+            max_chunk=1024,
+        )
+        return [(method, data) for method, data in requests_sent if method in ('PATCH', 'PUT')]
+
+    # streamed upload is probed (w/ tiny blob) and rejected; blob must be uploaded using chunks
+    assert put_blob() == [('PUT', [co._EMPTY_JSON_BLOB])] + \
+        [('PATCH', chunk) for chunk in octets] + [('PUT', None)]
+
+    capabilities = client.capabilities_cache.capabilities(image_reference='example.org/tgt')
+    assert capabilities.streaming_upload is False
+    assert capabilities.chunked_upload is True
+
+    # subsequent uploads must use chunks right away
+    assert put_blob() == [('PATCH', chunk) for chunk in octets] + [('PUT', None)]
+
+    # last resort: spooled upload
+    client.capabilities_cache = co.RegistryCapabilitiesCache()
+    client.capabilities_cache.update(
+        image_reference='example.org/tgt',
+        chunked_upload=False,
+    )
+    chunked_upload = False
+    assert put_blob() == [('PUT', [co._EMPTY_JSON_BLOB]), ('PUT', b''.join(octets))]
+
+    # streamed upload is accepted; blob must be streamed right away after probing
+    client.capabilities_cache = co.RegistryCapabilitiesCache()
+    streaming_upload = True
+    assert put_blob() == [('PUT', [co._EMPTY_JSON_BLOB]), ('PUT', octets)]
+    capabilities = client.capabilities_cache.capabilities(image_reference='example.org/tgt')
+    assert capabilities.streaming_upload is True
+
+
+def test_registry_capabilities_cache(tmp_path):
+    path = tmp_path / 'capabilities.json'
+    cache = co.RegistryCapabilitiesCache(path=str(path))
+
+    cache.update(
+        image_reference='example.org/foo:1',
+        single_post_upload=True,
+        auth_method=co.AuthMethod.BASIC,
+    )
+    cache.update(
+        image_reference='example.org/bar:1',
+        chunked_upload=False,
+    )
+    cache.persist()
+
+    cache = co.RegistryCapabilitiesCache(path=str(path))
+    capabilities = cache.capabilities(image_reference='example.org/baz')
+
+    assert capabilities.single_post_upload is True
+    assert capabilities.chunked_upload is False
+    assert capabilities.blob_mount is None
+    assert capabilities.auth_method is co.AuthMethod.BASIC
+
+    # learnt auth-method must be re-used by clients
+    client = co.Client(capabilities_cache=cache)
+    assert client.token_cache.auth_method('example.org/foo') is co.AuthMethod.BASIC
+
+
+def test_put_blob_single_post():
+    session = unittest.mock.MagicMock()
+    cache = co.RegistryCapabilitiesCache()
+    cache.update(
+        image_reference='example.org/tgt',
+        single_post_upload=True,
+        auth_method=co.AuthMethod.BASIC,
+    )
+    client = co.Client(session=session, capabilities_cache=cache)
+    session.request.return_value.status_code = 201
+
+    client._put_blob_single_post(
+        image_reference='example.org/tgt:1',
+        digest='sha256:abcd',
+        octets_count=3,
+        data=b'foo',
+    )
+
+    # no separate request for starting an upload-session
+    session.request.assert_called_once()
+    assert session.request.call_args.kwargs['method'] == 'POST'
+    assert session.request.call_args.kwargs['url'] == \
+        'https://example.org/v2/tgt/blobs/uploads/?digest=sha256%3Aabcd'
+
+
+def test_put_blob_chunked_resume():
+    session = unittest.mock.MagicMock()
+    client = co.Client(
+        session=session,
+        max_retries=1,
+        default_backoff_base_seconds=0,
+    )
+    client.token_cache.set_auth_method(
+        image_reference='example.org/tgt',
+        auth_method=co.AuthMethod.BASIC,
+    )
+    patches = []
+
+    def request(method, url, headers, data=None, **kwargs):
+        res = unittest.mock.MagicMock()
+        res.ok = True
+        res.status_code = 202
+        res.headers = {'Location': 'https://example.org/v2/tgt/blobs/uploads/abc'}
+        res.url = url
+
+        if method == 'PATCH':
+            patches.append((headers['Content-Range'], data))
+            if len(patches) in (2, 3): # fail again upon retry from `_request`
+                raise requests.exceptions.ConnectionError('connection dropped')
+        elif method == 'GET':
+            # registry received first chunk, plus two octets of second one
+            res.status_code = 204
+            res.headers['Range'] = '0-5'
+        elif method == 'PUT':
+            res.status_code = 201
+
+        return res
+
+    session.request.side_effect = request
+
+    octets = b'abcdefghij'
+    client._put_blob_chunked(
+        image_reference='example.org/tgt:1',
+        octets_count=len(octets),
+        data_iterator=co._iter_fixed_size_chunks(chunks=(octets,), chunk_size=4),
+        chunk_size=4,
+        digest=f'sha256:{hashlib.sha256(octets).hexdigest()}',
+    )
+
+    assert patches == [
+        ('0-3', b'abcd'),
+        ('4-7', b'efgh'), # failed
+        ('4-7', b'efgh'), # failed (retry)
+        ('6-7', b'gh'), # resumed
+        ('8-9', b'ij'),
+    ]
+
+
+def test_iter_blob_resume():
+    session = unittest.mock.MagicMock()
+    client = co.Client(session=session)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/src',
+        auth_method=co.AuthMethod.BASIC,
+    )
+    octets = b'abcdefghij'
+    ranges = []
+
+    def request(method, url, headers, **kwargs):
+        res = unittest.mock.MagicMock()
+        res.ok = True
+        octets_range = headers.get('Range')
+        ranges.append(octets_range)
+
+        if not octets_range:
+            res.status_code = 200
+
+            def stream(*args, **kwargs):
+                yield octets[:4]
+                raise urllib3.exceptions.ProtocolError('connection dropped')
+        else:
+            res.status_code = 206
+            start = int(octets_range.removeprefix('bytes=').split('-')[0])
+
+            def stream(*args, **kwargs):
+                yield octets[start:]
+
+        res.raw.stream.side_effect = stream
+        return res
+
+    session.request.side_effect = request
+
+    assert b''.join(client.iter_blob(
+        image_reference='example.org/src:1',
+        digest='sha256:abcd',
+    )) == octets
+    assert ranges == [None, 'bytes=4-']
+
+
+def test_download_blob_parallel(tmp_path):
+    session = unittest.mock.MagicMock()
+    client = co.Client(session=session)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/src',
+        auth_method=co.AuthMethod.BASIC,
+    )
+    octets = bytes(range(256)) * 40
+    ignore_range = None
+    short_range = None
+
+    def request(method, url, headers, **kwargs):
+        res = unittest.mock.MagicMock()
+        res.ok = True
+        res.headers = {'Content-Length': str(len(octets))}
+        res.status_code = 206
+
+        start, end = headers['Range'].removeprefix('bytes=').split('-')
+        if headers['Range'] == ignore_range:
+            # e.g. proxies not honouring range-requests
+            res.status_code = 200
+            start, end = 0, len(octets) - 1
+        elif headers['Range'] == short_range:
+            end = int(end) - 1
+        res.raw.stream.return_value = iter((octets[int(start):int(end) + 1],))
+        return res
+
+    session.request.side_effect = request
+    path = tmp_path / 'blob'
+
+    def download_blob():
+        client.download_blob(
+            image_reference='example.org/src:1',
+            digest=f'sha256:{hashlib.sha256(octets).hexdigest()}',
+            path=str(path),
+            octets_count=len(octets),
+            max_parallel_ranges=4,
+            range_size=1000,
+        )
+
+    download_blob()
+
+    assert path.read_bytes() == octets
+    assert client.capabilities_cache.capabilities('example.org/src').range_requests is True
+
+    ignore_range = 'bytes=1000-1999'
+    with pytest.raises(ValueError):
+        download_blob()
+
+    # assembled blob must be verified against digest
+    ignore_range = None
+    short_range = 'bytes=2000-2999'
+    with pytest.raises(ValueError):
+        download_blob()
+
+
+def test_head_manifests_and_blobs():
+    session = unittest.mock.MagicMock()
+    client = co.Client(session=session)
+    client.token_cache.set_auth_method(
+        image_reference='example.org/src',
+        auth_method=co.AuthMethod.BASIC,
+    )
+    present = ('/manifests/1', '/blobs/sha256:a')
+
+    def request(method, url, **kwargs):
+        res = unittest.mock.MagicMock()
+        res.ok = url.endswith(present)
+        res.status_code = 200 if res.ok else 404
+        res.headers = {
+            'Content-Type': 'application/vnd.oci.image.manifest.v1+json',
+            'Docker-Content-Digest': 'sha256:abcd',
+            'Content-Length': '42',
+        }
+        return res
+
+    session.request.side_effect = request
+
+    manifests = client.head_manifests(
+        image_references=('example.org/src:2', 'example.org/src:1', 'example.org/src:2'),
+    )
+
+    assert list(manifests) == ['example.org/src:2', 'example.org/src:1']
+    assert manifests['example.org/src:2'] is None
+    assert manifests['example.org/src:1'].digest == 'sha256:abcd'
+
+    assert client.head_blobs(
+        image_reference='example.org/src:1',
+        digests=('sha256:a', 'sha256:b'),
+    ) == {'sha256:a': True, 'sha256:b': False}
+    assert session.request.call_count == 4
+
+
+def test_concurrency_limiter():
+    limiter = co.ConcurrencyLimiter(initial_limit=4, max_limit=8)
+
+    with contextlib.ExitStack() as stack:
+        slots = [
+            stack.enter_context(limiter.slot(netloc='example.org')) for _ in range(4)
+        ]
+
+        limiter.throttled(slot=slots[0], retry_after_seconds=0)
+        assert limiter.limit('example.org') == 2
+
+        # burst of throttled requests (sent before decrease) must only reduce limit once
+        limiter.throttled(slot=slots[1], retry_after_seconds=0)
+        assert limiter.limit('example.org') == 2
+
+    # other registries are not affected
+    assert limiter.limit('other.example.org') == 4
+
+    # additive increase: roughly one per "round" of (successful) requests
+    with limiter.slot(netloc='example.org') as slot:
+        for _ in range(3):
+            limiter.succeeded(slot=slot)
+    assert limiter.limit('example.org') == 3
+
+
+def test_concurrency_limiter_blocks():
+    limiter = co.ConcurrencyLimiter(initial_limit=1)
+    entered = threading.Event()
+
+    def send_request():
+        with limiter.slot(netloc='example.org'):
+            entered.set()
+
+    with limiter.slot(netloc='example.org'):
+        thread = threading.Thread(target=send_request)
+        thread.start()
+        assert not entered.wait(timeout=0.1)
+
+    thread.join()
+    assert entered.is_set()
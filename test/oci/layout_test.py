@@ -0,0 +1,151 @@
+import hashlib
+import io
+import json
+import os
+
+import pytest
+import requests
+
+import oci
+import oci.layout
+import oci.model as om
+
+
+def _digest(octets: bytes) -> str:
+    return f'sha256:{hashlib.sha256(octets).hexdigest()}'
+
+
+def _put_image(
+    client: oci.layout.Client,
+    image_reference: str,
+    layer_count: int=2,
+) -> bytes:
+    cfg = json.dumps({'architecture': 'amd64', 'os': 'linux'}).encode('utf-8')
+    layers = [f'layer-{idx}'.encode('utf-8') * 1000 for idx in range(layer_count)]
+
+    for octets in (cfg, *layers):
+        client.put_blob(
+            image_reference=image_reference,
+            digest=_digest(octets),
+            octets_count=len(octets),
+            data=octets,
+        )
+
+    manifest = json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {
+            'digest': _digest(cfg),
+            'mediaType': 'application/vnd.oci.image.config.v1+json',
+            'size': len(cfg),
+        },
+        'layers': [
+            {
+                'digest': _digest(octets),
+                'mediaType': 'application/vnd.oci.image.layer.v1.tar',
+                'size': len(octets),
+            } for octets in layers
+        ],
+    }).encode('utf-8')
+
+    client.put_manifest(image_reference=image_reference, manifest=manifest)
+
+    return manifest
+
+
+def test_image_layout(tmp_path):
+    client = oci.layout.Client(layout=str(tmp_path / 'layout'))
+    manifest = _put_image(client=client, image_reference='example.org/foo:1.2.3')
+
+    assert json.loads((tmp_path / 'layout' / 'oci-layout').read_text()) == {
+        'imageLayoutVersion': '1.0.0',
+    }
+    index = json.loads((tmp_path / 'layout' / 'index.json').read_text())
+    assert index['manifests'][0]['digest'] == _digest(manifest)
+    assert index['manifests'][0]['annotations'] == {
+        oci.layout.REF_NAME_ANNOTATION: 'example.org/foo:1.2.3',
+    }
+    algorithm, hexdigest = _digest(manifest).split(':')
+    assert (tmp_path / 'layout' / 'blobs' / algorithm / hexdigest).read_bytes() == manifest
+
+    assert client.manifest_raw(image_reference='example.org/foo:1.2.3').content == manifest
+    assert client.manifest_raw(
+        image_reference=f'example.org/foo@{_digest(manifest)}',
+    ).content == manifest
+    assert client.tags(image_reference='example.org/foo') == ['1.2.3']
+    assert client.to_digest_hash(
+        image_reference='example.org/foo:1.2.3',
+    ) == f'example.org/foo@{_digest(manifest)}'
+    assert client.manifest_raw(image_reference='example.org/foo:4.5.6', absent_ok=True) is None
+    assert not client.head_blob(image_reference='example.org/foo', digest=_digest(b'x')).ok
+
+    with pytest.raises(requests.HTTPError):
+        client.manifest(image_reference='example.org/bar:1.2.3')
+
+    # corrupt blobs must be rejected
+    with pytest.raises(ValueError):
+        client.put_blob(
+            image_reference='example.org/foo:1.2.3',
+            digest=_digest(b'foo'),
+            octets_count=3,
+            data=b'bar',
+        )
+
+    client.delete_manifest(image_reference='example.org/foo:1.2.3')
+    assert client.tags(image_reference='example.org/foo') == []
+
+
+def test_replicate_to_and_from_tarball(tmp_path):
+    src_client = oci.layout.Client(layout=str(tmp_path / 'src'))
+    manifest = _put_image(client=src_client, image_reference='example.org/foo:1.2.3')
+
+    # export (into a pseudo-registry, hosted by another image-layout)
+    export_client = oci.layout.Client(
+        layout=str(tmp_path / 'export'),
+        registry='export.local',
+        delegate=src_client,
+    )
+    oci.replicate_artifact(
+        src_image_reference='example.org/foo:1.2.3',
+        tgt_image_reference='export.local/foo:1.2.3',
+        oci_client=export_client,
+    )
+
+    tarball = io.BytesIO()
+    oci.layout.write_tar(layout=export_client.layout, fileobj=tarball)
+    (tmp_path / 'export.tar').write_bytes(tarball.getvalue())
+
+    # tarballs may be read directly
+    tar_client = oci.layout.Client(layout=str(tmp_path / 'export.tar'))
+    assert tar_client.layout.read_only
+    assert tar_client.manifest_raw(image_reference='export.local/foo:1.2.3').content == manifest
+
+    manifest_obj = tar_client.manifest(image_reference='export.local/foo:1.2.3')
+    layer = manifest_obj.layers[0]
+    assert b''.join(tar_client.iter_blob(
+        image_reference='export.local/foo:1.2.3',
+        digest=layer.digest,
+        start=10,
+        end=19,
+    )) == b''.join(src_client.iter_blob(
+        image_reference='example.org/foo:1.2.3',
+        digest=layer.digest,
+    ))[10:20]
+
+    # import (from extracted tarball)
+    tarball.seek(0)
+    layout = oci.layout.extract_tar(fileobj=tarball, path=str(tmp_path / 'import'))
+    import_client = oci.layout.Client(
+        layout=str(tmp_path / 'tgt'),
+        registry='example.com',
+        delegate=oci.layout.Client(layout=layout),
+    )
+    oci.replicate_artifact(
+        src_image_reference='export.local/foo:1.2.3',
+        tgt_image_reference='example.com/foo:1.2.3',
+        oci_client=import_client,
+    )
+
+    assert import_client.manifest_raw(image_reference='example.com/foo:1.2.3').content == manifest
+    for blob in manifest_obj.blobs():
+        assert os.path.exists(import_client.layout._blobs.path(blob.digest))
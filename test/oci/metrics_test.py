@@ -0,0 +1,47 @@
+import json
+
+import oci.metrics
+
+
+def test_operation():
+    assert oci.metrics.operation('https://example.org/v2/foo/manifests/1.2.3') == 'manifest'
+    assert oci.metrics.operation('https://example.org/v2/foo/blobs/uploads/abc') == 'blob-upload'
+    assert oci.metrics.operation('https://example.org/v2/foo/blobs/sha256:abc') == 'blob'
+    assert oci.metrics.operation('https://example.org/v2/foo/tags/list?n=10') == 'tags'
+    assert oci.metrics.operation('https://example.org/v2/') == 'other'
+
+
+def test_metrics_openmetrics():
+    metrics = oci.metrics.Metrics(buckets=(0.1, 1))
+
+    metrics.inc('oci_requests', registry='example.org', status=200)
+    metrics.inc('oci_requests', registry='example.org', status=200)
+    metrics.observe('oci_request_duration_seconds', 0.05, registry='example.org')
+    metrics.observe('oci_request_duration_seconds', 5, registry='example.org')
+
+    assert metrics.counter('oci_requests', registry='example.org', status=200) == 2
+    assert metrics.histogram('oci_request_duration_seconds', registry='example.org').count == 2
+
+    lines = metrics.as_openmetrics().splitlines()
+
+    assert '# TYPE oci_requests counter' in lines
+    assert 'oci_requests_total{registry="example.org",status="200"} 2' in lines
+    assert 'oci_request_duration_seconds_bucket{registry="example.org",le="0.1"} 1' in lines
+    assert 'oci_request_duration_seconds_bucket{registry="example.org",le="1"} 1' in lines
+    assert 'oci_request_duration_seconds_bucket{registry="example.org",le="+Inf"} 2' in lines
+    assert 'oci_request_duration_seconds_count{registry="example.org"} 2' in lines
+    assert lines[-1] == '# EOF'
+
+
+def test_metrics_dump_json(tmp_path):
+    metrics = oci.metrics.Metrics()
+    metrics.inc('oci_bytes_sent', 42, registry='example.org')
+
+    metrics.dump(path=(path := str(tmp_path / 'metrics.json')))
+
+    with open(path) as f:
+        assert json.load(f)['counters'] == [{
+            'name': 'oci_bytes_sent',
+            'labels': {'registry': 'example.org'},
+            'value': 42,
+        }]
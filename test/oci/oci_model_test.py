@@ -1,5 +1,12 @@
+import dataclasses
+import gc
 import hashlib
+import json
+import pickle
 import pytest
+import weakref
+
+import dacite
 
 import oci.model as om
 
@@ -113,6 +120,42 @@ def test_eq():
     assert ref1 != ref3
 
 
+def test_interning():
+    ref1 = om.OciImageReference('example.org/path:tag')
+    ref2 = om.OciImageReference('example.org/path:tag')
+    assert ref1 is ref2
+    assert om.OciImageReference(ref1) is ref1
+
+    ref3 = om.OciImageReference(ref1, normalise=False)
+    assert ref3 is not ref1
+    assert ref3 == ref1
+
+    assert pickle.loads(pickle.dumps(ref1)) is ref1
+
+    # interned instances must not be kept alive
+    ref = weakref.ref(om.OciImageReference('example.org/path:unreferenced'))
+    gc.collect()
+    assert ref() is None
+
+
+def test_lazy_normalisation():
+    ref = om.OciImageReference('https://example.org/path:tag')
+
+    assert ref.original_image_reference == 'https://example.org/path:tag'
+    assert ref == om.OciImageReference('https://example.org/path:tag', normalise=False)
+
+    with pytest.raises(ValueError):
+        ref.normalised_image_reference
+
+
+def test_hash():
+    ref1 = om.OciImageReference('alpine:3')
+    ref2 = om.OciImageReference('registry-1.docker.io/library/alpine:3')
+
+    assert hash(ref1) == hash(ref2)
+    assert len({ref1, ref2}) == 1
+
+
 def test_parsed_digest_tag():
     with pytest.raises(ValueError):
         om.OciImageReference('alpine:3').parsed_digest_tag
@@ -217,3 +260,97 @@ def test_oci_image_manifest_list_serialisation():
 
     assert 'platform' in manifest_list_dict['manifests'][0]
     assert manifest_list_dict['manifests'][0]['platform'] == platform.as_dict()
+
+
+def test_manifest_from_dict():
+    manifest_dict = {
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {'digest': 'sha256:c', 'mediaType': 'cfg', 'size': 1},
+        'layers': [
+            {'digest': 'sha256:l', 'mediaType': 'layer', 'size': 2, 'annotations': {'k': 'v'}},
+        ],
+        'subject': {'digest': 'sha256:s', 'mediaType': 'subject', 'size': 3},
+        'unknown-attribute': 'ignored',
+    }
+    manifest = om.OciImageManifest.from_dict(manifest_dict)
+
+    assert manifest == dacite.from_dict(data_class=om.OciImageManifest, data=manifest_dict)
+    assert manifest.subject.digest == 'sha256:s'
+    assert manifest.raw_manifest is None
+
+    raw_manifest = json.dumps(manifest_dict).encode('utf-8')
+    manifest = om.as_manifest(raw_manifest)
+    assert manifest.raw_manifest is raw_manifest
+
+    # modified copies must not retain raw manifest
+    assert dataclasses.replace(manifest, layers=[]).raw_manifest is None
+
+
+def test_manifest_list_from_dict():
+    manifest_list_dict = {
+        'schemaVersion': 2,
+        'mediaType': om.OCI_IMAGE_INDEX_MIME,
+        'manifests': [
+            {
+                'digest': 'sha256:a',
+                'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+                'size': 1,
+                'platform': {'architecture': 'amd64', 'os': 'linux', 'os.version': 'ignored'},
+            },
+            {
+                'digest': 'sha256:b',
+                'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+                'size': 2,
+                'artifactType': 'application/spdx+json',
+            },
+        ],
+        'annotations': {'k': 'v'},
+    }
+    manifest_list = om.OciImageManifestList.from_dict(manifest_list_dict, raw_manifest=b'raw')
+
+    assert manifest_list == dacite.from_dict(
+        data_class=om.OciImageManifestList,
+        data=manifest_list_dict,
+    )
+    assert manifest_list.manifests[0].platform == om.OciPlatform(architecture='amd64', os='linux')
+    assert manifest_list.manifests[1].platform is None
+    assert manifest_list.raw_manifest == b'raw'
+
+
+def test_tracked_manifest():
+    # deliberately formatted differently from `json.dumps`
+    raw_manifest = b'''{
+      "schemaVersion": 2,
+      "config": {"digest": "sha256:c", "mediaType": "cfg", "size": 1},
+      "layers": [],
+      "annotations": {"k": "v"}
+    }'''
+    tracked_manifest = om.TrackedManifest(manifest=om.as_manifest(
+        raw_manifest,
+        media_type=om.OCI_MANIFEST_SCHEMA_V2_MIME,
+    ))
+
+    assert not tracked_manifest.dirty
+    assert tracked_manifest.raw_manifest is raw_manifest
+    assert tracked_manifest.digest == f'sha256:{hashlib.sha256(raw_manifest).hexdigest()}'
+    assert tracked_manifest.size == len(raw_manifest)
+
+    # unchanged values must not cause re-serialisation
+    assert not tracked_manifest.patch_annotations({'k': 'v'})
+    assert tracked_manifest.raw_manifest is raw_manifest
+
+    assert tracked_manifest.patch_annotations({'k': 'v2'})
+    assert tracked_manifest.dirty
+    assert json.loads(tracked_manifest.raw_manifest)['annotations'] == {'k': 'v2'}
+    assert tracked_manifest.hexdigest == hashlib.sha256(tracked_manifest.raw_manifest).hexdigest()
+
+    # manifests not deserialised from octets are serialised on demand
+    tracked_manifest = om.TrackedManifest(
+        manifest=om.OciImageManifest(
+            config=om.OciBlobRef(digest='sha256:c', mediaType='cfg', size=1),
+            layers=[],
+        ),
+    )
+    assert tracked_manifest.dirty
+    assert json.loads(tracked_manifest.raw_manifest)['config']['digest'] == 'sha256:c'
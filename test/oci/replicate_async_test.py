@@ -0,0 +1,196 @@
+import asyncio
+import collections.abc
+import hashlib
+import json
+import unittest.mock
+
+import oci
+import oci.model as om
+import oci.replicate_async
+
+
+def _digest(octets: bytes) -> str:
+    return f'sha256:{hashlib.sha256(octets).hexdigest()}'
+
+
+def _image_manifest(blobs: dict[str, bytes]) -> bytes:
+    (cfg_digest, cfg), *layers = blobs.items()
+    return json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {
+            'digest': cfg_digest,
+            'mediaType': 'application/vnd.oci.image.config.v1+json',
+            'size': len(cfg),
+        },
+        'layers': [
+            {
+                'digest': digest,
+                'mediaType': 'application/vnd.oci.image.layer.v1.tar',
+                'size': len(octets),
+            } for digest, octets in layers
+        ],
+    }).encode('utf-8')
+
+
+def _image_blobs(name: str, layer_count: int) -> dict[str, bytes]:
+    cfg = json.dumps({'architecture': name, 'os': 'linux'}).encode('utf-8')
+    layers = [f'{name}-{idx}'.encode('utf-8') for idx in range(layer_count)]
+
+    return {
+        _digest(octets): octets
+        for octets in (cfg, *layers)
+    }
+
+
+class _Content:
+    def __init__(self, octets: bytes):
+        self.octets = octets
+
+    async def iter_chunked(self, chunk_size: int):
+        for idx in range(0, len(self.octets), chunk_size):
+            await asyncio.sleep(0) # allow for interleaving of transfers
+            yield self.octets[idx:idx + chunk_size]
+
+
+def _response(octets: bytes):
+    res = unittest.mock.MagicMock()
+    res.headers = {}
+    res.content = _Content(octets)
+
+    async def read():
+        return octets
+
+    res.read = read
+    return res
+
+
+class FakeAsyncClient:
+    '''
+    minimal stand-in for oci.client_async.Client, serving manifests and blobs from memory, and
+    recording uploads as well as count of concurrent blob-transfers
+    '''
+    def __init__(
+        self,
+        manifests: dict[str, bytes],
+        blobs: dict[str, bytes],
+    ):
+        self.src_manifests = manifests # {tag-or-digest: manifest-bytes}
+        self.src_blobs = blobs
+        self.uploaded_blobs = {}
+        self.uploaded_manifests = {}
+        self.calls = []
+        self.blob_retrievals = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def manifest_raw(self, image_reference, accept=None, absent_ok=False):
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        return _response(self.src_manifests[image_reference.tag])
+
+    async def manifest(self, image_reference, accept=None, absent_ok=False):
+        res = await self.manifest_raw(image_reference=image_reference)
+        return om.as_manifest(await res.read())
+
+    async def blob(self, image_reference, digest, absent_ok=False):
+        self.blob_retrievals += 1
+        return _response(self.src_blobs[digest])
+
+    async def put_blob(self, image_reference, digest, octets_count, data):
+        if digest in self.uploaded_blobs:
+            return
+
+        assert isinstance(data, collections.abc.AsyncIterable)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.in_flight, self.max_in_flight)
+        octets = b''.join([chunk async for chunk in data])
+        self.in_flight -= 1
+
+        self.calls.append(('put_blob', digest))
+        self.uploaded_blobs[digest] = octets
+
+    async def put_manifest(self, image_reference, manifest):
+        self.calls.append(('put_manifest', str(image_reference)))
+        self.uploaded_manifests[str(image_reference)] = manifest
+
+
+def test_replicate_artifact():
+    blobs = _image_blobs(name='amd64', layer_count=8)
+    client = FakeAsyncClient(
+        manifests={'1.2.3': _image_manifest(blobs)},
+        blobs=blobs,
+    )
+
+    _, tgt_ref, manifest_bytes = asyncio.run(oci.replicate_async.replicate_artifact(
+        src_image_reference='example.org/src:1.2.3',
+        tgt_image_reference='example.org/tgt:1.2.3',
+        oci_client=client,
+        annotations={'foo': 'bar'},
+        semaphores=oci.replicate_async.RegistrySemaphores(limit=2),
+    ))
+
+    assert client.uploaded_blobs == blobs
+    assert client.max_in_flight == 2
+    # manifest must only be uploaded after all blobs were replicated
+    assert client.calls[-1] == ('put_manifest', str(tgt_ref))
+    assert client.uploaded_manifests[str(tgt_ref)] == manifest_bytes
+    assert json.loads(manifest_bytes)['annotations'] == {'foo': 'bar'}
+
+    # existing blobs must not be retrieved from source
+    blob_retrievals = client.blob_retrievals
+    asyncio.run(oci.replicate_async.replicate_artifact(
+        src_image_reference='example.org/src:1.2.3',
+        tgt_image_reference='example.org/tgt:1.2.3',
+        oci_client=client,
+    ))
+    assert client.blob_retrievals == blob_retrievals
+
+
+def test_replicate_artifact_multiarch():
+    platforms = ('amd64', 'arm64', 's390x')
+    manifests = {}
+    blobs = {}
+    entries = []
+
+    for platform in platforms:
+        image_blobs = _image_blobs(name=platform, layer_count=2)
+        blobs |= image_blobs
+        manifest_bytes = _image_manifest(image_blobs)
+        manifests[(digest := _digest(manifest_bytes))] = manifest_bytes
+        entries.append({
+            'digest': digest,
+            'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+            'size': len(manifest_bytes),
+            'platform': {'architecture': platform, 'os': 'linux'},
+        })
+
+    manifests['1.2.3'] = json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_IMAGE_INDEX_MIME,
+        'manifests': entries,
+    }).encode('utf-8')
+
+    client = FakeAsyncClient(
+        manifests=manifests,
+        blobs=blobs,
+    )
+
+    _, tgt_ref, manifest_bytes = asyncio.run(oci.replicate_async.replicate_artifact(
+        src_image_reference='example.org/src:1.2.3',
+        tgt_image_reference='example.org/tgt:1.2.3',
+        oci_client=client,
+        mode=oci.ReplicationMode.PREFER_MULTIARCH,
+        platform_filter=lambda platform: platform.architecture != 'arm64',
+    ))
+
+    manifest_list = om.as_manifest(manifest_bytes)
+
+    # order of source manifest-list must be retained
+    assert [entry.platform.architecture for entry in manifest_list.manifests] == [
+        'amd64', 's390x',
+    ]
+    assert len(client.uploaded_blobs) == 6
+    # manifest-list must be uploaded last
+    assert client.calls[-1] == ('put_manifest', str(tgt_ref))
+    assert client.uploaded_manifests[str(tgt_ref)] == manifest_bytes
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import unittest.mock
+
+import oci
+import oci.model as om
+
+
+def _digest(octets: bytes) -> str:
+    return f'sha256:{hashlib.sha256(octets).hexdigest()}'
+
+
+def _image_manifest(blobs: dict[str, bytes]) -> bytes:
+    (cfg_digest, cfg), *layers = blobs.items()
+    return json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+        'config': {
+            'digest': cfg_digest,
+            'mediaType': 'application/vnd.oci.image.config.v1+json',
+            'size': len(cfg),
+        },
+        'layers': [
+            {
+                'digest': digest,
+                'mediaType': 'application/vnd.oci.image.layer.v1.tar',
+                'size': len(octets),
+            } for digest, octets in layers
+        ],
+    }).encode('utf-8')
+
+
+class FakeClient:
+    '''
+    minimal stand-in for oci.client.Client, serving manifests and blobs from memory, and
+    recording uploads
+    '''
+    def __init__(
+        self,
+        manifests: dict[str, bytes],
+        blobs: dict[str, bytes],
+    ):
+        self.src_manifests = manifests # {tag-or-digest: manifest-bytes}
+        self.src_blobs = blobs
+        self.uploaded_blobs = {}
+        self.uploaded_manifests = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def manifest_raw(self, image_reference, accept=None, absent_ok=False):
+        image_reference = om.OciImageReference.to_image_ref(image_reference)
+        res = unittest.mock.MagicMock()
+        res.content = self.src_manifests[image_reference.tag]
+        res.text = res.content.decode('utf-8')
+        res.headers = {}
+        return res
+
+    def manifest(self, image_reference, accept=None, absent_ok=False):
+        return om.as_manifest(self.manifest_raw(image_reference).content)
+
+    def head_blob(self, image_reference, digest, absent_ok=True):
+        res = unittest.mock.MagicMock()
+        res.ok = digest in self.uploaded_blobs
+        return res
+
+    def mount_blob(self, image_reference, digest, source_image_reference):
+        return False
+
+    def blob(self, image_reference, digest, absent_ok=False, stream=True):
+        res = unittest.mock.MagicMock()
+        res.content = self.src_blobs[digest]
+        res.json.side_effect = lambda: json.loads(res.content)
+        return res
+
+    def iter_blob(self, image_reference, digest, **kwargs):
+        yield self.src_blobs[digest]
+
+    def put_blob(self, image_reference, digest, octets_count, data, **kwargs):
+        if not isinstance(data, bytes):
+            data = data.content if hasattr(data, 'content') else b''.join(data)
+
+        with self._lock:
+            self.calls.append(('put_blob', digest))
+            self.uploaded_blobs[digest] = data
+
+    def put_manifest(self, image_reference, manifest):
+        with self._lock:
+            self.calls.append(('put_manifest', str(image_reference)))
+            self.uploaded_manifests[str(image_reference)] = manifest
+
+
+def _image_blobs(name: str, layer_count: int) -> dict[str, bytes]:
+    cfg = json.dumps({'architecture': name, 'os': 'linux'}).encode('utf-8')
+    layers = [f'{name}-{idx}'.encode('utf-8') for idx in range(layer_count)]
+
+    return {
+        _digest(octets): octets
+        for octets in (cfg, *layers)
+    }
+
+
+def test_replicate_artifact_parallel_layers():
+    blobs = _image_blobs(name='amd64', layer_count=8)
+    client = FakeClient(
+        manifests={'1.2.3': _image_manifest(blobs)},
+        blobs=blobs,
+    )
+
+    _, tgt_ref, manifest_bytes = oci.replicate_artifact(
+        src_image_reference='example.org/src:1.2.3',
+        tgt_image_reference='example.org/tgt:1.2.3',
+        oci_client=client,
+        max_parallel_layers=4,
+    )
+
+    assert client.uploaded_blobs == blobs
+    # manifest must only be uploaded after all blobs were replicated
+    assert client.calls[-1][0] == 'put_manifest'
+    assert len(client.calls) == len(blobs) + 1
+    assert client.uploaded_manifests[str(tgt_ref)] == manifest_bytes
+
+
+def test_replicate_artifact_parallel_manifests():
+    platforms = ('amd64', 'arm64', 'ppc64le', 's390x', '386')
+    manifests = {}
+    blobs = {}
+    entries = []
+
+    for platform in platforms:
+        image_blobs = _image_blobs(name=platform, layer_count=2)
+        blobs |= image_blobs
+        manifest_bytes = _image_manifest(image_blobs)
+        manifests[(digest := _digest(manifest_bytes))] = manifest_bytes
+        entries.append({
+            'digest': digest,
+            'mediaType': om.OCI_MANIFEST_SCHEMA_V2_MIME,
+            'size': len(manifest_bytes),
+            'platform': {'architecture': platform, 'os': 'linux'},
+        })
+
+    manifests['1.2.3'] = json.dumps({
+        'schemaVersion': 2,
+        'mediaType': om.OCI_IMAGE_INDEX_MIME,
+        'manifests': entries,
+    }).encode('utf-8')
+
+    client = FakeClient(
+        manifests=manifests,
+        blobs=blobs,
+    )
+
+    _, tgt_ref, manifest_bytes = oci.replicate_artifact(
+        src_image_reference='example.org/src:1.2.3',
+        tgt_image_reference='example.org/tgt:1.2.3',
+        oci_client=client,
+        mode=oci.ReplicationMode.PREFER_MULTIARCH,
+        platform_filter=lambda platform: platform.architecture != 's390x',
+        max_parallel_manifests=3,
+    )
+
+    manifest_list = om.as_manifest(manifest_bytes)
+
+    # order of source manifest-list must be retained
+    assert [entry.platform.architecture for entry in manifest_list.manifests] == [
+        'amd64', 'arm64', 'ppc64le', '386',
+    ]
+    # manifest-list must be uploaded last
+    assert client.calls[-1] == ('put_manifest', str(tgt_ref))
@@ -0,0 +1,229 @@
+import asyncio
+import collections
+import collections.abc
+import threading
+
+import ocm
+import ocm.iter
+import ocm.iter_async
+
+
+def component_descriptor(
+    name: str,
+    references: tuple[str]=(),
+    resources: tuple[str]=(),
+) -> ocm.ComponentDescriptor:
+    return ocm.ComponentDescriptor(
+        meta=ocm.Metadata(),
+        component=ocm.Component(
+            name=name,
+            version='1.2.3',
+            repositoryContexts=[],
+            provider='acme',
+            sources=[],
+            componentReferences=[
+                ocm.ComponentReference(
+                    name=reference,
+                    componentName=reference,
+                    version='1.2.3',
+                ) for reference in references
+            ],
+            resources=[
+                ocm.Resource(
+                    name=resource,
+                    version='1.2.3',
+                    type=ocm.ArtefactType.OCI_IMAGE,
+                    access=ocm.OciAccess(imageReference=f'acme.org/{resource}:1.2.3'),
+                ) for resource in resources
+            ],
+        ),
+        signatures=[],
+    )
+
+
+def counting_lookup(
+    component_descriptors: collections.abc.Iterable[ocm.ComponentDescriptor],
+) -> tuple[ocm.ComponentDescriptorLookup, collections.Counter]:
+    component_descriptors = {
+        cd.component.identity(): cd for cd in component_descriptors
+    }
+    lookups = collections.Counter()
+
+    def lookup(component_id: ocm.ComponentIdentity, ocm_repository=None):
+        lookups[component_id.name] += 1
+        return component_descriptors[component_id]
+
+    return lookup, lookups
+
+
+def test_iter_prunes_shared_subtrees():
+    # root -> a -> shared -> leaf
+    #      -> b -> shared
+    root = component_descriptor(name='root', references=('a', 'b'))
+    lookup, lookups = counting_lookup((
+        component_descriptor(name='a', references=('shared',)),
+        component_descriptor(name='b', references=('shared',)),
+        component_descriptor(name='shared', references=('leaf',), resources=('image',)),
+        component_descriptor(name='leaf', resources=('leaf-image',)),
+    ))
+
+    nodes = [
+        str(node) for node in ocm.iter.iter(
+            component=root,
+            lookup=lookup,
+            node_filter=lambda node: not isinstance(node, ocm.iter.SourceNode),
+        )
+    ]
+    assert [node.split(' ')[0] for node in nodes] == [
+        'root:1.2.3',
+        'a:1.2.3',
+        'shared:1.2.3',
+        'shared:1.2.3', # image
+        'leaf:1.2.3',
+        'leaf:1.2.3', # leaf-image
+        'b:1.2.3',
+    ]
+    assert lookups == {'a': 1, 'b': 1, 'shared': 1, 'leaf': 1}
+
+    lookups.clear()
+    resource_nodes = list(ocm.iter.iter(
+        component=root,
+        lookup=lookup,
+        prune_unique=False,
+        node_filter=ocm.iter.Filter.resources,
+    ))
+    assert [node.resource.name for node in resource_nodes] == [
+        'image', 'leaf-image', 'image', 'leaf-image',
+    ]
+    assert lookups == {'a': 1, 'b': 1, 'shared': 2, 'leaf': 2}
+
+
+def test_iter_prune_unique_honours_recursion_depth():
+    # root -> a -> shared -> leaf
+    #      -> shared
+    # w/ recursion_depth=2, `shared` is first reached at maximum depth (thus not expanded); it
+    # must be expanded once reached again via a shorter path
+    root = component_descriptor(name='root', references=('a', 'shared'))
+    lookup, lookups = counting_lookup((
+        component_descriptor(name='a', references=('shared',)),
+        component_descriptor(name='shared', references=('leaf',)),
+        component_descriptor(name='leaf'),
+    ))
+
+    component_names = [
+        node.component.name for node in ocm.iter.iter(
+            component=root,
+            lookup=lookup,
+            recursion_depth=2,
+            node_filter=ocm.iter.Filter.components,
+        )
+    ]
+    assert component_names == ['root', 'a', 'shared', 'leaf']
+    assert lookups == {'a': 1, 'shared': 2, 'leaf': 1}
+
+
+def test_iter_terminates_for_cyclic_references():
+    root = component_descriptor(name='root', references=('a',))
+    lookup, lookups = counting_lookup((
+        root,
+        component_descriptor(name='a', references=('root',)),
+    ))
+
+    component_names = [
+        node.component.name for node in ocm.iter.iter(
+            component=root,
+            lookup=lookup,
+            node_filter=ocm.iter.Filter.components,
+        )
+    ]
+    assert component_names == ['root', 'a']
+    assert lookups == {'a': 1}
+
+
+def test_iter_prefetches_concurrently():
+    references = [f'ref-{idx}' for idx in range(4)]
+    root = component_descriptor(name='root', references=(*references, 'ref-0'))
+    component_descriptors = [
+        component_descriptor(name=reference, references=('shared',), resources=('image',))
+        for reference in references
+    ]
+    component_descriptors.append(component_descriptor(name='shared', resources=('image',)))
+
+    def node_ids(nodes):
+        return [(type(node), tuple(e.component.name for e in node.path)) for node in nodes]
+
+    for prune_unique in (True, False):
+        lookup, lookups = counting_lookup(component_descriptors)
+        expected = node_ids(ocm.iter.iter(
+            component=root,
+            lookup=lookup,
+            prune_unique=prune_unique,
+        ))
+
+        lookup, lookups = counting_lookup(component_descriptors)
+        # all references of root must be looked-up concurrently to pass barrier
+        barrier = threading.Barrier(len(references), timeout=10)
+
+        def concurrent_lookup(component_id, ocm_repository=None):
+            if component_id.name in references and lookups[component_id.name] == 0:
+                barrier.wait()
+            return lookup(component_id)
+
+        assert node_ids(ocm.iter.iter(
+            component=root,
+            lookup=concurrent_lookup,
+            prune_unique=prune_unique,
+            max_workers=len(references),
+        )) == expected
+        assert all(count == 1 for count in lookups.values())
+
+
+def test_iter_async():
+    references = [f'ref-{idx}' for idx in range(6)]
+    root = component_descriptor(name='root', references=(*references, 'ref-0'))
+    component_descriptors = [
+        component_descriptor(name=reference, references=('shared',), resources=('image',))
+        for reference in references
+    ]
+    component_descriptors.append(component_descriptor(name='shared', resources=('image',)))
+
+    def node_ids(nodes):
+        return [(type(node), tuple(e.component.name for e in node.path)) for node in nodes]
+
+    async def iterate(prune_unique: bool):
+        lookup, lookups = counting_lookup(component_descriptors)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def async_lookup(component_id, ocm_repository=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(in_flight, max_in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return lookup(component_id)
+
+        nodes = [
+            node async for node in ocm.iter_async.iter(
+                component=root,
+                lookup=async_lookup,
+                prune_unique=prune_unique,
+                max_concurrent_lookups=4,
+            )
+        ]
+        return nodes, lookups, max_in_flight
+
+    for prune_unique in (True, False):
+        lookup, _ = counting_lookup(component_descriptors)
+        expected = node_ids(ocm.iter.iter(
+            component=root,
+            lookup=lookup,
+            prune_unique=prune_unique,
+        ))
+
+        nodes, lookups, max_in_flight = asyncio.run(iterate(prune_unique=prune_unique))
+
+        assert node_ids(nodes) == expected
+        # in-flight lookups are deduplicated
+        assert all(count == 1 for count in lookups.values())
+        assert max_in_flight == 4